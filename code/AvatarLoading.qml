@@ -12,13 +12,15 @@ Item {
     }
 
     property real conversionProgress: 0 // Value from 0.0 to 1.0
+    property int previewInterval: 0 // 미리보기 프레임 간격(ms). 렌더링이 시작되면 Python에서 설정
+    property int previewRevision: 0 // 새 미리보기 프레임을 받을 때마다 증가
 
     anchors.fill: parent
 
     // 배경 비디오
     MediaPlayer {
         id: loadingPlayer
-        source: "resource/output_with_audio.mp4"
+        source: "resource/output.mp4"
         autoPlay: true
         loops: MediaPlayer.Infinite
         volume: 1.0 // 사용자가 녹화한 영상의 소리를 들려줍니다.
@@ -30,10 +32,31 @@ Item {
         fillMode: VideoOutput.PreserveAspectCrop
     }
 
+    // 변환 중인 캐릭터 영상 미리보기 (저해상도, 낮은 fps)
+    Timer {
+        interval: Math.max(15, avatarLoading.previewInterval)
+        running: avatarLoading.previewInterval > 0
+        repeat: true
+        onTriggered: {
+            if (controlBridge.nextPreviewFrame())
+                avatarLoading.previewRevision += 1
+        }
+    }
+
+    Image {
+        anchors.fill: parent
+        source: avatarLoading.previewRevision > 0 ? "image://avatarPreview/frame?" + avatarLoading.previewRevision : ""
+        visible: avatarLoading.previewRevision > 0
+        cache: false
+        asynchronous: false
+        fillMode: Image.PreserveAspectFit
+        smooth: true
+    }
+
     // 진행 상태를 표시하기 위한 반투명 오버레이
     Rectangle {
         anchors.fill: parent
-        color: "#80000000" // 50% black
+        color: avatarLoading.previewRevision > 0 ? "#30000000" : "#80000000" // 미리보기가 보이면 더 옅게
     }
 
     // 중앙에 GIF 배치
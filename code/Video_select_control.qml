@@ -10,6 +10,26 @@ Rectangle {
     // 현재 선택된 비디오 경로를 저장하는 속성
     property string selectedVideoPath: ""
 
+    // 포즈 모델이 아직 준비되지 않았을 때 표시. 로드에 실패하면 오류를 보여 주고, 누르면 다시 시도합니다.
+    Text {
+        id: modelStatusText
+        text: controlBridge.modelError !== "" ? "모델을 불러오지 못했습니다. 눌러서 다시 시도" : "준비 중..."
+        visible: !controlBridge.modelReady
+        color: controlBridge.modelError !== "" ? "#ff8080" : "white"
+        font.pixelSize: 48
+        font.family: neodgm.name
+        anchors.horizontalCenter: parent.horizontalCenter
+        anchors.bottom: parent.bottom
+        anchors.bottomMargin: 60
+        z: 2
+
+        MouseArea {
+            anchors.fill: parent
+            enabled: controlBridge.modelError !== ""
+            onClicked: controlBridge.requestModelLoad()
+        }
+    }
+
     Item {
         id: container
         width: parent.width
@@ -43,6 +63,8 @@ Rectangle {
 
             MouseArea {
                 anchors.fill: parent
+                // 포즈 모델 로드/워밍업이 끝나야 게임을 시작할 수 있습니다.
+                enabled: controlBridge.modelReady
                 onClicked: {
                   controlBridge.startGame(videoSelectScreen.selectedVideoPath)
                 }
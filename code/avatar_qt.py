@@ -1,15 +1,21 @@
 import os, json
+import hashlib
 import numpy as np
 import multiprocessing
 import functools
+import threading
 
 # ✅ PyQt 먼저
 from PyQt5.QtCore import QObject, pyqtSignal
-from PyQt5.QtGui import QImage
 
 # ✅ 그 다음 OpenCV
 import cv2
 
+from core.pose_track import load_pose_data, validate_reference_meta
+from core.pose_filter import smooth_track
+from core import compositor, shared_arrays
+from core.array_pack import save_array_pack, load_array_pack
+
 
 # ---- COCO indices (used joints) ----
 L_SH=5; R_SH=6; L_EL=7; R_EL=8; L_WR=9; R_WR=10
@@ -17,71 +23,162 @@ L_HP=11; R_HP=12; L_KN=13; R_KN=14; L_AN=15; R_AN=16
 
 # ===================== Global Cache & Worker =====================
 
-ASSET_CACHE = {}
-WORKER_ASSETS = None
-WORKER_BACKGROUND = None
-
-def init_worker(assets, background):
-    """워커 프로세스 초기화 함수"""
-    global WORKER_ASSETS, WORKER_BACKGROUND
-    WORKER_ASSETS = assets
-    WORKER_BACKGROUND = background
-
-def _render_worker(args):
-    """멀티프로세싱 Pool을 위한 최상위 레벨 워커 함수"""
-    kps, config, offset_x, top_pad = args
+# 준비된 에셋 팩(premultiplied 스프라이트, 배경, 파싱된 anchors)의 디스크 캐시.
+# 입력 파일 내용의 해시를 키로 쓰므로 재부팅 후에도 PNG 디코딩/리사이즈/블러 없이 바로 읽습니다.
+# 팩을 만드는 코드가 바뀌면 PACK_CACHE_VERSION을 올립니다.
+PACK_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resource", "asset_cache")
+PACK_CACHE_VERSION = 1
+
+# 워커 프로세스가 붙어 있는 공유 메모리 에셋 팩: 팩 키 -> (SharedMemory, {이름: 읽기 전용 뷰})
+# 팩 키(에셋 폴더, side_extra, top_pad)마다 최신 블록 하나만 붙어 있습니다.
+WORKER_PACKS = {}
+
+# 워커 하나가 한 번에 렌더링할 연속 프레임 수의 상한
+RENDER_CHUNK_MAX = 32
+# 동시에 진행 중인 구간 수(워커 수 배수). 결과가 쌓여 메모리가 늘지 않도록 제한합니다.
+RENDER_IN_FLIGHT_PER_WORKER = 2
+# 미리보기를 켰을 때 첫 구간 크기. 첫 프레임이 빨리 나오도록 작게 시작합니다.
+PREVIEW_FIRST_CHUNK = 2
+
+def init_worker():
+    """워커 프로세스 초기화 함수."""
+    # 프레임 단위로 이미 프로세스 병렬이므로 워커 안에서는 스레드를 늘리지 않습니다.
+    # 백엔드 선택(벤치마크)도 워커 안에서 합니다. numba 병렬 커널을 부모에서 돌린 뒤
+    # fork하면 스레딩 레이어(TBB 등)가 fork-safe하지 않아 종료 시 멈출 수 있습니다.
+    compositor.set_threads(1)
+    if compositor.backend_name() is None:
+        backend, timings = compositor.select_backend()
+        print(f"[info] compositor ({os.getpid()}): {backend} "
+              + ", ".join(f"{k} {v:.3f}ms" for k, v in timings.items()))
+
+def _worker_pack(spec):
+    """
+    공유 메모리의 에셋 팩에 붙습니다(블록마다 한 번, 복사 없음).
+    같은 팩 키로 새 블록이 오면(에셋이 바뀌어 다시 만든 경우) 이전 블록은 닫습니다.
+    """
+    key = spec["key"]
+    entry = WORKER_PACKS.get(key)
+    if entry is None or entry[0].name != spec["shm"]:
+        if entry is not None:
+            old_shm = WORKER_PACKS.pop(key)[0]
+            # 뷰가 남아 있으면 close가 BufferError로 건너뛰므로 참조를 먼저 버립니다.
+            entry = None
+            shared_arrays.release(old_shm)
+        WORKER_PACKS[key] = shared_arrays.attach_arrays(spec)
+    views = WORKER_PACKS[key][1]
+    assets = {k[len("part:"):]: v for k, v in views.items() if k.startswith("part:")}
+    return assets, views["background"]
+
+def _render_chunk(args):
+    """멀티프로세싱 Pool을 위한 최상위 레벨 워커 함수: 연속된 프레임 구간을 렌더링합니다."""
+    start, kps_chunk, offset_x, top_pad, pack_spec, config = args
+    assets, background = _worker_pack(pack_spec)
     # 클래스 외부에서 staticmethod 호출
-    return MannequinRenderer.render_pose_frame(kps, WORKER_ASSETS, offset_x, top_pad, WORKER_BACKGROUND, config)
-
-
-# ===================== Alpha Blending Implementation =====================
-# Numba를 사용하여 알파 블렌딩을 가속합니다. Numba가 없으면 Numpy로 대체됩니다.
-try:
-    import numba
-    print("[info] Numba JIT will be used for alpha blending.")
-
-    @numba.jit(nopython=True, cache=True)
-    def _alpha_paste_full_impl(dst, src):
-        """Numba를 사용한 고속 알파 블렌딩"""
-        for y in range(dst.shape[0]):
-            for x in range(dst.shape[1]):
-                alpha = src[y, x, 3] / 255.0
-                
-                if alpha > 0.01: # 거의 투명한 픽셀은 건너뜁니다.
-                    if alpha > 0.99: # 거의 불투명한 픽셀은 복사합니다.
-                        dst[y, x, 0] = src[y, x, 0]
-                        dst[y, x, 1] = src[y, x, 1]
-                        dst[y, x, 2] = src[y, x, 2]
-                    else: # 블렌딩
-                        for c in range(3):
-                            dst[y, x, c] = np.uint8(
-                                (1.0 - alpha) * dst[y, x, c] + alpha * src[y, x, c]
-                            )
-        return dst
-
-except ImportError:
-    print("[warning] Numba not installed or failed to import. Using slower numpy-based alpha blending.")
-    def _alpha_paste_full_impl(dst, src):
-        """Numpy를 사용한 대체 알파 블렌딩"""
-        if src.shape[2] != 4:
-            return dst
-        
-        alpha = (src[:, :, 3:4].astype(np.float32)) / 255.0
-        rgb = src[:, :, :3].astype(np.float32)
-        
-        # Perform blending on the whole array. It's safer and the cost of masking
-        # might outweigh the benefits if many pixels are non-transparent.
-        dst_float = dst.astype(np.float32)
-        blended = dst_float * (1.0 - alpha) + rgb * alpha
-        dst[:] = blended.astype(np.uint8)
-        return dst
+    frames = [
+        MannequinRenderer.render_pose_frame(kps, assets, offset_x, top_pad, background, config)
+        for kps in kps_chunk
+    ]
+    return start, frames
+
+def _chunk_size(num_frames, num_workers):
+    """워커마다 여러 번 일을 받아 부하가 고르게 나뉘도록 프레임 수/(워커*4) 정도로 나눕니다."""
+    return max(1, min(RENDER_CHUNK_MAX, num_frames // max(1, num_workers * 4)))
+
+def _chunk_starts(num_frames, chunk, first_chunk=None):
+    """구간 시작 인덱스 목록. first_chunk가 있으면 첫 구간만 그 크기로 자릅니다."""
+    starts = [0] if num_frames else []
+    i = min(first_chunk or chunk, chunk)
+    while i < num_frames:
+        starts.append(i)
+        i += chunk
+    return starts
+
+def _pack_signature(assets_dir):
+    """에셋 폴더 파일들의 (이름, mtime, 크기). 바뀌면 팩을 다시 만듭니다."""
+    entries = []
+    for name in sorted(os.listdir(assets_dir)):
+        st = os.stat(os.path.join(assets_dir, name))
+        entries.append((name, st.st_mtime_ns, st.st_size))
+    return tuple(entries)
+
+
+class RenderPool:
+    """
+    앱이 켜져 있는 동안 유지되는 렌더링 프로세스 풀과 공유 메모리 에셋 저장소.
+    에셋 팩(파트 스프라이트, 배경)은 메인 프로세스에서 한 번 만들어 공유 메모리에 올리고,
+    워커는 작은 spec만 받아 복사 없이 붙습니다. warm()으로 미리 올려 두면
+    변환이 시작되자마자 렌더링에 들어갑니다.
+    Qt 스레드나 모델을 올리기 전에 만드는 것이 좋습니다(fork 비용/안전성).
+    """
+
+    def __init__(self, processes=None):
+        self.processes = processes or multiprocessing.cpu_count()
+        self.pool = multiprocessing.Pool(self.processes, initializer=init_worker)
+        # (abs assets_dir, side_extra, top_pad) -> (signature, SharedMemory, spec, pack)
+        self._packs = {}
+        self._lock = threading.Lock()
+
+    def warm(self, assets_dirs, side_extra=240, top_pad=100):
+        """에셋 팩을 백그라운드 스레드에서 미리 공유 메모리에 올립니다."""
+        def run():
+            for d in assets_dirs:
+                try:
+                    self.pack(d, side_extra, top_pad)
+                except Exception as e:
+                    print(f"[warning] could not preload {d}: {e}")
+        t = threading.Thread(target=run, daemon=True)
+        t.start()
+        return t
+
+    def pack(self, assets_dir, side_extra=240, top_pad=100):
+        """
+        에셋 팩을 (spec, pack)으로 반환합니다. 파일이 바뀌었으면 다시 만듭니다.
+        pack의 이미지 배열은 공유 메모리 뷰입니다.
+        """
+        key = (os.path.abspath(assets_dir), int(side_extra), int(top_pad))
+        with self._lock:
+            signature = _pack_signature(assets_dir)
+            entry = self._packs.get(key)
+            if entry is not None and entry[0] == signature:
+                return entry[2], entry[3]
+            if entry is not None:
+                shared_arrays.release(entry[1], unlink=True)
+
+            pack = MannequinRenderer(None, assets_dir, side_extra=side_extra, top_pad=top_pad).build_pack()
+            arrays = {"part:" + k: v for k, v in pack["assets"].items()}
+            arrays["background"] = pack["background"]
+            shm, spec = shared_arrays.publish_arrays(arrays)
+            # 워커가 같은 팩의 이전 블록을 찾아 닫을 수 있도록 팩 키를 함께 보냅니다.
+            spec["key"] = key
+            # 메인 프로세스도 공유 메모리 뷰를 쓰고 디코딩한 원본은 버립니다.
+            views = {name: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=off)
+                     for name, (dtype, shape, off) in spec["arrays"].items()}
+            pack["assets"] = {k[len("part:"):]: v for k, v in views.items() if k.startswith("part:")}
+            pack["background"] = views["background"]
+            self._packs[key] = (signature, shm, spec, pack)
+            return spec, pack
+
+    def submit(self, args):
+        return self.pool.apply_async(_render_chunk, (args,))
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+        with self._lock:
+            for _, shm, _, pack in self._packs.values():
+                pack["assets"] = pack["background"] = None
+                shared_arrays.release(shm, unlink=True)
+            self._packs = {}
+
 
 class MannequinRenderer(QObject):
     # ===== Qt Signals =====
     progress = pyqtSignal(int)
     log = pyqtSignal(str)
     error = pyqtSignal(str)
-    playReady = pyqtSignal(object, float)  # (frames: list[QImage], fps: float)
+    renderStarted = pyqtSignal(int, float)  # (frame_count: int, fps: float)
+    previewFrame = pyqtSignal(object)  # 축소된 BGR ndarray (preview_every 프레임마다)
+    renderDone = pyqtSignal(int, float)  # (frame_count: int, fps: float)
     finished = pyqtSignal()  
 
     def __init__(
@@ -95,11 +192,25 @@ class MannequinRenderer(QObject):
         follow_center_x: bool = True,
         pose_swap_lr: bool = True,
         pose_hflip: bool = False,
+        frame_sink=None,
+        render_pool=None,
+        preview_every: int = 0,
+        preview_max_width: int = 640,
+        pose_filter: str = "one_euro",
         parent=None
     ):
         super().__init__(parent)
         self.json_path = json_path
         self.assets_dir = assets_dir
+        # 렌더링된 BGR 프레임을 순서대로 받는 싱크 (open(fps, size) / write(frame) / close())
+        self.frame_sink = frame_sink
+        # 앱이 소유한 RenderPool. 없으면 run()에서 임시 풀을 만들었다가 닫습니다.
+        self.render_pool = render_pool
+        # 미리보기: preview_every 프레임마다 폭 preview_max_width 이하로 줄여 previewFrame으로 보냅니다(0이면 끔).
+        self.preview_every = int(preview_every)
+        self.preview_max_width = int(preview_max_width)
+        # 키포인트 시간 필터(core.pose_filter.FILTERS의 이름, None이면 끔). 떨림과 관절 깜빡임을 줄입니다.
+        self.pose_filter = pose_filter
 
         self.side_extra = int(side_extra)
         self.top_pad = int(top_pad)
@@ -168,13 +279,6 @@ class MannequinRenderer(QObject):
         canvas[y0:y0+nh, x0:x0+nw] = resized
         return canvas
 
-    @staticmethod
-    def _cv_bgr_to_qimage(img_bgr):
-        h, w = img_bgr.shape[:2]
-        img_rgb = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB)
-        qimg = QImage(img_rgb.data, w, h, img_rgb.strides[0], QImage.Format_RGB888)
-        return qimg.copy()
-    
     @staticmethod
     def _compute_dy(kps_raw, top_pad, config):
         mode = config.get("v_align_mode", "top_pad")
@@ -206,17 +310,6 @@ class MannequinRenderer(QObject):
     # ===================== Loaders =====================
 
     def load_asset_pack(self):
-        global ASSET_CACHE
-        if self.assets_dir in ASSET_CACHE:
-            cached_data = ASSET_CACHE[self.assets_dir]
-            self.REF_W, self.REF_H = cached_data["ref_size"]
-            self.PARTS = cached_data["parts"]
-            self.ANCHORS = cached_data["anchors"]
-            self.TIP_LOWER = cached_data["tip_lower"]
-            self.options = cached_data["options"]
-            self.log.emit("[info] Loaded assets from cache.")
-            return
-
         cfg_path = os.path.join(self.assets_dir, "anchors.json")
         if not os.path.exists(cfg_path):
             raise FileNotFoundError(f"anchors.json이 없습니다: {cfg_path}")
@@ -251,16 +344,124 @@ class MannequinRenderer(QObject):
         self.options = cfg.get("options", {}) or {}
         self.options["background"] = cfg.get("background", {}) or {}
 
-        # Cache the loaded data
-        ASSET_CACHE[self.assets_dir] = {
+    def pack_cache_path(self):
+        """anchors.json과 그것이 참조하는 파트/배경 파일 내용, 캔버스 설정으로 만든 캐시 경로."""
+        cfg_path = os.path.join(self.assets_dir, "anchors.json")
+        with open(cfg_path, "rb") as f:
+            cfg_bytes = f.read()
+        cfg = json.loads(cfg_bytes.decode("utf-8"))
+
+        h = hashlib.sha1()
+        h.update(f"v{PACK_CACHE_VERSION}:{self.side_extra}:{self.top_pad}".encode())
+        h.update(cfg_bytes)
+        files = sorted((cfg.get("parts") or {}).values())
+        bg_path = (cfg.get("background") or {}).get("path")
+        if bg_path:
+            files.append(bg_path)
+        for name in files:
+            path = name if os.path.isabs(name) else os.path.join(self.assets_dir, name)
+            h.update(name.encode("utf-8"))
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    h.update(f.read())
+        pack_name = os.path.basename(os.path.normpath(self.assets_dir))
+        return os.path.join(PACK_CACHE_DIR, f"{pack_name}-{h.hexdigest()[:16]}.pack")
+
+    def build_pack(self, use_cache=True):
+        """
+        anchors.json, 파트 이미지(premultiplied), 배경을 읽어 렌더링용 에셋 팩을 만듭니다.
+        use_cache이면 디스크 캐시를 먼저 찾고, 없으면 만든 뒤 저장합니다.
+        """
+        cache_path = self.pack_cache_path() if use_cache else None
+        if cache_path and os.path.exists(cache_path):
+            try:
+                return self._load_pack_cache(cache_path)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"[warning] ignoring broken asset cache {cache_path}: {e}")
+
+        pack = self._build_pack()
+        if cache_path:
+            try:
+                self._save_pack_cache(cache_path, pack)
+            except OSError as e:
+                print(f"[warning] could not write asset cache {cache_path}: {e}")
+        return pack
+
+    @staticmethod
+    def _save_pack_cache(path, pack):
+        arrays = {"part:" + k: v for k, v in pack["assets"].items()}
+        arrays["background"] = pack["background"]
+        meta = {
+            "ref_size": list(pack["ref_size"]),
+            "canvas_size": list(pack["canvas_size"]),
+            "parts": pack["parts"],
+            "anchors": {f"{a}>{b}": v for (a, b), v in pack["anchors"].items()},
+            "tip_lower": pack["tip_lower"],
+            "options": pack["options"],
+            "part_bbox": pack["part_bbox"],
+        }
+        save_array_pack(path, arrays, meta)
+
+    @staticmethod
+    def _load_pack_cache(path):
+        meta, arrays = load_array_pack(path)
+        anchors = {}
+        for key, v in meta["anchors"].items():
+            a, b = key.split(">", 1)
+            anchors[(a, b)] = {"parent": tuple(v["parent"]), "child": tuple(v["child"])}
+        return {
+            "ref_size": tuple(meta["ref_size"]),
+            "canvas_size": tuple(meta["canvas_size"]),
+            "parts": meta["parts"],
+            "anchors": anchors,
+            "tip_lower": {k: tuple(v) for k, v in meta["tip_lower"].items()},
+            "options": meta["options"],
+            "assets": {k[len("part:"):]: v for k, v in arrays.items() if k.startswith("part:")},
+            "background": arrays["background"],
+            "part_bbox": {k: (tuple(v) if v is not None else None) for k, v in meta["part_bbox"].items()},
+        }
+
+    def _build_pack(self):
+        self.load_asset_pack()
+
+        bg_spec = self.options.get("background", {}) or {}
+        mode = bg_spec.get("resize", "cover"); bg_path = bg_spec.get("path", None)
+        if mode == "native" and bg_path:
+            path = bg_path if os.path.isabs(bg_path) else os.path.join(self.assets_dir, bg_path)
+            img = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+            if img is None: raise FileNotFoundError(f"Background not found: {path}")
+            self.CANVAS_H, self.CANVAS_W = self._to_bgr3(img).shape[:2]
+        else:
+            self.CANVAS_W = self.REF_W + self.side_extra*2
+            self.CANVAS_H = self.REF_H + max(0, self.top_pad)
+
+        assets = {}
+        for name, meta in self.PARTS.items():
+            p = os.path.join(self.assets_dir, meta["file"])
+            assets[name] = compositor.premultiply(self.load_rgba_resized(p))
+
+        return {
             "ref_size": (self.REF_W, self.REF_H),
+            "canvas_size": (self.CANVAS_W, self.CANVAS_H),
             "parts": self.PARTS,
             "anchors": self.ANCHORS,
             "tip_lower": self.TIP_LOWER,
             "options": self.options,
-            "assets": {} # For image data
+            "assets": assets,
+            "background": self.build_background_from_spec(bg_spec, self.CANVAS_W, self.CANVAS_H),
+            "part_bbox": {name: self.sprite_bbox(img) for name, img in assets.items()},
         }
 
+    def apply_pack(self, pack):
+        self.REF_W, self.REF_H = pack["ref_size"]
+        self.CANVAS_W, self.CANVAS_H = pack["canvas_size"]
+        self.PARTS = pack["parts"]
+        self.ANCHORS = pack["anchors"]
+        self.TIP_LOWER = pack["tip_lower"]
+        self.options = pack["options"]
+        self.assets = pack["assets"]
+        self.background = pack["background"]
+
     def load_rgba_resized(self, path):
         if self.REF_W is None or self.REF_H is None:
             raise RuntimeError("REF_W/REF_H must be set before loading assets.")
@@ -297,16 +498,15 @@ class MannequinRenderer(QObject):
     def load_json_scaled(self, path):
         if self.REF_W is None or self.REF_H is None:
             raise RuntimeError("REF_W/REF_H must be set before loading pose JSON.")
-        with open(path,"r",encoding="utf-8") as f: data=json.load(f)
-        fps=float(data.get("fps",30.0)); stride=int(data.get("stride",1))
+        # JSON / .posetrack 모두 같은 형태(kps: (N,17,2))로 읽습니다.
+        data=load_pose_data(path)
+        validate_reference_meta(data, path, require_video_size=True)
+        fps=float(data["fps"]); stride=int(data["stride"])
         Wv,Hv=data["video_size"]; sx,sy=self.REF_W/float(Wv),self.REF_H/float(Hv)
-        frames=[]
-        for fr in data["frames"]:
-            pts=[]
-            for xy in fr["kps"]:
-                if xy[0] is None or xy[1] is None: pts.append([np.nan,np.nan])
-                else: pts.append([float(xy[0])*sx,float(xy[1])*sy])
-            frames.append(np.array(pts,np.float32))
+        kps=np.asarray(data["kps"],np.float32)*np.array([sx,sy],np.float32)
+        if self.pose_filter:
+            kps=smooth_track(kps,data["timestamp"],self.pose_filter)
+        frames=list(kps)
         return fps/stride, frames
 
     # ===================== Math / Render helpers (Static) =====================
@@ -325,8 +525,34 @@ class MannequinRenderer(QObject):
         )
 
     @staticmethod
-    def alpha_paste_full(dst, src):
-        return _alpha_paste_full_impl(dst, src)
+    def sprite_bbox(img_rgba):
+        """알파가 있는 영역의 (x, y, w, h). 완전히 투명하면 None"""
+        x, y, w, h = cv2.boundingRect(img_rgba[:, :, 3])
+        return None if w == 0 or h == 0 else (x, y, w, h)
+
+    @staticmethod
+    def warp_paste_roi(canvas, img_rgba, M, bbox):
+        """
+        파트 이미지(premultiplied BGRA)의 bbox 영역만 affine 변환 M으로 캔버스에 붙입니다.
+        변환된 bbox가 덮는 캔버스 부분 사각형에만 warp/blend하므로 비용이 파트 면적에 비례합니다.
+        """
+        if bbox is None: return
+        bx, by, bw, bh = bbox
+        corners = np.array([[bx, by, 1], [bx+bw, by, 1], [bx, by+bh, 1], [bx+bw, by+bh, 1]], np.float64)
+        pts = corners @ np.asarray(M, np.float64).T
+        ch, cw = canvas.shape[:2]
+        x0 = max(0, int(np.floor(pts[:,0].min())) - 1); x1 = min(cw, int(np.ceil(pts[:,0].max())) + 2)
+        y0 = max(0, int(np.floor(pts[:,1].min())) - 1); y1 = min(ch, int(np.ceil(pts[:,1].max())) + 2)
+        if x1 <= x0 or y1 <= y0: return
+        # 캔버스 좌표를 ROI 좌표로 옮기고, 소스도 bbox 기준으로 잘라서 씁니다.
+        M_roi = np.asarray(M, np.float64).copy()
+        M_roi[:, 2] += M_roi[:, 0] * bx + M_roi[:, 1] * by - (x0, y0)
+        warped = cv2.warpAffine(
+            img_rgba[by:by+bh, bx:bx+bw], M_roi, (x1 - x0, y1 - y0),
+            flags=cv2.INTER_NEAREST,
+            borderMode=cv2.BORDER_CONSTANT, borderValue=(0,0,0,0)
+        )
+        compositor.alpha_blend(canvas[y0:y1, x0:x1], warped)
 
     @staticmethod
     def hip_center_x(kps):
@@ -382,9 +608,7 @@ class MannequinRenderer(QObject):
                   np.array(anchors[("right_upper_leg","body")]["parent"], np.float32))
         src_pts = np.array([pL, pR, pH], np.float32); dst_pts = np.array([world_LS, world_RS, world_HC], np.float32)
         H = cv2.getAffineTransform(src_pts, dst_pts)
-        warped = cv2.warpAffine(img, H, (config["CANVAS_W"], config["CANVAS_H"]),
-                                flags=cv2.INTER_NEAREST, borderMode=cv2.BORDER_CONSTANT)
-        MannequinRenderer.alpha_paste_full(canvas, warped)
+        MannequinRenderer.warp_paste_roi(canvas, img, H, config["PART_BBOX"]["body"])
 
     @staticmethod
     def attach_segment_scaled(part_name, anchor_start, anchor_end, world_start, world_end, assets, canvas, config, scale_x=1.0):
@@ -403,9 +627,7 @@ class MannequinRenderer(QObject):
         mid_world = 0.5*(q0+q1) + perp_world*thickness
         src_pts=np.array([p0,p1,mid_local],np.float32); dst_pts=np.array([q0,q1,mid_world],np.float32)
         H = cv2.getAffineTransform(src_pts, dst_pts)
-        warped = cv2.warpAffine(img, H, (config["CANVAS_W"], config["CANVAS_H"]),
-                                flags=cv2.INTER_NEAREST, borderMode=cv2.BORDER_CONSTANT)
-        MannequinRenderer.alpha_paste_full(canvas, warped)
+        MannequinRenderer.warp_paste_roi(canvas, img, H, config["PART_BBOX"][part_name])
 
     # ===================== Frame render (Static) =====================
 
@@ -441,8 +663,7 @@ class MannequinRenderer(QObject):
                 MannequinRenderer.attach_body_affine(assets, canvas, kps_scaled[L_SH], kps_scaled[R_SH], hip_center, config, scale_x=scale_x)
             else:
                 H = MannequinRenderer.H_translate(dx, dy)
-                warped = MannequinRenderer.warp_full(assets["body"], H, config["CANVAS_W"], config["CANVAS_H"])
-                MannequinRenderer.alpha_paste_full(canvas, warped)
+                MannequinRenderer.warp_paste_roi(canvas, assets["body"], H[:2,:], config["PART_BBOX"]["body"])
 
         def render_arms():
             if np.all(np.isfinite(kps_scaled[[L_SH,L_EL]])): attach_segment("left_upper_arm", anchors[("body","left_upper_arm")]["child"], anchors[("left_upper_arm","left_lower_arm")]["parent"], kps_scaled[L_SH], kps_scaled[L_EL])
@@ -467,32 +688,14 @@ class MannequinRenderer(QObject):
     # ===================== Public API =====================
 
     def run(self):
-        global ASSET_CACHE
+        render_pool = None
         try:
+            if self.frame_sink is None:
+                raise ValueError("frame_sink is required to receive rendered frames.")
             self.log.emit("[info] loading assets...")
-            self.load_asset_pack()
-
-            bg_spec = self.options.get("background", {}) or {}
-            mode = bg_spec.get("resize", "cover"); bg_path = bg_spec.get("path", None)
-            if mode == "native" and bg_path:
-                path = bg_path if os.path.isabs(bg_path) else os.path.join(self.assets_dir, bg_path)
-                img = cv2.imread(path, cv2.IMREAD_UNCHANGED)
-                if img is None: raise FileNotFoundError(f"Background not found: {path}")
-                self.CANVAS_H, self.CANVAS_W = self._to_bgr3(img).shape[:2]
-            else:
-                self.CANVAS_W = self.REF_W + self.side_extra*2
-                self.CANVAS_H = self.REF_H + max(0, self.top_pad)
-            
-            self.background = self.build_background_from_spec(bg_spec, self.CANVAS_W, self.CANVAS_H)
-
-            cached_assets = ASSET_CACHE[self.assets_dir].get("assets", {})
-            if not cached_assets:
-                self.log.emit("[info] Caching asset images...")
-                for name, meta in self.PARTS.items():
-                    p = os.path.join(self.assets_dir, meta["file"])
-                    cached_assets[name] = self.load_rgba_resized(p)
-                ASSET_CACHE[self.assets_dir]["assets"] = cached_assets
-            self.assets = cached_assets
+            render_pool = self.render_pool or RenderPool()
+            pack_spec, pack = render_pool.pack(self.assets_dir, self.side_extra, self.top_pad)
+            self.apply_pack(pack)
 
             fps, frames = self.load_json_scaled(self.json_path)
             self.log.emit(f"[info] frames={len(frames)} fps={fps:.3f}, starting parallel render...")
@@ -502,45 +705,70 @@ class MannequinRenderer(QObject):
                 "ANCHORS": self.ANCHORS, "TIP_LOWER": self.TIP_LOWER,
                 "assets_dir": self.assets_dir, "v_align_mode": self.v_align_mode,
                 "bottom_margin_px": getattr(self, "bottom_margin_px", 40),
-                "show_debug": self.show_debug, "follow_center_x": self.follow_center_x
+                "show_debug": self.show_debug, "follow_center_x": self.follow_center_x,
+                "PART_BBOX": pack["part_bbox"]
             }
 
-            tasks = []
+            poses = []
             for i in range(0, len(frames), self.stride):
                 k = frames[i].copy()
                 if self.pose_hflip: k = self.hflip_coords(k, config)
                 if self.pose_swap_lr: k = self.swap_lr_labels(k)
-                tasks.append((k, config, 0, self.top_pad))
-
-            qframes = []
-            num_tasks = len(tasks)
-            
-            # 워커 초기화 함수를 사용하여 큰 데이터 (assets, background)를 한 번만 전달합니다.
-            init_args = (self.assets, self.background)
-            
+                poses.append(k)
+
+            num_tasks = len(poses)
+            num_workers = render_pool.processes
+            chunk = _chunk_size(num_tasks, num_workers)
+            # 워커는 연속 구간 단위로 일을 받아 프레임마다 IPC를 오가지 않습니다.
+            # 에셋은 보내지 않고 공유 메모리 spec만 보내며, 워커는 복사 없이 붙어서 씁니다.
+            starts = _chunk_starts(num_tasks, chunk, PREVIEW_FIRST_CHUNK if self.preview_every > 0 else None)
+            ends = starts[1:] + [num_tasks]
+            tasks = [(i, poses[i:j], 0, self.top_pad, pack_spec, config) for i, j in zip(starts, ends)]
+            final_fps = fps / self.stride
+            self.renderStarted.emit(num_tasks, final_fps)
+            preview_scale = min(1.0, self.preview_max_width / float(self.CANVAS_W))
+
+            written = 0
+            self.frame_sink.open(final_fps, (self.CANVAS_W, self.CANVAS_H))
             try:
-                # Use try-finally to ensure pool is closed
-                pool = multiprocessing.Pool(initializer=init_worker, initargs=init_args)
-                
-                for i, result_img in enumerate(pool.imap_unordered(_render_worker, tasks)):
+                # 구간을 최대 max_in_flight개까지만 미리 제출하고, 앞 구간부터 순서대로 받아
+                # 싱크에 씁니다. 먼저 끝난 뒤 구간은 결과 객체에 보관되어(reorder 버퍼)
+                # 차례가 오면 바로 나가므로, 메모리는 곡 길이와 무관하게 제한됩니다.
+                max_in_flight = num_workers * RENDER_IN_FLIGHT_PER_WORKER
+                in_flight = []
+                next_task = 0
+                while next_task < len(tasks) or in_flight:
+                    while next_task < len(tasks) and len(in_flight) < max_in_flight:
+                        in_flight.append(render_pool.submit(tasks[next_task]))
+                        next_task += 1
+
+                    _, rendered = in_flight.pop(0).get()
                     if self._cancel:
+                        # 공유 풀은 종료하지 않고, 이미 제출된 구간만 끝나기를 기다립니다.
                         self.log.emit("[warning] Render cancelled by user.")
-                        pool.terminate()
+                        for r in in_flight:
+                            r.wait()
                         break
-                    
-                    qframes.append(self._cv_bgr_to_qimage(result_img))
-                    self.progress.emit(int((i + 1) * 100 / num_tasks))
+
+                    for frame in rendered:
+                        self.frame_sink.write(frame)
+                        if self.preview_every > 0 and written % self.preview_every == 0:
+                            self.previewFrame.emit(cv2.resize(frame, None, fx=preview_scale, fy=preview_scale,
+                                                              interpolation=cv2.INTER_AREA))
+                        written += 1
+                    self.progress.emit(int(written * 100 / num_tasks))
             finally:
-                pool.close()
-                pool.join()
+                self.frame_sink.close()
 
             if not self._cancel:
                 self.log.emit("[info] Render complete.")
-                final_fps = fps / self.stride
-                self.playReady.emit(qframes, final_fps)
+                self.renderDone.emit(written, final_fps)
 
         except Exception as e:
             import traceback
             self.error.emit(f"{e}\n{traceback.format_exc()}")
         finally:
+            # 앱이 풀을 넘겨주지 않았으면 이번 변환용으로 만든 임시 풀을 닫습니다.
+            if render_pool is not None and render_pool is not self.render_pool:
+                render_pool.close()
             self.finished.emit()
\ No newline at end of file
@@ -1,8 +1,8 @@
 import sys
 import os
-import subprocess
 import atexit
 import json
+import time
 
 # PyQt5를 먼저 임포트하고 환경 변수를 설정합니다.
 import PyQt5
@@ -13,28 +13,53 @@ if hasattr(PyQt5, 'QtCore'):
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtGui import QGuiApplication, QKeyEvent, QImage
 from PyQt5.QtQml import QQmlApplicationEngine
-from PyQt5.QtCore import QUrl, QObject, pyqtSignal, pyqtSlot, QVariant, Qt, QMetaObject, QEvent, QThread, QGenericArgument, Q_ARG
+from PyQt5.QtQuick import QQuickImageProvider
+from PyQt5.QtCore import QUrl, QObject, pyqtSignal, pyqtSlot, pyqtProperty, QVariant, Qt, QMetaObject, QEvent, QThread, QGenericArgument, Q_ARG
 
 # 게임 관련 모듈 임포트
-import torch
-from ultralytics import YOLO
+# torch/ultralytics와 게임 화면 모듈은 무거우므로 QML 창을 먼저 띄운 뒤
+# 백그라운드 스레드(ModelLoadWorker)에서 불러옵니다.
 from argparse import Namespace
 
+# merge_test 폴더를 모듈 검색 경로에 추가 (avatar_qt도 core 모듈을 사용하므로 먼저 추가)
+sys.path.insert(0, os.path.abspath('merge_test'))
+sys.path.insert(0, os.path.abspath('merge_test/tools'))
+
 # --- 추가 임포트 ---
-from avatar_qt import MannequinRenderer
+from avatar_qt import MannequinRenderer, RenderPool
 import cv2
 import numpy as np
 
 import platform
 import serial
+import threading
+from collections import deque
 # -----------------
 
-# merge_test 폴더를 모듈 검색 경로에 추가
-sys.path.insert(0, os.path.abspath('merge_test'))
-sys.path.insert(0, os.path.abspath('merge_test/tools'))
-from pages.Single_Player_app import SinglePlayerApp
-from pages.Multi_Player_app import MultiPlayerApp
-from video_to_json import create_json_from_video
+from core.pose_track import reference_path_for
+from core.video_encoder import open_encoder
+from core.live_pose_track import live_track_path_for
+
+# 포즈 모델: .pt(PyTorch) 또는 tools/export_pose_model.py로 내보낸 .onnx / *_openvino_model
+# 환경 변수 POSE_MODEL로 바꿀 수 있습니다.
+POSE_MODEL_PATH = os.environ.get("POSE_MODEL", "merge_test/yolov8l-pose.pt")
+# 게임 중 포즈 추론은 측정한 지연 시간에 맞춰 모델/입력 크기(tier)를 바꿉니다.
+#   POSE_MODEL_TIERS: "a.pt@640,b.pt@320" 처럼 지정(정확한 것부터). 비우면 POSE_MODEL 폴더의
+#                     yolov8{l,m,s,n}-pose 중 있는 것으로 구성하고, "off"면 POSE_MODEL만 씁니다.
+#   POSE_TARGET_MS:   프레임당 추론 시간 예산(ms)
+POSE_MODEL_TIERS = os.environ.get("POSE_MODEL_TIERS", "")
+POSE_TARGET_MS = os.environ.get("POSE_TARGET_MS", "")
+# 싱글 플레이어는 직전 프레임의 사람 주변만 잘라 이 크기로 추론합니다(POSE_ROI_IMGSZ=0이면 항상 전체 프레임).
+POSE_ROI_IMGSZ = int(os.environ.get("POSE_ROI_IMGSZ", "320"))
+# 모델을 불러온 뒤 빈 프레임으로 미리 돌려 보는 횟수(CUDA/oneDNN 초기화를 게임 전에 끝냄)
+MODEL_WARMUP_RUNS = 3
+
+# 아바타 선택 인덱스 → 에셋 팩 폴더
+AVATAR_MAP = {0: "naruto_parts", 1: "dady_parts", 2: "ren_parts", 3: "rumi_parts"}
+# 변환 중 미리보기: N 프레임마다 한 장, 폭 PREVIEW_MAX_WIDTH 이하로 줄여 로딩 화면에 재생합니다.
+PREVIEW_EVERY = 3
+PREVIEW_MAX_WIDTH = 640
+PREVIEW_QUEUE_MAX = 600
 
 def delete_output_files():
     """출력 비디오 파일을 삭제하는 함수"""
@@ -43,6 +68,7 @@ def delete_output_files():
         "resource/output.mp4",
         "resource/output_character.mp4",
         "resource/output.json",
+        live_track_path_for("resource/output.mp4"),
         "resource/output_with_audio.mp4",
         "resource/output_character_with_audio.mp4"
     ]
@@ -89,54 +115,186 @@ class SignalBridge(QObject):
         self.main_view_window.playVideo(videoPath)
 
 
+# 🖼️ 변환 중 미리보기 프레임을 QML Image("image://avatarPreview/...")에 넘겨주는 이미지 프로바이더
+class AvatarPreviewProvider(QQuickImageProvider):
+    def __init__(self, max_frames=PREVIEW_QUEUE_MAX):
+        super().__init__(QQuickImageProvider.Image)
+        self._lock = threading.Lock()
+        self._queue = deque(maxlen=max_frames)
+        self._current = QImage()
+
+    def reset(self):
+        with self._lock:
+            self._queue.clear()
+            self._current = QImage()
+
+    def push(self, frame_bgr):
+        """렌더러가 보낸 BGR 프레임을 재생 대기열에 넣습니다."""
+        h, w = frame_bgr.shape[:2]
+        rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+        image = QImage(rgb.data, w, h, rgb.strides[0], QImage.Format_RGB888).copy()
+        with self._lock:
+            self._queue.append(image)
+
+    def advance(self):
+        """대기열의 다음 프레임을 현재 프레임으로 바꿉니다. 대기열이 비어 있으면 False."""
+        with self._lock:
+            if not self._queue:
+                return False
+            self._current = self._queue.popleft()
+            return True
+
+    def requestImage(self, id, requestedSize):
+        with self._lock:
+            image = self._current
+        return image, image.size()
+
+
+def load_pose_model():
+    """
+    포즈 모델을 불러옵니다. 반환: {"model", "device", "use_half"}
+    torch/ultralytics 임포트도 여기서 처음 일어나므로 백그라운드 스레드에서 호출합니다.
+    """
+    import torch
+    from core.model_registry import get_model
+    from core.pose_backend import is_exported_model
+    from core.model_tiering import TieredPoseBackend, default_tiers, parse_tiers, DEFAULT_TARGET_MS
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    if POSE_MODEL_TIERS == "off":
+        tiers = []
+    elif POSE_MODEL_TIERS:
+        tiers = parse_tiers(POSE_MODEL_TIERS)
+    else:
+        tiers = default_tiers(os.path.dirname(POSE_MODEL_PATH), os.path.basename(POSE_MODEL_PATH))
+
+    if tiers:
+        use_half = (device == "cuda")
+        target_ms = float(POSE_TARGET_MS) if POSE_TARGET_MS else DEFAULT_TARGET_MS
+        model = TieredPoseBackend(tiers, device=device, use_half=use_half, target_ms=target_ms)
+        model.calibrate()
+    else:
+        # 공용 레지스트리에서 받으므로 아바타 변환/레퍼런스 추출도 같은 모델을 씁니다.
+        # 워밍업은 실제 게임 프레임 크기로 warm_up_model에서 합니다.
+        use_half = (device == "cuda") and not is_exported_model(POSE_MODEL_PATH)
+        model = get_model(POSE_MODEL_PATH, device, use_half, warmup_runs=0)
+    return {"model": model, "device": device, "use_half": use_half}
+
+def warm_up_model(model_data, runs=MODEL_WARMUP_RUNS, frame_size=(720, 1280)):
+    """빈 프레임으로 몇 번 추론해 첫 predict의 지연(지연 초기화)을 게임 시작 전에 치릅니다."""
+    from core.model_loader import make_infer
+
+    infer = make_infer(model_data["model"], Namespace(
+        imgsz=640, device=model_data["device"], conf_thres=0.5
+    ), model_data["use_half"])
+    frame = np.zeros((frame_size[0], frame_size[1], 3), np.uint8)
+    for _ in range(runs):
+        infer(frame)
+
+
+# --- 포즈 모델 로더 (백그라운드) ---
+class ModelLoadWorker(QObject):
+    loaded = pyqtSignal(object) # model_data dict
+    failed = pyqtSignal(str)
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            t0 = time.perf_counter()
+            print(f"🧠 포즈 모델을 로드합니다: {POSE_MODEL_PATH}")
+            model_data = load_pose_model()
+            t1 = time.perf_counter()
+            warm_up_model(model_data)
+            t2 = time.perf_counter()
+            print(f"✅ 모델 로드 완료 (load {t1 - t0:.1f}s, warm-up {t2 - t1:.1f}s).")
+            self.loaded.emit(model_data)
+        except Exception as e:
+            print(f"❗ 포즈 모델을 불러오지 못했습니다: {e}")
+            self.failed.emit(str(e))
+
+
 # --- 아바타 변환 작업자 ---
 class ConversionWorker(QObject):
     finished = pyqtSignal()
     totalProgress = pyqtSignal(int) # 전체 진행률 (0-100)
     log = pyqtSignal(str)
+    previewStarted = pyqtSignal(float) # 미리보기 재생 fps
+    previewFrame = pyqtSignal(object) # 축소된 BGR 프레임
 
-    def __init__(self, avatar_name, model, device, use_half, reference_video_path, parent=None):
+    def __init__(self, avatar_name, model, device, use_half, reference_video_path, render_pool=None, parent=None):
         super().__init__(parent)
         self.renderer = None
+        self.render_pool = render_pool
         self.avatar_name = avatar_name
         self.model = model
         self.device = device
         self.use_half = use_half
         self.reference_video_path = reference_video_path
 
+    def _offline_model(self):
+        """
+        포즈 추출에 쓸 모델. 앱이 불러온 모델을 다시 쓰고, tier 백엔드면 실시간 tier 대신
+        가장 정확한 tier의 공용 모델을 씁니다. 모델이 없을 때만 레지스트리에서 받습니다.
+        """
+        from core.model_registry import get_model
+        from core.model_tiering import TieredPoseBackend
+
+        if isinstance(self.model, TieredPoseBackend):
+            return self.model.primary_model
+        if self.model is not None:
+            return self.model
+        return get_model(POSE_MODEL_PATH, self.device, self.use_half)
+
     @pyqtSlot()
     def run(self):
         """Long-running task for avatar conversion."""
+        from video_to_json import create_json_from_video
+
         try:
             # Stage 1: Video to JSON
+            # 게임 중 저장된 실시간 포즈 트랙이 있으면 그대로 쓰고, 빠진 프레임만 다시 추론합니다.
             self.totalProgress.emit(0)
             video_in = "resource/output.mp4"
             json_out = "resource/output.json"
             self.log.emit(f"Starting video to JSON conversion for {video_in}")
             create_json_from_video(
                 video_path=video_in,
-                model_path='merge_test/yolov8l-pose.pt', # Using the same model as main app
+                model_path=POSE_MODEL_PATH, # Using the same model as main app
                 output_json=json_out,
                 imgsz=640,
                 device=self.device,
                 use_half=self.use_half,
-                step=1 # Process every 3rd frame to match renderer stride
+                step=1, # 모든 프레임 (렌더러가 녹화 영상의 프레임마다 아바타를 그림)
+                live_track=live_track_path_for(video_in),
+                # 게임에서 이미 불러온 모델을 그대로 씁니다.
+                # 실시간 트랙이 모든 프레임을 덮으면 모델은 아예 꺼내지 않습니다.
+                model_factory=self._offline_model
             )
             self.log.emit(f"Successfully created {json_out}.")
             self.totalProgress.emit(10)
 
-            # Stage 2: Render frames (10% -> 60%)
+            # Stage 2: Render frames and encode video with audio (10% -> 100%)
+            # 렌더링된 프레임은 순서대로 바로 ffmpeg 인코더로 들어가고, 레퍼런스 영상의
+            # 오디오도 같은 패스에서 합쳐집니다.
             self.log.emit("Loading assets and rendering frames...")
             assets_dir = self.avatar_name
             self.renderer = MannequinRenderer(
                 json_path=json_out,
                 assets_dir=assets_dir,
-                stride=1 # JSON already has a stride, so renderer uses 1
+                stride=1, # JSON already has a stride, so renderer uses 1
+                render_pool=self.render_pool,
+                preview_every=PREVIEW_EVERY,
+                preview_max_width=PREVIEW_MAX_WIDTH,
+                frame_sink=open_encoder(
+                    "resource/output_character_with_audio.mp4", audio_source=self.reference_video_path
+                )
             )
             self.renderer.log.connect(self.log.emit)
             self.renderer.error.connect(self.log.emit)
             self.renderer.progress.connect(self.onRenderProgress)
-            self.renderer.playReady.connect(self.write_video)
+            self.renderer.renderDone.connect(self.onRenderDone)
+            self.renderer.renderStarted.connect(self.onRenderStarted)
+            self.renderer.previewFrame.connect(self.previewFrame.emit)
             
             self.renderer.run()
 
@@ -147,84 +305,19 @@ class ConversionWorker(QObject):
 
     @pyqtSlot(int)
     def onRenderProgress(self, value):
-        # 렌더링 진행률(0-100)을 전체 진행률의 10-60% 범위로 매핑
-        total_progress = 10 + int(value * 0.5)
+        # 렌더링+인코딩 진행률(0-100)을 전체 진행률의 10-99% 범위로 매핑
+        total_progress = 10 + int(value * 0.89)
         self.totalProgress.emit(total_progress)
 
-    def write_video(self, qframes, fps):
-        # Stage 2 is done, we are at 60%.
-        self.totalProgress.emit(60)
-        if not qframes:
-            self.log.emit("No frames to write.")
-            return
-
-        video_out = "resource/output_character.mp4"
-        
-        try:
-            first_frame = qframes[0]
-            height, width = first_frame.height(), first_frame.width()
-
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            writer = cv2.VideoWriter(video_out, fourcc, fps, (width, height))
-
-            self.log.emit(f"Writing video to {video_out}...")
-            total_frames = len(qframes)
-            for i, qframe in enumerate(qframes):
-                img = qframe.convertToFormat(QImage.Format.Format_RGB888)
-                ptr = img.constBits()
-                ptr.setsize(img.sizeInBytes())
-                arr = np.array(ptr).reshape(height, width, 3)  # RGB
-                bgr_frame = cv2.cvtColor(arr, cv2.COLOR_RGB2BGR)
-                writer.write(bgr_frame)
-                
-                # Stage 3: Writing video (60% -> 90% of total progress)
-                video_progress = int((i + 1) * 100 / total_frames)
-                total_progress = 60 + int(video_progress * 0.3)
-                self.totalProgress.emit(total_progress)
-
-            writer.release()
-            self.log.emit("Finished writing video.")
-
-            # Stage 4: Merge audio (90% -> 100%)
-            self.log.emit("Merging audio to final video...")
-            self._merge_audio_to_final_video()
-            self.totalProgress.emit(100)
+    def onRenderStarted(self, frame_count, fps):
+        self.previewStarted.emit(fps / PREVIEW_EVERY)
 
-        except Exception as e:
-            self.log.emit(f"Error writing video or merging audio: {e}")
-
-    def _merge_audio_to_final_video(self):
-        self.log.emit(f"Starting final audio merge...")
-        character_video = "resource/output_character.mp4"
-        output_video_with_audio = "resource/output_character_with_audio.mp4"
-
-        if not self.reference_video_path:
-            self.log.emit("No reference video path provided for audio merge, skipping.")
-            # Copy silent video to the final name so playback doesn't fail
-            import shutil
-            shutil.copy(character_video, output_video_with_audio)
+    def onRenderDone(self, frame_count, fps):
+        if frame_count == 0:
+            self.log.emit("No frames to write.")
             return
-
-        command = [
-            'ffmpeg',
-            '-y',  # Overwrite output file
-            '-i', character_video,
-            '-i', self.reference_video_path,
-            '-c:v', 'copy',
-            '-c:a', 'aac',
-            '-map', '0:v:0',
-            '-map', '1:a:0',
-            '-shortest',
-            output_video_with_audio
-        ]
-
-        try:
-            result = subprocess.run(command, check=True, capture_output=True, text=True)
-            self.log.emit(f"Successfully merged audio to {output_video_with_audio}")
-        except subprocess.CalledProcessError as e:
-            self.log.emit(f"FFmpeg error during final merge: {e.stderr}")
-        except FileNotFoundError:
-            self.log.emit("'ffmpeg' not found. Cannot merge audio.")
+        self.log.emit(f"Finished writing {frame_count} frames at {fps:.2f} fps.")
+        self.totalProgress.emit(100)
 
 
 # 🎮 컨트롤 브리지: 버튼 클릭 시 화면 전환 신호를 보냅니다.
@@ -241,14 +334,25 @@ class ControlBridge(QObject):
     conversionFinishedForControl = pyqtSignal()
     avatarNext = pyqtSignal()
     avatarPrevious = pyqtSignal()
+    modelReadyChanged = pyqtSignal()
+    modelErrorChanged = pyqtSignal()
+    modelLoadRequested = pyqtSignal() # ModelLoadWorker.run (모델 스레드에서 실행)
 
-    def __init__(self, screens, signalBridge, model_data, view_window, parent=None):
+    def __init__(self, screens, signalBridge, model_data, view_window, render_pool=None, preview_provider=None, parent=None):
         super().__init__(parent)
+        self.render_pool = render_pool
+        self.preview_provider = preview_provider
         self.screens = screens
         self.signalBridge = signalBridge
-        self.model = model_data['model']
-        self.device = model_data['device']
-        self.use_half = model_data['use_half']
+        # model_data가 None이면 모델 로딩이 끝난 뒤 setModelData로 채워집니다.
+        self.model = None
+        self.device = None
+        self.use_half = False
+        self._model_ready = False
+        self._model_loading = False
+        self._model_error = ""
+        if model_data is not None:
+            self.setModelData(model_data)
         self.view_window = view_window
         self.game_window = None
         self.last_video_path = None
@@ -267,6 +371,53 @@ class ControlBridge(QObject):
         
         self.ser = serial.Serial(port=port, baudrate=115200, timeout=1)
 
+    @pyqtProperty(bool, notify=modelReadyChanged)
+    def modelReady(self):
+        """포즈 모델 로드/워밍업이 끝났는지. QML의 게임 시작 버튼이 이 값으로 활성화됩니다."""
+        return self._model_ready
+
+    @pyqtProperty(str, notify=modelErrorChanged)
+    def modelError(self):
+        """포즈 모델 로드 실패 메시지(없으면 빈 문자열). QML이 오류와 다시 시도 버튼을 표시합니다."""
+        return self._model_error
+
+    @pyqtSlot()
+    def requestModelLoad(self):
+        """백그라운드 모델 로드를 (다시) 시작합니다. 이미 불러왔거나 불러오는 중이면 무시합니다."""
+        if self._model_ready or self._model_loading:
+            return
+        self._model_loading = True
+        if self._model_error:
+            self._model_error = ""
+            self.modelErrorChanged.emit()
+        self.modelLoadRequested.emit()
+
+    @pyqtSlot(object)
+    def setModelData(self, model_data):
+        self.model = model_data['model']
+        self.device = model_data['device']
+        self.use_half = model_data['use_half']
+        self._model_loading = False
+        self._model_ready = True
+        self.modelReadyChanged.emit()
+
+    @pyqtSlot(str)
+    def onModelLoadFailed(self, message):
+        self._model_loading = False
+        self._model_error = message or "unknown error"
+        self.modelErrorChanged.emit()
+
+    def _checkModelReady(self):
+        """모델이 준비됐으면 True. 로드에 실패한 상태면 다시 불러오기를 시작합니다."""
+        if self._model_ready:
+            return True
+        if self._model_error:
+            print(f"❗ 포즈 모델을 불러오지 못했습니다({self._model_error}). 다시 불러옵니다.")
+            self.requestModelLoad()
+        else:
+            print("❗ 포즈 모델을 준비 중입니다. 잠시 후 다시 시도하세요.")
+        return False
+
     @pyqtSlot(int)
     def onAvatarIndexChanged(self, index):
         print(f"Avatar index changed to: {index}")
@@ -274,8 +425,7 @@ class ControlBridge(QObject):
 
     @pyqtSlot(int)
     def choose(self, index):
-        avatar_map = {0: "naruto_parts", 1: "dady_parts", 2: "ren_parts", 3: "rumi_parts"}
-        avatar_name = avatar_map.get(index, "dady_parts") # Default to dady_parts if index is wrong
+        avatar_name = AVATAR_MAP.get(index, "dady_parts") # Default to dady_parts if index is wrong
         self.startAvatarConversionWithName(avatar_name)
 
     @pyqtSlot(str)
@@ -308,10 +458,14 @@ class ControlBridge(QObject):
     @pyqtSlot(str)
     def startAvatarConversionWithName(self, avatar_name):
         print(f"🔄 아바타 변환 시작 신호 수신: {avatar_name}")
+        if not self._checkModelReady():
+            return
         if self.conversion_thread and self.conversion_thread.isRunning():
             print("❗ Conversion is already in progress.")
             return
 
+        if self.preview_provider:
+            self.preview_provider.reset()
         # 컨트롤 UI를 "변환 중" 상태로 변경
         self.conversionStarted.emit()
         # 메인 뷰를 로딩 화면으로 변경
@@ -319,7 +473,8 @@ class ControlBridge(QObject):
 
         self.conversion_thread = QThread()
         self.conversion_worker = ConversionWorker(
-            avatar_name, self.model, self.device, self.use_half, self.last_video_path
+            avatar_name, self.model, self.device, self.use_half, self.last_video_path,
+            render_pool=self.render_pool
         )
         self.conversion_worker.moveToThread(self.conversion_thread)
 
@@ -330,6 +485,8 @@ class ControlBridge(QObject):
         self.conversion_thread.finished.connect(self.onConversionThreadFinished)
         
         self.conversion_worker.totalProgress.connect(self.updateConversionProgress)
+        self.conversion_worker.previewStarted.connect(self.onPreviewStarted)
+        self.conversion_worker.previewFrame.connect(self.onPreviewFrame)
         self.conversion_worker.finished.connect(self.onConversionFinished)
         self.conversion_worker.log.connect(lambda msg: print(f"[CONVERSION]: {msg}"))
 
@@ -350,6 +507,22 @@ class ControlBridge(QObject):
         if loader and loader.item():
             loader.item().setProperty("conversionProgress", value / 100.0)
 
+    @pyqtSlot(float)
+    def onPreviewStarted(self, fps):
+        # 로딩 화면의 미리보기 타이머 간격을 렌더링 fps/N에 맞춥니다.
+        loader = self.view_window.findChild(QObject, "avatarLoader")
+        if loader and loader.item():
+            loader.item().setProperty("previewInterval", max(15, int(1000 / max(fps, 1e-3))))
+
+    def onPreviewFrame(self, frame):
+        if self.preview_provider:
+            self.preview_provider.push(frame)
+
+    @pyqtSlot(result=bool)
+    def nextPreviewFrame(self):
+        """AvatarLoading.qml의 타이머가 호출합니다. 새 프레임이 있으면 True."""
+        return bool(self.preview_provider and self.preview_provider.advance())
+
     def onConversionFinished(self):
         print("✅ Avatar conversion finished!")
         # 컨트롤 UI를 "변환 완료" 상태로 변경
@@ -401,6 +574,8 @@ class ControlBridge(QObject):
 
     @pyqtSlot(str)
     def startGame(self, videoPath):
+        if not self._checkModelReady():
+            return
         if self.is_multi_player:
             self._startMultiPlayer(videoPath)
         else:
@@ -424,16 +599,18 @@ class ControlBridge(QObject):
         QMetaObject.invokeMethod(self.view_window, "stopForegroundVideo", Qt.QueuedConnection)
 
         # SinglePlayerApp에 필요한 인자(args) 생성
-        json_path = videoPath.replace(".mp4", ".json")
+        json_path = reference_path_for(videoPath)
         args = Namespace(
             ref=videoPath,
             json=json_path,
             imgsz=640,
+            roi_imgsz=POSE_ROI_IMGSZ,
             device=self.device,
             conf_thres=0.5,
         )
 
-        # SinglePlayerApp 인스턴스 생성
+        # SinglePlayerApp 인스턴스 생성 (모델 로더가 torch를 이미 불러왔으므로 빠르게 임포트됩니다)
+        from pages.Single_Player_app import SinglePlayerApp
         self.game_window = SinglePlayerApp(args, self.model, self.use_half, self.ser)
         move_mid = 'w'
         self.ser.write(move_mid.encode())
@@ -464,7 +641,7 @@ class ControlBridge(QObject):
         QMetaObject.invokeMethod(self.view_window, "showBackgroundImage", Qt.QueuedConnection)
         QMetaObject.invokeMethod(self.view_window, "stopForegroundVideo", Qt.QueuedConnection)
 
-        json_path = videoPath.replace(".mp4", ".json")
+        json_path = reference_path_for(videoPath)
         args = Namespace(
             ref=videoPath,
             json=json_path,
@@ -473,6 +650,7 @@ class ControlBridge(QObject):
             conf_thres=0.5,
         )
 
+        from pages.Multi_Player_app import MultiPlayerApp
         self.game_window = MultiPlayerApp(args, self.model, self.use_half, self.ser)
         move_mid = 'w'
         self.ser.write(move_mid.encode())
@@ -485,52 +663,12 @@ class ControlBridge(QObject):
         self.game_window.move(screen_geometry.topLeft())
         self.game_window.showFullScreen()
 
-    def _merge_audio_to_output(self, reference_video_path):
-        print(f"🔊 오디오 병합 시작: 'resource/output.mp4'와 '{reference_video_path}'의 오디오를 합칩니다.")
-        recorded_video = "resource/output.mp4"
-        output_video_with_audio = "resource/output_with_audio.mp4"
-
-        if not os.path.exists(recorded_video):
-            print(f"❗ 녹화된 비디오 파일이 없습니다: {recorded_video}")
-            return
-
-        command = [
-            'ffmpeg',
-            '-y',  # Overwrite output file if it exists
-            '-i', recorded_video,
-            '-i', reference_video_path,
-            '-c:v', 'copy',
-            '-c:a', 'aac',
-            '-map', '0:v:0',
-            '-map', '1:a:0',
-            '-shortest',
-            output_video_with_audio
-        ]
-
-        try:
-            # ffmpeg 실행, 로그 출력을 위해 capture_output=True 사용
-            result = subprocess.run(command, check=True, capture_output=True, text=True)
-            print(f"✅ 오디오 병합 완료: {output_video_with_audio}")
-            print(f"FFmpeg stdout: {result.stdout}")
-            print(f"FFmpeg stderr: {result.stderr}")
-        except subprocess.CalledProcessError as e:
-            print(f"❗ FFmpeg 오류 발생:")
-            print(f"Stderr: {e.stderr}")
-        except FileNotFoundError:
-            print("❗ 'ffmpeg'을 찾을 수 없습니다. 시스템에 설치되어 있는지 확인하세요.")
-
     @pyqtSlot()
     def onGameFinished(self):
         print("🏁 게임 창이 닫혔습니다.")
         move_mid = 'w'
         self.ser.write(move_mid.encode())
 
-        # 오디오 병합 실행
-        if self.last_video_path:
-            self._merge_audio_to_output(self.last_video_path)
-        else:
-            print("❗ last_video_path가 설정되지 않아 오디오를 병합할 수 없습니다.")
-
         if self.game_window:
             if self.is_multi_player:
                 scores = self.game_window.final_score
@@ -549,28 +687,15 @@ class ControlBridge(QObject):
         self.game_window = None
 
 def main():
+    # 렌더링 프로세스 풀은 Qt/모델을 올리기 전에 만들고, 아바타 에셋을 미리 읽혀 둡니다.
+    render_pool = RenderPool()
+    render_pool.warm(AVATAR_MAP.values())
+    atexit.register(render_pool.close)
+
     app = QApplication(sys.argv)
     atexit.register(delete_output_files)
     app.setQuitOnLastWindowClosed(False)
 
-    
-    print("🧠 YOLOv8 모델을 로드합니다...")
-    model = YOLO("merge_test/yolov8l-pose.pt")
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    model.to(device)
-    try:
-        model.fuse()
-    except:
-        pass
-    use_half = (device == "cuda")
-    if use_half:
-        try:
-            model.model.half()
-        except:
-            use_half = False
-    print("✅ 모델 로드 완료.")
-    model_data = {"model": model, "device": device, "use_half": use_half}
-
     screens = QGuiApplication.screens()
     print(f"총 {len(screens)}개의 모니터가 감지되었습니다.")
     for i, screen in enumerate(screens):
@@ -620,7 +745,11 @@ def main():
 
     # 브릿지 등 설정 (기존 코드와 동일)
     signalBridge = SignalBridge(None) 
-    controlBridge = ControlBridge(screens, signalBridge, model_data, None)
+    preview_provider = AvatarPreviewProvider()
+    # 포즈 모델은 창을 띄운 뒤 백그라운드에서 불러오며, 준비되면 controlBridge.modelReady가 true가 됩니다.
+    controlBridge = ControlBridge(
+        screens, signalBridge, None, None, render_pool=render_pool, preview_provider=preview_provider
+    )
 
     event_filter = AppEventFilter(controlBridge)
     app.installEventFilter(event_filter)
@@ -628,6 +757,8 @@ def main():
     view_engine.rootContext().setContextProperty("targetScreen", screen_for_view)
     view_engine.rootContext().setContextProperty("controlBridge", controlBridge)
     view_engine.rootContext().setContextProperty("pyBridge", controlBridge)
+    # 엔진이 프로바이더 소유권을 가져가므로 main()이 끝날 때까지 참조를 유지합니다.
+    view_engine.addImageProvider("avatarPreview", preview_provider)
     view_engine.load(QUrl("Main_view.qml"))
 
     if not view_engine.rootObjects():
@@ -689,8 +820,22 @@ def main():
     controlBridge.showAvatarScreen.connect(lambda: QMetaObject.invokeMethod(view_window, "showAvatarScreen", Qt.QueuedConnection))
     controlBridge.showCredits.connect(lambda: QMetaObject.invokeMethod(view_window, "showCreditVideo", Qt.QueuedConnection))
     controlBridge.showCredits.connect(lambda: QMetaObject.invokeMethod(main_window, "showCreditRoll", Qt.QueuedConnection))
-    
-    sys.exit(app.exec_())
+
+    # 창이 모두 뜬 뒤 무거운 임포트/모델 로드/워밍업을 백그라운드 스레드에서 시작합니다.
+    # 실패하면 화면에 오류를 띄우고, 다시 시도(requestModelLoad)하면 같은 스레드에서 다시 불러옵니다.
+    model_thread = QThread()
+    model_worker = ModelLoadWorker()
+    model_worker.moveToThread(model_thread)
+    controlBridge.modelLoadRequested.connect(model_worker.run)
+    model_worker.loaded.connect(controlBridge.setModelData)
+    model_worker.failed.connect(controlBridge.onModelLoadFailed)
+    model_thread.start()
+    controlBridge.requestModelLoad()
+
+    ret = app.exec_()
+    model_thread.quit()
+    model_thread.wait()
+    sys.exit(ret)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,94 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+# 이름 붙은 NumPy 배열 여러 개와 JSON 헤더를 하나의 파일에 저장하는 컨테이너.
+#   MAGIC(8 bytes) | header_len(uint32 LE) | header(JSON, utf-8) | padding | array data ...
+# 헤더에는 각 배열의 dtype/shape/offset이 들어 있고, 배열은 ALIGN 단위로
+# 정렬되어 있어 디코딩 없이 바로(np.memmap 또는 np.fromfile) 읽을 수 있습니다.
+# write_pack / read_pack_header / read_pack_arrays는 MAGIC과 헤더 키만 다른 다른 포맷
+# (core.pose_track의 .posetrack)도 같이 씁니다.
+MAGIC = b"ARRPACK1"
+ALIGN = 64
+
+
+def _align(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def write_pack(path, magic, header, arrays, key="arrays"):
+    """
+    header(dict)에 header[key] = {이름: dtype/shape/offset}를 채워 넣고 arrays와 함께 씁니다.
+    임시 파일에 쓴 뒤 교체합니다.
+    """
+    arrays = {name: np.ascontiguousarray(arr) for name, arr in arrays.items()}
+    header = dict(header)
+
+    # 헤더 길이가 오프셋에 영향을 주므로, 넉넉한 자리로 먼저 계산한 뒤 확정합니다.
+    def layout(header_len):
+        offset = _align(len(magic) + 4 + header_len)
+        cols = {}
+        for name, arr in arrays.items():
+            cols[name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": offset}
+            offset = _align(offset + arr.nbytes)
+        return cols
+
+    header_len = 0
+    while True:
+        header[key] = layout(header_len)
+        blob = json.dumps(header).encode("utf-8")
+        if len(blob) <= header_len:
+            blob = blob.ljust(header_len)
+            break
+        header_len = len(blob) + 16
+
+    out_dir = os.path.dirname(path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(magic)
+        f.write(struct.pack("<I", len(blob)))
+        f.write(blob)
+        for name, arr in arrays.items():
+            f.seek(header[key][name]["offset"])
+            f.write(arr.tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_pack_header(path, magic):
+    """MAGIC을 확인하고 JSON 헤더를 읽습니다. MAGIC이 다르면 ValueError."""
+    with open(path, "rb") as f:
+        if f.read(len(magic)) != magic:
+            raise ValueError(f"Not a {magic.decode('ascii', 'replace')} file: {path}")
+        (header_len,) = struct.unpack("<I", f.read(4))
+        return json.loads(f.read(header_len).decode("utf-8"))
+
+
+def read_pack_arrays(path, columns, mmap=False):
+    """헤더의 {이름: dtype/shape/offset}로 배열을 읽습니다. mmap=True이면 읽기 전용 memmap."""
+    arrays = {}
+    with open(path, "rb") as f:
+        for name, col in columns.items():
+            dtype = np.dtype(col["dtype"])
+            shape = tuple(col["shape"])
+            count = int(np.prod(shape))
+            if mmap and count > 0:
+                arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=col["offset"], shape=shape)
+            else:
+                f.seek(col["offset"])
+                arrays[name] = np.fromfile(f, dtype=dtype, count=count).reshape(shape)
+    return arrays
+
+
+def save_array_pack(path, arrays, meta=None):
+    """arrays: {이름: ndarray}, meta: JSON으로 저장할 수 있는 dict."""
+    write_pack(path, MAGIC, {"meta": meta or {}}, arrays, key="arrays")
+
+
+def load_array_pack(path, mmap=False):
+    """반환: (meta, {이름: ndarray}). mmap=True이면 읽기 전용 memmap으로 엽니다."""
+    header = read_pack_header(path, MAGIC)
+    return header["meta"], read_pack_arrays(path, header["arrays"], mmap=mmap)
@@ -0,0 +1,192 @@
+import queue
+import threading
+import time
+
+import cv2
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+READ_FAIL_REPORT_EVERY = 100  # 읽기가 계속 실패하면 이 횟수마다 한 번 readFailed를 보냅니다(약 1초).
+
+
+class FrameGrabber(QThread):
+    """
+    웹캠에서 카메라 고유 FPS로 프레임을 읽어오는 스레드.
+    읽은 프레임은 화면 표시용으로 frameReady 시그널을 보내고,
+    추론용으로는 크기 1의 최신 프레임 큐에 넣습니다(이전 프레임은 버림).
+    녹화 중이면 큐에 녹화 파일 안의 프레임 번호를 함께 넣습니다(녹화 중이 아니면 -1).
+    녹화 쓰기가 실패하면(ffmpeg 종료, 디스크 부족 등) writer를 떼어 내 닫고 writeFailed를 보낸 뒤
+    캡처는 계속합니다.
+    """
+    frameReady = pyqtSignal(object, float)  # (frame_bgr, timestamp)
+    readFailed = pyqtSignal(int)  # 연속 실패 횟수 (첫 실패, 이후 READ_FAIL_REPORT_EVERY번마다)
+    writeFailed = pyqtSignal(str)  # 오류 메시지
+
+    def __init__(self, cap, latest_queue, flip=True, parent=None):
+        super().__init__(parent)
+        self.cap = cap
+        self.latest_queue = latest_queue
+        self.flip = flip
+        self._running = True
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._record_index = 0
+
+    def set_video_writer(self, writer):
+        """녹화용 VideoWriter를 교체합니다. None을 넘기면 녹화를 멈춥니다."""
+        with self._writer_lock:
+            self._writer = writer
+            self._record_index = 0
+
+    def stop(self):
+        self._running = False
+
+    def run(self):
+        fails = 0
+        while self._running:
+            ret, frame = self.cap.read()
+            if not ret or frame is None:
+                fails += 1
+                if fails == 1 or fails % READ_FAIL_REPORT_EVERY == 0:
+                    self.readFailed.emit(fails)
+                time.sleep(0.01)
+                continue
+            fails = 0
+            ts = time.monotonic()
+
+            if self.flip:
+                frame = cv2.flip(frame, 1)
+
+            record_index = -1
+            failed_writer, error = None, None
+            with self._writer_lock:
+                if self._writer is not None:
+                    try:
+                        self._writer.write(frame)
+                        record_index = self._record_index
+                        self._record_index += 1
+                    except (IOError, OSError) as e:
+                        failed_writer, self._writer = self._writer, None
+                        error = str(e)
+            if failed_writer is not None:
+                try:
+                    failed_writer.close()
+                except (IOError, OSError) as e:
+                    error = f"{error} / {e}"
+                self.writeFailed.emit(error)
+
+            # 최신 프레임만 유지: 추론이 밀리면 오래된 프레임은 버립니다.
+            try:
+                self.latest_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.latest_queue.put_nowait((frame, ts, record_index))
+
+            self.frameReady.emit(frame, ts)
+
+
+class PoseInferWorker(QThread):
+    """
+    최신 프레임 큐에서 프레임을 꺼내 포즈 추론을 수행하는 스레드.
+    결과는 resultReady 시그널로 (frame, result, timestamp)를 전달합니다.
+    make_infer가 만든 함수를 쓰면 result는 (kps, conf) 입니다.
+    pose_sink가 있으면 녹화된 프레임의 결과를 pose_sink(record_index, result)로도 넘깁니다.
+    """
+    resultReady = pyqtSignal(object, object, float)  # (frame_bgr, result, timestamp)
+
+    def __init__(self, infer_fn, latest_queue, parent=None):
+        super().__init__(parent)
+        self.infer_fn = infer_fn
+        self.latest_queue = latest_queue
+        self._running = True
+        self._enabled = threading.Event()
+        self._pose_sink = None
+
+    def set_pose_sink(self, sink):
+        self._pose_sink = sink
+
+    def set_enabled(self, enabled):
+        if enabled:
+            self._enabled.set()
+        else:
+            self._enabled.clear()
+
+    def stop(self):
+        self._running = False
+        self._enabled.set()  # 대기 중이면 깨워서 종료
+
+    def run(self):
+        while self._running:
+            if not self._enabled.wait(0.1):
+                continue
+            try:
+                frame, ts, record_index = self.latest_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if not self._running:
+                break
+            try:
+                result = self.infer_fn(frame)
+            except Exception as e:
+                print(f"Error during pose inference: {e}")
+                continue
+            sink = self._pose_sink
+            if sink is not None and record_index >= 0:
+                sink(record_index, result)
+            self.resultReady.emit(frame, result, ts)
+
+
+class CapturePipeline(QObject):
+    """
+    캡처 스레드(FrameGrabber)와 추론 스레드(PoseInferWorker)를 묶은 파이프라인.
+    GUI 스레드는 시그널만 받으므로 화면 갱신 속도와 추론 속도가 분리됩니다.
+    """
+    frameReady = pyqtSignal(object, float)
+    resultReady = pyqtSignal(object, object, float)
+    readFailed = pyqtSignal(int)
+    writeFailed = pyqtSignal(str)
+
+    def __init__(self, cap, infer_fn, flip=True, parent=None):
+        super().__init__(parent)
+        self.cap = cap
+        self.infer_fn = infer_fn
+        # 캡처 스레드 시작 전에 카메라 속성을 읽어둡니다(이후에는 cap에 접근하지 않음).
+        self.frame_size = (
+            int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        )
+        self.fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+        self._latest = queue.Queue(maxsize=1)
+        self.grabber = FrameGrabber(cap, self._latest, flip=flip)
+        self.infer_worker = PoseInferWorker(infer_fn, self._latest)
+        self.grabber.frameReady.connect(self.frameReady)
+        self.grabber.readFailed.connect(self.readFailed)
+        self.grabber.writeFailed.connect(self.writeFailed)
+        self.infer_worker.resultReady.connect(self.resultReady)
+
+    def start(self, inference_enabled=False):
+        self.infer_worker.set_enabled(inference_enabled)
+        self.grabber.start()
+        self.infer_worker.start()
+
+    def set_inference_enabled(self, enabled):
+        self.infer_worker.set_enabled(enabled)
+
+    def inference_enabled(self):
+        return self.infer_worker._enabled.is_set()
+
+    def set_video_writer(self, writer):
+        self.grabber.set_video_writer(writer)
+
+    def set_pose_sink(self, sink):
+        """녹화 프레임의 추론 결과를 받을 함수 sink(record_index, result). None이면 해제."""
+        self.infer_worker.set_pose_sink(sink)
+
+    def stop(self):
+        """두 스레드를 멈추고 종료될 때까지 기다립니다."""
+        self.grabber.stop()
+        self.infer_worker.stop()
+        self.grabber.wait()
+        self.infer_worker.wait()
+        self.grabber.set_video_writer(None)
+        self.infer_worker.set_pose_sink(None)
@@ -0,0 +1,117 @@
+import time
+
+import cv2
+import numpy as np
+
+# 아바타 파트 합성용 알파 블렌딩.
+# 스프라이트는 로드할 때 premultiply(BGR * A / 255)해 두고, 합성은
+#   dst = src + dst * (255 - A) / 255
+# 한 번으로 끝냅니다. 나눗셈은 모두 정수 고정소수점(/255 근사)으로 처리합니다.
+#
+# 백엔드: "numba"(prange 병렬), "numpy"(uint16 고정소수점), "cv2"
+# select_backend()가 시작할 때 짧은 벤치마크로 가장 빠른 것을 고릅니다.
+
+BACKENDS = {}
+_backend = None
+
+
+def premultiply(img_bgra):
+    """BGRA(straight alpha) 이미지를 premultiplied BGRA로 바꿉니다."""
+    a = img_bgra[:, :, 3:4].astype(np.uint16)
+    out = img_bgra.copy()
+    out[:, :, :3] = ((img_bgra[:, :, :3].astype(np.uint16) * a + 127) // 255).astype(np.uint8)
+    return out
+
+
+def _blend_numpy(dst, src):
+    inv = 255 - src[:, :, 3:4].astype(np.uint16)
+    t = dst.astype(np.uint16) * inv + 128
+    # (t + (t >> 8)) >> 8 == round(x / 255) (x <= 255*255)
+    dst[:] = ((t + (t >> 8)) >> 8).astype(np.uint8) + src[:, :, :3]
+    return dst
+
+
+def _blend_cv2(dst, src):
+    inv = cv2.bitwise_not(src[:, :, 3])
+    scaled = cv2.multiply(dst, cv2.merge((inv, inv, inv)), scale=1.0 / 255.0)
+    dst[:] = cv2.add(scaled, np.ascontiguousarray(src[:, :, :3]))
+    return dst
+
+
+BACKENDS["numpy"] = _blend_numpy
+BACKENDS["cv2"] = _blend_cv2
+
+try:
+    import numba
+
+    @numba.njit(parallel=True, cache=True)
+    def _blend_numba(dst, src):
+        for y in numba.prange(dst.shape[0]):
+            for x in range(dst.shape[1]):
+                a = np.uint16(src[y, x, 3])
+                if a == 0:
+                    continue
+                inv = np.uint16(255) - a
+                for c in range(3):
+                    t = np.uint16(dst[y, x, c]) * inv + np.uint16(128)
+                    dst[y, x, c] = np.uint8(((t + (t >> 8)) >> 8) + np.uint16(src[y, x, c]))
+        return dst
+
+    BACKENDS["numba"] = _blend_numba
+except ImportError:
+    numba = None
+
+
+def set_threads(n):
+    """numba 백엔드의 스레드 수. 프로세스 풀 워커처럼 이미 병렬인 곳에서는 1로 둡니다."""
+    if numba is not None:
+        numba.set_num_threads(max(1, min(int(n), numba.config.NUMBA_NUM_THREADS)))
+
+
+def use_backend(name):
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown compositor backend: {name} (available: {', '.join(BACKENDS)})")
+    _backend = name
+
+
+def backend_name():
+    return _backend
+
+
+def select_backend(size=(240, 160), repeat=20):
+    """
+    전형적인 파트 ROI 크기로 각 백엔드를 측정해 가장 빠른 것을 선택합니다.
+    numba는 첫 호출(JIT 컴파일)을 측정에서 제외합니다. 반환: (이름, {이름: ms})
+    """
+    rng = np.random.default_rng(0)
+    h, w = size
+    src = rng.integers(0, 256, (h, w, 4), dtype=np.uint8)
+    src[rng.random((h, w)) < 0.5, 3] = 0
+    src = premultiply(src)
+    base = rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+
+    timings = {}
+    for name, fn in BACKENDS.items():
+        try:
+            fn(base.copy(), src)
+        except Exception as e:
+            print(f"[warning] compositor backend '{name}' failed: {e}")
+            continue
+        dst = base.copy()
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            dst[:] = base
+            fn(dst, src)
+        timings[name] = (time.perf_counter() - t0) * 1000.0 / repeat
+
+    best = min(timings, key=timings.get)
+    use_backend(best)
+    return best, timings
+
+
+def alpha_blend(dst, src_premul):
+    """premultiplied BGRA src를 BGR dst(뷰 가능)에 제자리 합성합니다."""
+    if _backend is None:
+        select_backend()
+    return BACKENDS[_backend](dst, src_premul)
@@ -0,0 +1,64 @@
+import os
+import threading
+
+import numpy as np
+
+from core.pose_track import POSE_TRACK_EXT, NUM_KPTS, save_pose_track
+
+# 게임 중 녹화 영상(output.mp4)과 함께 저장하는 실시간 포즈 트랙.
+# frame_index는 녹화 파일 안의 프레임 번호이고, 추론이 돌았던 프레임만 들어 있습니다.
+# 아바타 변환은 이 트랙을 그대로 쓰고, 빠진 프레임만 영상에서 다시 추론합니다.
+LIVE_TRACK_SUFFIX = ".live" + POSE_TRACK_EXT
+
+
+def live_track_path_for(video_path):
+    base, _ = os.path.splitext(video_path)
+    return base + LIVE_TRACK_SUFFIX
+
+
+def _as_kps_conf(kps, conf):
+    """(kps, conf)를 고정 크기 배열로 맞춥니다. 사람이 없으면 NaN으로 채웁니다."""
+    if kps is None:
+        return np.full((NUM_KPTS, 2), np.nan, np.float32), np.full(NUM_KPTS, np.nan, np.float32)
+    conf = np.full(NUM_KPTS, np.nan, np.float32) if conf is None else conf
+    return np.array(kps, np.float32).reshape(NUM_KPTS, 2), np.array(conf, np.float32).reshape(NUM_KPTS)
+
+
+class LivePoseRecorder:
+    """
+    캡처 파이프라인의 pose_sink로 연결해 녹화 프레임별 추론 결과를 모읍니다.
+    extract(result) -> (kps, conf): 추론 결과에서 한 사람을 고르는 함수(기본은 make_infer 형식).
+    """
+
+    def __init__(self, extract=None):
+        self.extract = extract
+        self._lock = threading.Lock()
+        self._frames = {}
+
+    def add(self, frame_index, result):
+        kps, conf = _as_kps_conf(*(self.extract(result) if self.extract else result))
+        with self._lock:
+            self._frames[int(frame_index)] = (kps, conf)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._frames)
+
+    def save(self, path, fps, video_size, num_frames=None):
+        """
+        모은 프레임을 .posetrack으로 저장합니다. num_frames(녹화된 프레임 수)를 넘기면
+        그 범위를 벗어난 결과는 버립니다. 저장한 프레임 수를 반환합니다.
+        """
+        with self._lock:
+            items = sorted(self._frames.items())
+        if num_frames is not None:
+            items = [(i, v) for i, v in items if i < num_frames]
+
+        frame_index = np.array([i for i, _ in items], dtype=np.int32)
+        kps = np.array([v[0] for _, v in items], dtype=np.float32).reshape(-1, NUM_KPTS, 2)
+        conf = np.array([v[1] for _, v in items], dtype=np.float32).reshape(-1, NUM_KPTS)
+        save_pose_track(
+            path, frame_index, frame_index / float(fps), kps, conf,
+            fps=fps, stride=1, video_size=video_size
+        )
+        return len(items)
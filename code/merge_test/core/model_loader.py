@@ -2,17 +2,26 @@ import torch
 import numpy as np
 from ultralytics import YOLO
 from core.pose_utils import KPT_CONF_THRES
+from core.pose_backend import (
+    PoseBackend, UltralyticsBackend, is_exported_model, load_backend, LIVE_PRIORITY, BATCH_PRIORITY
+)
 
 def load_model(model_path: str, device: str, use_half: bool):
     """
     Loads a YOLO pose model from the given path.
+    .onnx / OpenVINO(.xml, *_openvino_model) 경로면 내보낸 모델용 PoseBackend를 반환합니다.
     """
     if not torch.cuda.is_available() and device == 'cuda':
         print("CUDA is not available. Using CPU instead.")
         device = 'cpu'
         use_half = False
-    
+
     try:
+        if is_exported_model(model_path):
+            # 정밀도(FP16/INT8)는 내보낼 때 정해지므로 use_half는 쓰지 않습니다.
+            model = load_backend(model_path, device)
+            print(f"Successfully loaded {model.name} model from {model_path}.")
+            return model, False
         model = YOLO(model_path)
         model.to(device)
         model.eval()
@@ -22,22 +31,42 @@ def load_model(model_path: str, device: str, use_half: bool):
         print(f"Error loading model: {e}")
         return None, use_half
 
+def as_backend(model, args, use_half: bool, priority=LIVE_PRIORITY):
+    """YOLO 모델이면 UltralyticsBackend로 감싸고, PoseBackend면 args에 맞춘 백엔드를 반환합니다."""
+    if isinstance(model, PoseBackend):
+        return model.for_args(args, use_half, priority)
+    return UltralyticsBackend(model, imgsz=args.imgsz, device=args.device, half=use_half, conf=args.conf_thres)
+
+def _largest_person(det):
+    """
+    PoseDetections 하나에서 가장 큰 사람의 (kps, conf)를 꺼냅니다. 사람이 없으면 (None, None).
+    """
+    if len(det.kps) == 0:
+        return None, None
+    if len(det.boxes) > 1:
+        areas = (det.boxes[:, 2] - det.boxes[:, 0]) * (det.boxes[:, 3] - det.boxes[:, 1])
+        idx = int(np.argmax(areas))
+    else:
+        idx = 0
+    kps = det.kps[idx].copy()
+    conf = det.kps_conf[idx].copy()
+    kps[conf < KPT_CONF_THRES] = np.nan
+    return kps, conf
+
 def make_infer(model, args, use_half: bool):
+    backend = as_backend(model, args, use_half)
     def infer_pose(frame):
-        with torch.inference_mode():
-            res = model.predict(
-                frame, imgsz=args.imgsz, device=args.device,
-                half=use_half, conf=args.conf_thres, verbose=False
-            )[0]
-        if (res.keypoints is None) or (len(res.keypoints) == 0):
-            return None, None
-        if len(res.boxes) > 1:
-            areas = (res.boxes.xywh[:,2] * res.boxes.xywh[:,3]).detach().cpu().numpy()
-            idx = int(np.argmax(areas))
-        else:
-            idx = 0
-        kps = res.keypoints.xy[idx].detach().cpu().numpy()
-        conf = res.keypoints.conf[idx].detach().cpu().numpy()
-        kps[conf < KPT_CONF_THRES] = np.nan
-        return kps, conf
+        return _largest_person(backend.predict([frame], conf=args.conf_thres)[0])
     return infer_pose
+
+def make_batch_infer(model, args, use_half: bool):
+    """
+    여러 프레임을 한 번의 predict 호출로 처리하는 추론 함수를 만듭니다.
+    반환 함수: list[frame] -> list[(kps, conf)]
+    """
+    backend = as_backend(model, args, use_half, priority=BATCH_PRIORITY)
+    def infer_pose_batch(frames):
+        if not frames:
+            return []
+        return [_largest_person(det) for det in backend.predict(list(frames), conf=args.conf_thres)]
+    return infer_pose_batch
@@ -0,0 +1,186 @@
+import itertools
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from core.model_loader import load_model
+from core.pose_backend import PoseBackend, UltralyticsBackend, LIVE_PRIORITY
+
+# 프로세스 전체에서 포즈 모델을 한 번만 불러와 함께 쓰기 위한 레지스트리.
+#  - get_model(weights, device, half): (weights, device, half)마다 한 번만 불러오고 워밍업까지 해서 돌려줍니다.
+#  - 모든 추론은 하나의 추론 스레드(InferenceQueue)에서 차례로 실행됩니다. 게임(실시간)과
+#    레퍼런스 추출(배치)이 동시에 돌아도 모델/GPU를 두고 다투지 않고, 실시간 요청이 먼저 처리됩니다.
+# 반환되는 SharedPoseModel은 PoseBackend이므로 make_infer / make_batch_infer에 그대로 넘기면 됩니다.
+
+DEFAULT_WARMUP_RUNS = 2
+
+
+class InferenceQueue:
+    """우선순위 큐 + 추론 스레드 하나. submit(fn, priority)는 Future를 반환합니다(작은 값이 먼저)."""
+
+    def __init__(self):
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, priority=LIVE_PRIORITY):
+        future = Future()
+        if threading.current_thread() is self._thread:
+            # 추론 스레드 안에서 다시 요청하면 바로 실행합니다(자기 자신을 기다리며 멈추지 않도록).
+            future.set_result(fn())
+            return future
+        self._ensure_thread()
+        self._queue.put((priority, next(self._seq), fn, future))
+        return future
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="pose-inference", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            _, _, fn, future = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+
+
+_inference_queue = InferenceQueue()
+_models = {}
+_models_lock = threading.Lock()
+
+
+class SharedPoseModel(PoseBackend):
+    """
+    레지스트리가 들고 있는 모델 하나. predict는 공용 추론 큐를 거쳐 실행됩니다.
+    .pt 모델은 요청마다 imgsz를 다르게 줄 수 있습니다(내보낸 모델은 입력 크기가 고정).
+    """
+
+    def __init__(self, key, model, device, use_half, inference_queue):
+        self.key = key
+        self.model = model
+        self.device = device
+        self.use_half = use_half
+        self.name = model.name if isinstance(model, PoseBackend) else UltralyticsBackend.name
+        self.can_track = not isinstance(model, PoseBackend)
+        self._queue = inference_queue
+        self._ultralytics = {}
+
+    def _backend(self, imgsz):
+        if isinstance(self.model, PoseBackend):
+            return self.model
+        if imgsz not in self._ultralytics:
+            self._ultralytics[imgsz] = UltralyticsBackend(
+                self.model, imgsz=imgsz, device=self.device, half=self.use_half
+            )
+        return self._ultralytics[imgsz]
+
+    def _submit_timed(self, fn, priority):
+        """
+        fn을 추론 큐에서 실행하고 (결과, ms)를 반환합니다. ms는 추론 스레드에서 fn만 잰 시간이라
+        큐에서 다른 작업을 기다린 시간은 들어가지 않습니다.
+        """
+        def run():
+            t0 = time.perf_counter()
+            out = fn()
+            return out, (time.perf_counter() - t0) * 1000.0
+        return self._queue.submit(run, priority).result()
+
+    def predict_timed(self, frames, conf=None, imgsz=640, priority=LIVE_PRIORITY):
+        backend = self._backend(imgsz)
+        frames = list(frames)
+        return self._submit_timed(lambda: backend.predict(frames, conf=conf), priority)
+
+    def predict(self, frames, conf=None, imgsz=640, priority=LIVE_PRIORITY):
+        return self.predict_timed(frames, conf=conf, imgsz=imgsz, priority=priority)[0]
+
+    def track_timed(self, frame, priority=LIVE_PRIORITY, **kwargs):
+        """YOLO(.pt) 모델의 track()을 공용 추론 큐에서 실행합니다(멀티 플레이어 추적용). (results, ms)"""
+        if not self.can_track:
+            raise TypeError(f"{self.name} model does not support tracking.")
+
+        def run():
+            import torch
+            with torch.inference_mode():
+                return self.model.track(frame, **kwargs)
+        return self._submit_timed(run, priority)
+
+    def track(self, frame, priority=LIVE_PRIORITY, **kwargs):
+        return self.track_timed(frame, priority=priority, **kwargs)[0]
+
+    def for_args(self, args, use_half=None, priority=LIVE_PRIORITY):
+        return _BoundPoseModel(self, getattr(args, "imgsz", 640), getattr(args, "conf_thres", None), priority)
+
+
+class _BoundPoseModel(PoseBackend):
+    """SharedPoseModel에 imgsz/conf/우선순위를 고정한 뷰 (make_infer가 사용)."""
+
+    def __init__(self, shared, imgsz, conf, priority):
+        self.shared = shared
+        self.name = shared.name
+        self.can_track = shared.can_track
+        self.imgsz = imgsz
+        self.conf = conf
+        self.priority = priority
+
+    def predict_timed(self, frames, conf=None):
+        return self.shared.predict_timed(frames, conf=self.conf if conf is None else conf,
+                                         imgsz=self.imgsz, priority=self.priority)
+
+    def predict(self, frames, conf=None):
+        return self.predict_timed(frames, conf=conf)[0]
+
+    def track_timed(self, frame, **kwargs):
+        kwargs["imgsz"] = self.imgsz
+        return self.shared.track_timed(frame, priority=self.priority, **kwargs)
+
+    def track(self, frame, **kwargs):
+        return self.track_timed(frame, **kwargs)[0]
+
+
+def get_model(weights, device, use_half, warmup_runs=DEFAULT_WARMUP_RUNS, imgsz=640):
+    """
+    (weights, device, half)에 해당하는 SharedPoseModel을 반환합니다. 처음이면 불러오고
+    빈 프레임으로 warmup_runs번 추론해 둡니다. 불러오지 못하면 RuntimeError.
+    """
+    key = (os.path.abspath(weights), device, bool(use_half))
+    with _models_lock:
+        shared = _models.get(key)
+        if shared is not None:
+            return shared
+
+        model, half = load_model(weights, device, use_half)
+        if model is None:
+            raise RuntimeError(f"Could not load pose model {weights}")
+        if not isinstance(model, PoseBackend):
+            try:
+                model.fuse()
+            except Exception:
+                pass
+        if device == "cuda" and not isinstance(model, PoseBackend):
+            # load_model이 CUDA가 없어 CPU로 바꿨을 수 있으므로 실제 장치를 씁니다.
+            import torch
+            if not torch.cuda.is_available():
+                device = "cpu"
+        shared = SharedPoseModel(key, model, device, half, _inference_queue)
+        frame = np.zeros((imgsz, imgsz, 3), np.uint8)
+        for _ in range(warmup_runs):
+            shared.predict([frame], imgsz=imgsz)
+        _models[key] = shared
+        return shared
+
+
+def loaded_models():
+    """현재 불러와 있는 모델의 (weights, device, half) 목록"""
+    with _models_lock:
+        return list(_models)
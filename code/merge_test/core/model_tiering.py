@@ -0,0 +1,227 @@
+import os
+import threading
+from collections import namedtuple
+from types import SimpleNamespace
+
+import numpy as np
+
+from core.model_registry import get_model
+from core.pose_backend import PoseBackend, LIVE_PRIORITY
+
+# 측정한 추론 시간에 맞춰 포즈 모델 크기/입력 크기(tier)를 고르는 백엔드.
+# 시작할 때 쓸 수 있는 tier를 모두 측정해 프레임 예산(target_ms) 안에 드는 가장 정확한 tier로 시작하고,
+# 게임 중에는 프레임당 시간을 지수 이동 평균으로 보며 예산을 넘으면 한 단계 내리고,
+# 여유가 충분하면 한 단계 올립니다. 자주 바뀌지 않도록 전환 후 일정 프레임은 기다립니다.
+
+ModelTier = namedtuple("ModelTier", ["weights", "imgsz"])
+
+DEFAULT_TARGET_MS = 66.0    # 추론 15fps 정도. 화면은 캡처 스레드가 카메라 fps로 따로 그립니다.
+EMA_ALPHA = 0.1
+DOWNGRADE_RATIO = 1.2       # ema > target * 1.2 이면 한 단계 가볍게
+UPGRADE_RATIO = 0.8         # 윗 단계의 예상 시간이 target * 0.8 이하이면 한 단계 무겁게
+DOWNGRADE_COOLDOWN = 15     # 전환 후 이 프레임 수가 지나야 다시 내릴 수 있음
+UPGRADE_COOLDOWN = 90       # 올리는 쪽은 더 보수적으로
+
+
+def default_tiers(weights_dir, primary="yolov8l-pose.pt"):
+    """
+    정확한 것부터 빠른 것 순서의 기본 tier 목록. 파일이 있는 모델만 남깁니다.
+    primary는 항상 맨 앞(가장 정확한 tier)에 둡니다.
+    """
+    candidates = [
+        (primary, 640), (primary, 480),
+        ("yolov8m-pose.pt", 640), ("yolov8m-pose.pt", 480),
+        ("yolov8s-pose.pt", 480), ("yolov8n-pose.pt", 416), ("yolov8n-pose.pt", 320),
+    ]
+    tiers = []
+    for name, imgsz in candidates:
+        path = name if os.path.isabs(name) else os.path.join(weights_dir, name)
+        tier = ModelTier(path, imgsz)
+        if os.path.exists(path) and tier not in tiers:
+            tiers.append(tier)
+    return tiers
+
+
+def parse_tiers(spec):
+    """'a.pt@640,b.onnx,c.pt@320' 형식의 문자열을 tier 목록으로 바꿉니다(imgsz 생략 시 640)."""
+    tiers = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        path, _, imgsz = item.partition("@")
+        tiers.append(ModelTier(path, int(imgsz) if imgsz else 640))
+    return tiers
+
+
+class TieredPoseBackend(PoseBackend):
+    """
+    여러 tier의 백엔드를 들고 있다가 측정한 지연 시간에 따라 바꿔 쓰는 PoseBackend.
+    predict는 추론 스레드 하나에서만 호출된다고 가정합니다(tier 전환도 그 스레드에서 일어남).
+    """
+    name = "tiered"
+
+    def __init__(self, tiers, device="cpu", use_half=False, target_ms=DEFAULT_TARGET_MS, conf=0.25):
+        if not tiers:
+            raise ValueError("TieredPoseBackend needs at least one model tier.")
+        self.tiers = list(tiers)
+        self.device = device
+        self.use_half = use_half
+        self.target_ms = float(target_ms)
+        self.conf = conf
+
+        self._shared = []
+        self._backends = []
+        self.calibrated_ms = [None] * len(self.tiers)
+        self.index = 0
+        self.ema_ms = None
+        self._since_switch = 0
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    def _load(self, tier):
+        """
+        tier의 (공용 모델, tier imgsz로 고정한 백엔드)를 만듭니다. 모델은 공용 레지스트리에서 받으므로
+        같은 가중치는 imgsz만 다르게 해서 공유되고, 아바타 변환 등 다른 곳에서도 다시 불러오지 않습니다.
+        """
+        shared = get_model(tier.weights, self.device, self.use_half, warmup_runs=0)
+        return shared, shared.for_args(SimpleNamespace(imgsz=tier.imgsz, conf_thres=self.conf))
+
+    def calibrate(self, frame_size=(720, 1280), runs=5, warmup=2):
+        """
+        모든 tier를 불러와 빈 프레임으로 지연 시간을 측정하고 시작 tier를 고릅니다.
+        불러오지 못한 tier는 목록에서 뺍니다. 반환: [(tier, ms)]
+        """
+        frame = np.zeros((frame_size[0], frame_size[1], 3), np.uint8)
+        tiers, shared_models, backends, timings = [], [], [], []
+        for tier in self.tiers:
+            try:
+                shared, backend = self._load(tier)
+                for _ in range(warmup):
+                    backend.predict([frame])
+                ms = sum(backend.predict_timed([frame])[1] for _ in range(runs)) / runs
+            except Exception as e:
+                print(f"[warning] model tier {tier} skipped: {e}")
+                continue
+            tiers.append(tier)
+            shared_models.append(shared)
+            backends.append(backend)
+            timings.append(ms)
+            print(f"[info] model tier {os.path.basename(tier.weights)}@{tier.imgsz}: {ms:.1f} ms")
+        if not tiers:
+            raise RuntimeError("No usable pose model tier.")
+
+        self.tiers, self._shared, self._backends, self.calibrated_ms = tiers, shared_models, backends, timings
+        # 예산 안에 드는 가장 정확한 tier, 없으면 가장 빠른 tier
+        fits = [i for i, ms in enumerate(timings) if ms <= self.target_ms]
+        self._switch(fits[0] if fits else int(np.argmin(timings)), reason="calibrated")
+        return list(zip(tiers, timings))
+
+    # ------------------------------------------------------------------
+    @property
+    def tier(self):
+        return self.tiers[self.index]
+
+    @property
+    def backend(self):
+        if not self._backends:
+            self.calibrate()
+        return self._backends[self.index]
+
+    @property
+    def primary_model(self):
+        """가장 정확한 tier의 공용 모델. 아바타 변환처럼 지연 예산이 없는 오프라인 추론에 씁니다."""
+        if not self._shared:
+            self.calibrate()
+        return self._shared[0]
+
+    def _switch(self, index, reason):
+        with self._lock:
+            old = self.index
+            self.index = index
+            # 새 tier의 예상 시간으로 평균을 다시 시작합니다.
+            self.ema_ms = self.calibrated_ms[index]
+            self._since_switch = 0
+        if old != index or reason == "calibrated":
+            t = self.tiers[index]
+            print(f"[info] pose model tier -> {os.path.basename(t.weights)}@{t.imgsz} ({reason})")
+
+    def _observe(self, ms):
+        self.ema_ms = ms if self.ema_ms is None else self.ema_ms + EMA_ALPHA * (ms - self.ema_ms)
+        self._since_switch += 1
+
+        if (self.ema_ms > self.target_ms * DOWNGRADE_RATIO and self._since_switch >= DOWNGRADE_COOLDOWN
+                and self.index + 1 < len(self.tiers)):
+            self._switch(self.index + 1, reason=f"{self.ema_ms:.0f} ms > {self.target_ms:.0f} ms")
+            return
+
+        if self.index > 0 and self._since_switch >= UPGRADE_COOLDOWN:
+            # 지금 측정값과 보정값의 비율로 윗 tier의 현재 시간을 추정합니다(다른 부하를 반영).
+            load = self.ema_ms / max(self.calibrated_ms[self.index], 1e-3)
+            expected = self.calibrated_ms[self.index - 1] * load
+            if expected <= self.target_ms * UPGRADE_RATIO:
+                self._switch(self.index - 1, reason=f"expected {expected:.0f} ms")
+
+    def predict(self, frames, conf=None):
+        # 공용 추론 큐에서 기다린 시간이 아니라 모델 호출 시간만으로 tier를 판단합니다.
+        out, ms = self.backend.predict_timed(frames, conf=conf)
+        if frames:
+            self._observe(ms / len(frames))
+        return out
+
+    def for_args(self, args, use_half=None, priority=LIVE_PRIORITY):
+        """
+        args.imgsz가 모든 tier의 imgsz 이상이면(보통의 전체 프레임 추론) tier가 입력 크기를 정하므로
+        자기 자신을 반환합니다. 더 작으면(ROI로 잘라낸 영역 등) 지금 tier의 모델을 그 imgsz로 돌리는
+        뷰를 반환하고, 그 시간은 tier 판단(지연 시간 평균)에 넣지 않습니다.
+        """
+        imgsz = getattr(args, "imgsz", None)
+        if imgsz is None or imgsz >= max(t.imgsz for t in self.tiers):
+            return self
+        return _TierImgszView(self, imgsz, getattr(args, "conf_thres", None), priority)
+
+    @property
+    def can_track(self):
+        """지금 tier가 .pt 모델이면 Ultralytics track()(BoT-SORT)을 쓸 수 있습니다."""
+        return getattr(self.backend, "can_track", False)
+
+    def track(self, frame, **kwargs):
+        """
+        지금 tier 모델로 track()을 실행합니다(imgsz는 tier 값). tier가 바뀌면 트래커 id도
+        새로 시작하지만, 멀티 플레이어는 x좌표 순으로 번호를 다시 매기므로 영향이 없습니다.
+        """
+        backend = self.backend
+        if not getattr(backend, "can_track", False):
+            raise TypeError(f"Tier {self.tier} does not support tracking.")
+        results, ms = backend.track_timed(frame, **kwargs)
+        self._observe(ms)
+        return results
+
+    def stats(self):
+        t = self.tier
+        return {"tier": f"{os.path.basename(t.weights)}@{t.imgsz}", "ema_ms": self.ema_ms,
+                "target_ms": self.target_ms}
+
+
+class _TierImgszView(PoseBackend):
+    """TieredPoseBackend의 지금 tier 모델을 더 작은 imgsz로 돌리는 뷰. tier 전환/지연 측정에는 관여하지 않습니다."""
+
+    def __init__(self, tiered, imgsz, conf, priority):
+        self.tiered = tiered
+        self.imgsz = imgsz
+        self.conf = conf
+        self.priority = priority
+
+    @property
+    def name(self):
+        return self.tiered.backend.name
+
+    def predict_timed(self, frames, conf=None):
+        tiered = self.tiered
+        tiered.backend  # 아직 보정 전이면 calibrate
+        shared = tiered._shared[tiered.index]
+        return shared.predict_timed(frames, conf=self.conf if conf is None else conf,
+                                    imgsz=min(self.imgsz, tiered.tier.imgsz), priority=self.priority)
+
+    def predict(self, frames, conf=None):
+        return self.predict_timed(frames, conf=conf)[0]
@@ -0,0 +1,230 @@
+import os
+import time
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+# 포즈 추론 백엔드.
+# 모든 백엔드는 predict(frames, conf=None) -> list[PoseDetections]를 제공하고,
+# 좌표는 모두 원본 프레임 기준입니다. make_infer / make_batch_infer는 이 위에서 (kps, conf)를 만듭니다.
+#   - UltralyticsBackend: 기존 YOLO(.pt) 모델 (PyTorch)
+#   - OnnxPoseBackend:    yolo export format=onnx 로 만든 .onnx (ONNX Runtime, FP32/FP16)
+#   - OpenVINOPoseBackend: yolo export format=openvino 로 만든 IR(.xml, FP32/FP16/INT8)
+# 내보낸 모델은 letterbox 전처리, NMS, 키포인트 디코딩을 여기서 직접 처리합니다.
+
+PoseDetections = namedtuple("PoseDetections", ["boxes", "scores", "kps", "kps_conf"])
+# boxes: (N,4) xyxy, scores: (N,), kps: (N,17,2), kps_conf: (N,17)
+
+NUM_KPTS = 17
+# 공용 추론 큐(core.model_registry)의 우선순위. 게임 중 실시간 추론이 배치 추출보다 먼저 처리됩니다.
+LIVE_PRIORITY = 0
+BATCH_PRIORITY = 1
+LETTERBOX_COLOR = (114, 114, 114)
+DEFAULT_IOU_THRES = 0.7
+MAX_DET = 300
+
+
+def empty_detections():
+    return PoseDetections(
+        np.zeros((0, 4), np.float32), np.zeros(0, np.float32),
+        np.zeros((0, NUM_KPTS, 2), np.float32), np.zeros((0, NUM_KPTS), np.float32)
+    )
+
+
+class PoseBackend:
+    name = "base"
+    can_track = False  # Ultralytics track()(BoT-SORT) 지원 여부
+
+    def predict(self, frames, conf=None):
+        raise NotImplementedError
+
+    def predict_timed(self, frames, conf=None):
+        """predict와 같고, 추론에 걸린 시간(ms)을 함께 반환합니다: (detections, ms)"""
+        t0 = time.perf_counter()
+        out = self.predict(frames, conf=conf)
+        return out, (time.perf_counter() - t0) * 1000.0
+
+    def for_args(self, args, use_half=None, priority=LIVE_PRIORITY):
+        """make_infer의 args(imgsz, conf_thres)에 맞춘 백엔드. 기본은 자기 자신."""
+        return self
+
+
+class UltralyticsBackend(PoseBackend):
+    """YOLO(.pt) 모델을 감싼 백엔드. 전처리/후처리는 Ultralytics가 합니다."""
+    name = "ultralytics"
+
+    def __init__(self, model, imgsz=640, device=None, half=False, conf=0.25):
+        self.model = model
+        self.imgsz = imgsz
+        self.device = device
+        self.half = half
+        self.conf = conf
+
+    def predict(self, frames, conf=None):
+        import torch
+
+        if not frames:
+            return []
+        with torch.inference_mode():
+            results = self.model.predict(
+                list(frames), imgsz=self.imgsz, device=self.device,
+                half=self.half, conf=self.conf if conf is None else conf, verbose=False
+            )
+        return [self._to_detections(res) for res in results]
+
+    @staticmethod
+    def _to_detections(res):
+        if (res.keypoints is None) or (len(res.keypoints) == 0):
+            return empty_detections()
+        return PoseDetections(
+            res.boxes.xyxy.detach().cpu().numpy().astype(np.float32),
+            res.boxes.conf.detach().cpu().numpy().astype(np.float32),
+            res.keypoints.xy.detach().cpu().numpy().astype(np.float32),
+            res.keypoints.conf.detach().cpu().numpy().astype(np.float32),
+        )
+
+
+def letterbox(frame, size):
+    """
+    비율을 유지해 size(h, w)에 맞추고 남는 부분을 회색으로 채웁니다(Ultralytics LetterBox와 동일).
+    반환: (img, gain, (pad_x, pad_y))
+    """
+    h, w = frame.shape[:2]
+    th, tw = size
+    gain = min(th / h, tw / w)
+    nw, nh = int(round(w * gain)), int(round(h * gain))
+    pad_x, pad_y = (tw - nw) / 2.0, (th - nh) / 2.0
+    if (nw, nh) != (w, h):
+        frame = cv2.resize(frame, (nw, nh), interpolation=cv2.INTER_LINEAR)
+    top, bottom = int(round(pad_y - 0.1)), int(round(pad_y + 0.1))
+    left, right = int(round(pad_x - 0.1)), int(round(pad_x + 0.1))
+    img = cv2.copyMakeBorder(frame, top, bottom, left, right, cv2.BORDER_CONSTANT, value=LETTERBOX_COLOR)
+    return img, gain, (left, top)
+
+
+def decode_pose_output(pred, conf_thres, iou_thres, gain, pad, max_det=MAX_DET):
+    """
+    내보낸 YOLOv8-pose의 출력 (4+1+17*3, anchors)을 PoseDetections로 바꿉니다.
+    박스는 (cx, cy, w, h), 키포인트는 (x, y, visibility) 순서이고 점수는 이미 sigmoid가 적용되어 있습니다.
+    """
+    pred = np.asarray(pred, np.float32)
+    if pred.ndim == 3:
+        pred = pred[0]
+    pred = pred.T  # (anchors, 56)
+    scores = pred[:, 4]
+    keep = scores > conf_thres
+    if not keep.any():
+        return empty_detections()
+    pred, scores = pred[keep], scores[keep]
+
+    cx, cy, bw, bh = pred[:, 0], pred[:, 1], pred[:, 2], pred[:, 3]
+    xywh = np.stack([cx - bw / 2, cy - bh / 2, bw, bh], axis=1)
+    idx = cv2.dnn.NMSBoxes(xywh.tolist(), scores.tolist(), conf_thres, iou_thres)
+    idx = np.array(idx, dtype=np.int64).reshape(-1)[:max_det]
+    if len(idx) == 0:
+        return empty_detections()
+
+    pad = np.array(pad, np.float32)
+    boxes = xywh[idx].copy()
+    boxes[:, 2:] += boxes[:, :2]
+    boxes = (boxes - np.tile(pad, 2)) / gain
+    kpts = pred[idx, 5:].reshape(-1, NUM_KPTS, 3)
+    kps = (kpts[:, :, :2] - pad) / gain
+    return PoseDetections(boxes.astype(np.float32), scores[idx], kps.astype(np.float32), kpts[:, :, 2].copy())
+
+
+class _ExportedPoseBackend(PoseBackend):
+    """내보낸 모델 공통: letterbox → 추론(_run) → 디코딩/NMS"""
+
+    def __init__(self, input_size, input_dtype=np.float32, conf=0.25, iou=DEFAULT_IOU_THRES):
+        self.input_size = input_size  # (h, w)
+        self.input_dtype = input_dtype
+        self.conf = conf
+        self.iou = iou
+
+    def _run(self, blob):
+        raise NotImplementedError
+
+    def predict(self, frames, conf=None):
+        conf = self.conf if conf is None else conf
+        out = []
+        # 내보낸 모델은 보통 배치 1로 고정되어 있으므로 한 장씩 처리합니다.
+        for frame in frames:
+            img, gain, pad = letterbox(frame, self.input_size)
+            blob = cv2.dnn.blobFromImage(img, 1.0 / 255.0, swapRB=True).astype(self.input_dtype, copy=False)
+            out.append(decode_pose_output(self._run(blob), conf, self.iou, gain, pad))
+        return out
+
+
+class OnnxPoseBackend(_ExportedPoseBackend):
+    name = "onnxruntime"
+
+    def __init__(self, path, device="cpu", conf=0.25, iou=DEFAULT_IOU_THRES, threads=0):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = int(threads)
+        providers = ["CPUExecutionProvider"]
+        if device == "cuda" and "CUDAExecutionProvider" in ort.get_available_providers():
+            providers.insert(0, "CUDAExecutionProvider")
+        self.session = ort.InferenceSession(path, sess_options=options, providers=providers)
+        inp = self.session.get_inputs()[0]
+        self.input_name = inp.name
+        h, w = inp.shape[2], inp.shape[3]
+        if not isinstance(h, int) or not isinstance(w, int):
+            h = w = 640  # dynamic=True로 내보낸 모델
+        dtype = np.float16 if inp.type == "tensor(float16)" else np.float32
+        super().__init__((h, w), dtype, conf, iou)
+
+    def _run(self, blob):
+        return self.session.run(None, {self.input_name: blob})[0]
+
+
+class OpenVINOPoseBackend(_ExportedPoseBackend):
+    name = "openvino"
+
+    def __init__(self, path, device="cpu", conf=0.25, iou=DEFAULT_IOU_THRES):
+        try:
+            import openvino as ov
+            core = ov.Core()
+        except (ImportError, AttributeError):
+            from openvino.runtime import Core
+            core = Core()
+
+        if os.path.isdir(path):
+            xmls = sorted(f for f in os.listdir(path) if f.endswith(".xml"))
+            if not xmls:
+                raise FileNotFoundError(f"No OpenVINO .xml model in {path}")
+            path = os.path.join(path, xmls[0])
+        model = core.read_model(path)
+        # GPU 플러그인이 있으면 쓰고, 없으면 CPU
+        target = "GPU" if device == "cuda" and "GPU" in core.available_devices else "CPU"
+        self.compiled = core.compile_model(model, target, {"PERFORMANCE_HINT": "LATENCY"})
+        self.output = self.compiled.output(0)
+        shape = self.compiled.input(0).get_partial_shape()
+        h = shape[2].get_length() if shape[2].is_static else 640
+        w = shape[3].get_length() if shape[3].is_static else 640
+        # INT8/FP16 IR도 입력은 FP32로 받고 내부에서 변환합니다.
+        super().__init__((h, w), np.float32, conf, iou)
+
+    def _run(self, blob):
+        return self.compiled(blob)[self.output]
+
+
+def is_exported_model(model_path):
+    """내보낸(ONNX/OpenVINO) 모델 경로인지 확인합니다."""
+    path = str(model_path).rstrip("/\\")
+    return path.endswith(".onnx") or path.endswith(".xml") or path.endswith("_openvino_model")
+
+
+def load_backend(model_path, device="cpu", conf=0.25):
+    """확장자에 따라 내보낸 모델용 백엔드를 만듭니다. .pt는 model_loader.load_model을 쓰세요."""
+    path = str(model_path).rstrip("/\\")
+    if path.endswith(".onnx"):
+        return OnnxPoseBackend(path, device=device, conf=conf)
+    if path.endswith(".xml") or path.endswith("_openvino_model"):
+        return OpenVINOPoseBackend(path, device=device, conf=conf)
+    raise ValueError(f"Unsupported pose model format: {model_path}")
@@ -0,0 +1,149 @@
+import math
+
+import numpy as np
+
+# 키포인트 시간 필터.
+# YOLO 키포인트는 프레임마다 독립적으로 나오므로 떨림이 있고, conf가 낮은 관절은 NaN으로 빠집니다.
+#  - 실시간: 필터 객체를 만들어 프레임마다 filt(kps, t)를 호출합니다. 빠진 관절은 max_gap_s 동안
+#    마지막 값을 유지합니다.
+#  - 오프라인: smooth_track(kps, timestamps)이 짧은 구멍을 선형 보간한 뒤 같은 필터를 한 번 훑습니다.
+# 계산은 관절 축으로 벡터화되어 있어 트랙 전체에 대해 O(프레임 수)입니다.
+#
+# 필터는 reset()과 __call__(kps(J,2), t초) -> kps(J,2)만 있으면 되며, FILTERS에 등록해 이름으로 고릅니다.
+
+DEFAULT_MIN_CUTOFF = 1.0   # Hz. 작을수록 정지 상태에서 더 부드럽습니다.
+DEFAULT_BETA = 0.02        # 속도(px/s)에 따른 cutoff 증가량. 클수록 빠른 동작에서 지연이 줄어듭니다.
+DEFAULT_D_CUTOFF = 1.0     # Hz. 속도 추정용 cutoff
+DEFAULT_MAX_GAP_S = 0.25   # 이 시간보다 짧게 빠진 관절만 보간/유지합니다.
+
+
+def _alpha(cutoff, dt):
+    tau = 1.0 / (2.0 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class NoFilter:
+    """필터를 끈 상태. 입력을 그대로 돌려줍니다."""
+
+    def __init__(self, **params):
+        pass
+
+    def reset(self):
+        pass
+
+    def __call__(self, kps, t):
+        return np.array(kps, np.float32)
+
+
+class OneEuroFilter:
+    """
+    관절별 One-Euro 필터(Casiez et al., 2012). 모든 관절을 한 번에 처리합니다.
+    빠진 관절(NaN)은 max_gap_s 동안 마지막 값을 유지하고, 그보다 오래 빠지면 NaN으로 돌려줍니다.
+    """
+
+    def __init__(self, min_cutoff=DEFAULT_MIN_CUTOFF, beta=DEFAULT_BETA, d_cutoff=DEFAULT_D_CUTOFF,
+                 max_gap_s=DEFAULT_MAX_GAP_S):
+        self.min_cutoff = float(min_cutoff)
+        self.beta = float(beta)
+        self.d_cutoff = float(d_cutoff)
+        self.max_gap_s = float(max_gap_s)
+        self.reset()
+
+    def reset(self):
+        self._x = None
+        self._dx = None
+        self._last_seen = None
+        self._t = None
+
+    def __call__(self, kps, t):
+        kps = np.array(kps, np.float32)
+        valid = np.isfinite(kps).all(axis=-1)
+        if self._x is None:
+            self._x = kps
+            self._dx = np.zeros_like(kps)
+            self._last_seen = np.where(valid, t, -np.inf)
+            self._t = t
+            return self._x.copy()
+
+        dt = t - self._t
+        if dt <= 0:
+            return self._x.copy()
+        self._t = t
+
+        # 이전 값이 없던 관절은 새 값으로 시작하고, 나머지는 필터를 적용합니다.
+        fresh = valid & ~np.isfinite(self._x).all(axis=-1)
+        update = valid & ~fresh
+
+        dx = (kps - self._x) / dt
+        dx_hat = self._dx + _alpha(self.d_cutoff, dt) * (dx - self._dx)
+        cutoff = self.min_cutoff + self.beta * np.linalg.norm(dx_hat, axis=-1)
+        a = 1.0 / (1.0 + (1.0 / (2.0 * np.pi * cutoff)) / dt)
+        x_hat = self._x + a[:, None] * (kps - self._x)
+
+        self._x[update] = x_hat[update]
+        self._dx[update] = dx_hat[update]
+        self._x[fresh] = kps[fresh]
+        self._dx[fresh] = 0.0
+        self._last_seen[valid] = t
+
+        stale = ~valid & (t - self._last_seen > self.max_gap_s)
+        self._x[stale] = np.nan
+        self._dx[stale] = 0.0
+        return self._x.copy()
+
+
+FILTERS = {"none": NoFilter, "one_euro": OneEuroFilter}
+
+
+def make_pose_filter(name="one_euro", **params):
+    """이름으로 필터를 만듭니다. name이 None이면 NoFilter."""
+    if name is None:
+        return NoFilter()
+    if name not in FILTERS:
+        raise ValueError(f"Unknown pose filter: {name} (available: {', '.join(FILTERS)})")
+    return FILTERS[name](**params)
+
+
+def interpolate_gaps(kps, timestamps, max_gap_s=DEFAULT_MAX_GAP_S):
+    """
+    kps: (N,J,2), timestamps: (N,) 초. 양쪽에 값이 있고 길이가 max_gap_s 이하인
+    NaN 구간만 관절별로 선형 보간한 사본을 반환합니다.
+    """
+    out = np.array(kps, np.float32)
+    t = np.asarray(timestamps, np.float64)
+    n = len(t)
+    if n < 3:
+        return out
+    frames = np.arange(n)
+    for j in range(out.shape[1]):
+        valid = np.isfinite(out[:, j]).all(axis=-1)
+        idx = np.flatnonzero(valid)
+        if len(idx) < 2 or len(idx) == n:
+            continue
+        # 각 프레임의 앞/뒤 유효 프레임
+        pos = np.searchsorted(idx, frames, side="right")
+        prev = idx[np.clip(pos - 1, 0, len(idx) - 1)]
+        nxt = idx[np.clip(pos, 0, len(idx) - 1)]
+        fill = ~valid & (prev < frames) & (nxt > frames) & (t[nxt] - t[prev] <= max_gap_s + 1e-9)
+        if not fill.any():
+            continue
+        for c in range(2):
+            out[fill, j, c] = np.interp(t[fill], t[idx], out[idx, j, c])
+    return out
+
+
+def smooth_track(kps, timestamps, pose_filter="one_euro", max_gap_s=DEFAULT_MAX_GAP_S, **params):
+    """
+    트랙 전체를 오프라인으로 스무딩합니다. 짧은 구멍을 보간한 뒤 필터를 앞에서부터 한 번 적용합니다.
+    pose_filter: FILTERS의 이름 또는 필터 객체. 반환: (N,J,2) float32
+    """
+    filt = make_pose_filter(pose_filter, max_gap_s=max_gap_s, **params) \
+        if pose_filter is None or isinstance(pose_filter, str) else pose_filter
+    if isinstance(filt, NoFilter):
+        return np.array(kps, np.float32)
+    filled = interpolate_gaps(kps, timestamps, max_gap_s)
+    filt.reset()
+    out = np.empty_like(filled)
+    for i, t in enumerate(np.asarray(timestamps, np.float64)):
+        out[i] = filt(filled[i], float(t))
+    return out
@@ -0,0 +1,150 @@
+import json
+import os
+
+import numpy as np
+
+from core.array_pack import write_pack, read_pack_header, read_pack_arrays
+
+# .posetrack 파일 구조 (core.array_pack 컨테이너, MAGIC만 다름)
+#   MAGIC(8 bytes) | header_len(uint32 LE) | header(JSON, utf-8) | padding | column data ...
+# 헤더에는 fps/stride/video_size와 각 컬럼의 dtype/shape/offset이 들어 있고,
+# 컬럼은 64바이트 단위로 정렬되어 있어 np.memmap으로 바로 열 수 있습니다.
+POSE_TRACK_EXT = ".posetrack"
+MAGIC = b"POSETRK1"
+NUM_KPTS = 17
+
+
+def save_pose_track(path, frame_index, timestamps, kps, conf, fps=None, stride=None,
+                    video_size=None, kps_dtype="float32", conf_dtype="float16"):
+    """
+    포즈 트랙을 컬럼형 바이너리(.posetrack)로 저장합니다.
+    frame_index: (N,), timestamps: (N,) 초 단위, kps: (N,17,2), conf: (N,17)
+    """
+    columns = {
+        "frame_index": np.ascontiguousarray(frame_index, dtype="<i4"),
+        "timestamp": np.ascontiguousarray(timestamps, dtype="<f8"),
+        "kps": np.ascontiguousarray(kps, dtype=np.dtype(kps_dtype).newbyteorder("<")),
+        "conf": np.ascontiguousarray(conf, dtype=np.dtype(conf_dtype).newbyteorder("<")),
+    }
+    n = len(columns["frame_index"])
+    if columns["kps"].shape != (n, NUM_KPTS, 2) or columns["conf"].shape != (n, NUM_KPTS):
+        raise ValueError(f"Unexpected pose track shapes: kps {columns['kps'].shape}, conf {columns['conf'].shape}")
+
+    header = {
+        "version": 1,
+        "fps": None if fps is None else float(fps),
+        "stride": None if stride is None else int(stride),
+        "video_size": None if video_size is None else [int(video_size[0]), int(video_size[1])],
+        "num_frames": n,
+    }
+    write_pack(path, MAGIC, header, columns, key="columns")
+
+
+def read_pose_track_header(path):
+    return read_pack_header(path, MAGIC)
+
+
+def load_pose_track(path, mmap=True):
+    """
+    .posetrack 파일을 읽습니다. mmap=True이면 컬럼을 읽기 전용 memmap으로 엽니다.
+    반환: dict(fps, stride, video_size, frame_index, timestamp, kps, conf)
+    """
+    header = read_pose_track_header(path)
+    data = {
+        "fps": header.get("fps"),
+        "stride": header.get("stride"),
+        "video_size": header.get("video_size"),
+    }
+    data.update(read_pack_arrays(path, header["columns"], mmap=mmap))
+    return data
+
+
+def pose_data_from_json(data):
+    """create_json_from_video 형식의 JSON dict를 load_pose_track과 같은 형태로 바꿉니다."""
+    frames = data["frames"]
+    fps = data.get("fps")
+    kps = np.array(
+        [[[np.nan if v is None else v for v in xy] for xy in fr["kps"]] for fr in frames],
+        dtype=np.float32
+    ).reshape(-1, NUM_KPTS, 2)
+    conf = np.array(
+        [[np.nan if v is None else v for v in fr.get("conf", [np.nan] * NUM_KPTS)] for fr in frames],
+        dtype=np.float32
+    ).reshape(-1, NUM_KPTS)
+    frame_index = np.array([fr.get("frame_index", i) for i, fr in enumerate(frames)], dtype=np.int32)
+
+    timestamps = []
+    for fr in frames:
+        if fr.get("timestamp") is not None:
+            timestamps.append(float(fr["timestamp"]))
+        elif fps:
+            timestamps.append(float(fr["frame_index"]) / float(fps))
+        else:
+            raise ValueError("Reference frame has no timestamp and the file has no fps.")
+
+    return {
+        "fps": fps,
+        "stride": data.get("stride"),
+        "video_size": data.get("video_size"),
+        "frame_index": frame_index,
+        "timestamp": np.array(timestamps, dtype=np.float64),
+        "kps": kps,
+        "conf": conf,
+    }
+
+
+class ReferenceMetaError(ValueError):
+    """레퍼런스 파일의 fps/stride/video_size 메타데이터가 없거나 프레임 정보와 맞지 않을 때."""
+
+
+def validate_reference_meta(data, path="", require_video_size=False):
+    """
+    load_pose_data 결과의 메타데이터를 검증합니다. 문제가 있으면 ReferenceMetaError.
+    - fps > 0, stride >= 1
+    - video_size = [w, h] (양수): 있으면 검사하고, require_video_size이면 반드시 있어야 함
+      (채점은 쓰지 않고, 좌표를 렌더러 크기로 맞추는 아바타 변환만 필요로 합니다)
+    - frame_index 간격이 stride의 배수
+    - timestamp가 frame_index / fps와 반 프레임 이내로 일치
+    """
+    where = f" in {path}" if path else ""
+    hint = " Run tools/backfill_reference_meta.py to add it."
+
+    fps, stride, video_size = data.get("fps"), data.get("stride"), data.get("video_size")
+    required = (("fps", fps), ("stride", stride)) + ((("video_size", video_size),) if require_video_size else ())
+    missing = [k for k, v in required if v is None]
+    if missing:
+        raise ReferenceMetaError(f"Reference metadata missing{where}: {', '.join(missing)}.{hint}")
+    if not fps > 0:
+        raise ReferenceMetaError(f"Invalid fps{where}: {fps}")
+    if int(stride) != stride or stride < 1:
+        raise ReferenceMetaError(f"Invalid stride{where}: {stride}")
+    if video_size is not None and (len(video_size) != 2 or min(video_size) <= 0):
+        raise ReferenceMetaError(f"Invalid video_size{where}: {video_size}")
+
+    frame_index = np.asarray(data["frame_index"], dtype=np.int64)
+    timestamps = np.asarray(data["timestamp"], dtype=np.float64)
+    if len(frame_index) > 1 and np.any(np.diff(frame_index) % int(stride) != 0):
+        raise ReferenceMetaError(f"frame_index spacing does not match stride {stride}{where}.")
+    if len(frame_index):
+        drift = np.abs(timestamps - frame_index / float(fps))
+        if np.max(drift) > 0.5 / float(fps):
+            raise ReferenceMetaError(
+                f"Timestamps do not match fps {fps}{where} (max drift {np.max(drift) * 1000:.1f} ms)."
+            )
+
+
+def load_pose_data(path, mmap=True):
+    """확장자에 따라 .posetrack 또는 JSON 레퍼런스를 같은 형태의 dict로 읽습니다."""
+    if path.endswith(POSE_TRACK_EXT):
+        return load_pose_track(path, mmap=mmap)
+    with open(path, "r") as f:
+        return pose_data_from_json(json.load(f))
+
+
+def reference_path_for(video_path):
+    """영상에 대응하는 레퍼런스 경로. .posetrack이 있으면 우선, 없으면 .json"""
+    base, _ = os.path.splitext(video_path)
+    track_path = base + POSE_TRACK_EXT
+    if os.path.exists(track_path):
+        return track_path
+    return base + ".json"
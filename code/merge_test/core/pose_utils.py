@@ -84,6 +84,83 @@ def frame_score_strict(vec_ref, vec_live, k=K_STRICT, margin=MARGIN):
     score = 100.0 * math.exp(-k * d_eff)
     return float(np.clip(score, 0.0, 100.0)), pair_cost, ang_deg
 
+# ===================== 배치(B,17,2) 버전 =====================
+# 아래 함수들은 위의 단일 포즈 함수와 같은 결과(NaN 처리 포함)를 배열 연산으로 계산합니다.
+
+_TRIPLE_IDX = np.array(ANGLE_TRIPLES, dtype=np.intp)
+
+def _spread_scale_batch(pts, finite_rows):
+    """유효한 키포인트들의 중심으로부터 최대 거리(유효점이 없으면 1.0)."""
+    cnt = finite_rows.sum(axis=1)
+    safe = np.where(finite_rows[..., None], pts, 0.0)
+    mean = safe.sum(axis=1) / np.maximum(cnt, 1)[:, None]
+    dist = norm(safe - mean[:, None, :], axis=2)
+    dist = np.where(finite_rows, dist, -np.inf)
+    return np.where(cnt > 0, dist.max(axis=1), 1.0)
+
+def normalize_keypoints_batch(pts):
+    """normalize_keypoints의 배치 버전. pts: (B,17,2) -> (B,17,2)"""
+    pts = np.asarray(pts, dtype=np.float64)
+    sh = pts[:, [L_SH, R_SH]]
+    hp = pts[:, [L_HP, R_HP]]
+
+    # 골반이 모두 보이면 골반 중심, 아니면 어깨 좌표별 nanmean
+    hip_ok = np.isfinite(hp).all(axis=(1, 2))
+    sh_fin = np.isfinite(sh)
+    sh_cnt = sh_fin.sum(axis=1)
+    sh_sum = np.where(sh_fin, sh, 0.0).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sh_center = np.where(sh_cnt > 0, sh_sum / sh_cnt, np.nan)
+    center = np.where(hip_ok[:, None], hp.mean(axis=1), sh_center)
+    out = pts - center[:, None, :]
+
+    # 어깨 너비를 기준 스케일로, 어깨가 없거나 너비가 0이면 전체 퍼짐 정도로 대체
+    finite_rows = np.isfinite(pts).all(axis=2)
+    sh_ok = sh_fin.all(axis=(1, 2))
+    sh_width = norm(sh[:, 0] - sh[:, 1], axis=1)
+    use_width = sh_ok & np.isfinite(sh_width) & (sh_width >= 1e-6)
+    scale = np.where(use_width, sh_width, _spread_scale_batch(pts, finite_rows))
+    return out / (scale[:, None, None] + 1e-6)
+
+def pose_to_anglevec_batch(pts):
+    """pose_to_anglevec의 배치 버전. pts: (B,17,2) -> (B,6) float32"""
+    pts = np.asarray(pts, dtype=np.float64)
+    a = pts[:, _TRIPLE_IDX[:, 0]]
+    b = pts[:, _TRIPLE_IDX[:, 1]]
+    c = pts[:, _TRIPLE_IDX[:, 2]]
+    v1 = a - b; v2 = c - b
+
+    with np.errstate(invalid="ignore"):
+        dot = np.einsum("btk,btk->bt", v1, v2)
+        cross = v1[..., 0] * v2[..., 1] - v1[..., 1] * v2[..., 0]
+        n1 = norm(v1, axis=2); n2 = norm(v2, axis=2)
+        angs = np.arctan2(np.abs(cross), dot)
+        valid = np.isfinite(angs) & (n1 >= 1e-6) & (n2 >= 1e-6)
+    angs = np.where(valid, angs, np.nan).astype(np.float32)
+
+    # 계산되지 않은 각도는 같은 포즈의 유효 각도 평균(없으면 0)으로 채움
+    cnt = valid.sum(axis=1)
+    fill = np.where(cnt > 0, np.where(valid, angs, 0.0).sum(axis=1) / np.maximum(cnt, 1), 0.0)
+    return np.where(valid, angs, fill[:, None].astype(np.float32))
+
+def frame_score_strict_batch(vec_ref, vec_live, k=K_STRICT, margin=MARGIN):
+    """
+    frame_score_strict의 배치 버전. vec_ref/vec_live: (B,6) 또는 (6,)(브로드캐스트)
+    둘 다 (6,)이면 B=1로 봅니다.
+    반환: (score(B,), pair_cost(B,), ang_deg(B,))
+    """
+    vec_ref, vec_live = np.broadcast_arrays(
+        np.atleast_2d(np.asarray(vec_ref, dtype=np.float64)),
+        np.atleast_2d(np.asarray(vec_live, dtype=np.float64))
+    )
+    a = np.nan_to_num(vec_ref); b = np.nan_to_num(vec_live)
+    d_cos = 1.0 - np.einsum("bk,bk->b", a, b) / (norm(a, axis=-1) * norm(b, axis=-1) + 1e-6)
+    ang_deg = np.degrees(np.mean(np.abs(vec_ref - vec_live), axis=-1))
+    pair_cost = 0.5*d_cos + 0.5*(ang_deg/180.0)
+    d_eff = np.maximum(0.0, pair_cost - margin)
+    score = np.clip(100.0 * np.exp(-k * d_eff), 0.0, 100.0)
+    return score, pair_cost, ang_deg
+
 def draw_pose(img, kps_xy, kps_conf=None, conf_thres=KPT_CONF_THRES):
     H, W = img.shape[:2]
     kpt_radius = max(2, int(min(H, W) * 0.004))
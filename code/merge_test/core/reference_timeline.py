@@ -0,0 +1,97 @@
+import numpy as np
+
+from core.pose_utils import normalize_keypoints_batch, pose_to_anglevec_batch
+from core.pose_track import load_pose_data, validate_reference_meta
+
+
+class ReferenceTimeline:
+    """
+    레퍼런스(JSON/.posetrack)의 키프레임을 타임스탬프 기준으로 정렬해 둔 인덱스.
+    재생 위치(ms)로 이분 탐색하여 앞뒤 키프레임 사이를 선형 보간한 포즈를 돌려줍니다.
+    영상 FPS나 추출 간격(--step)과 무관하게 동작합니다.
+    """
+
+    def __init__(self, timestamps, kps, fps=None, stride=None, video_size=None):
+        if len(timestamps) == 0:
+            raise ValueError("Reference has no frames.")
+        self.fps = fps
+        self.stride = stride
+        self.video_size = video_size
+
+        kps = np.asarray(kps, dtype=np.float64)
+        order = np.argsort(np.asarray(timestamps), kind="stable")
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)[order]
+        self.kps = np.ascontiguousarray(kps[order])
+
+        # 레퍼런스는 게임 중에 바뀌지 않으므로 정규화 키포인트(N,17,2)와
+        # 각도 벡터(N,6)를 로드 시점에 한 번만 계산해 둡니다.
+        self.norm_kps = np.ascontiguousarray(normalize_keypoints_batch(self.kps))
+        self.anglevecs = np.ascontiguousarray(pose_to_anglevec_batch(self.norm_kps))
+
+        # 마지막 키프레임 이후에도 한 간격만큼은 유효한 구간으로 봅니다.
+        gaps = np.diff(self.timestamps)
+        gaps = gaps[gaps > 0]
+        self.key_interval = float(np.median(gaps)) if len(gaps) else 0.0
+        self.end_time = self.timestamps[-1] + self.key_interval
+
+    @classmethod
+    def load(cls, path, validate=True):
+        """
+        JSON 또는 .posetrack 레퍼런스 파일에서 타임라인을 만듭니다.
+        validate=True이면 fps/stride(video_size는 있으면) 메타데이터를 검증하고, 문제가 있으면
+        ReferenceMetaError를 발생시킵니다(잘못된 기본값으로 조용히 진행하지 않음).
+        """
+        data = load_pose_data(path)
+        if validate:
+            validate_reference_meta(data, path)
+        return cls(data["timestamp"], data["kps"],
+                   fps=data["fps"], stride=data["stride"], video_size=data["video_size"])
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def _locate(self, position_ms):
+        """
+        재생 위치에 해당하는 (앞 키프레임, 뒤 키프레임, 보간 가중치)를 반환합니다.
+        레퍼런스가 끝난 위치이면 None을 반환합니다.
+        """
+        t = max(0.0, position_ms / 1000.0)
+        if t > self.end_time:
+            return None
+        hi = int(np.searchsorted(self.timestamps, t, side="right"))
+        if hi <= 0:
+            return 0, 0, 0.0
+        if hi >= len(self.timestamps):
+            last = len(self.timestamps) - 1
+            return last, last, 0.0
+        lo = hi - 1
+        span = self.timestamps[hi] - self.timestamps[lo]
+        w = (t - self.timestamps[lo]) / span if span > 0 else 0.0
+        return lo, hi, float(w)
+
+    @staticmethod
+    def _lerp(a, b, w):
+        """NaN을 고려한 선형 보간: 한쪽이 NaN이면 가까운 쪽(없으면 다른 쪽) 값을 사용합니다."""
+        out = a + (b - a) * w
+        near, far = (a, b) if w < 0.5 else (b, a)
+        return np.where(np.isfinite(out), out, np.where(np.isfinite(near), near, far))
+
+    def kps_at(self, position_ms):
+        """재생 위치(ms)에서의 레퍼런스 키포인트 (17,2). 범위를 벗어나면 None."""
+        loc = self._locate(position_ms)
+        if loc is None:
+            return None
+        lo, hi, w = loc
+        if lo == hi:
+            return self.kps[lo].copy()
+        return self._lerp(self.kps[lo], self.kps[hi], w)
+
+    def anglevec_at(self, position_ms):
+        """재생 위치(ms)에서의 레퍼런스 각도 벡터 (6,). 미리 계산된 값을 보간만 합니다."""
+        loc = self._locate(position_ms)
+        if loc is None:
+            return None
+        lo, hi, w = loc
+        if lo == hi:
+            return self.anglevecs[lo]
+        return self.anglevecs[lo] + (self.anglevecs[hi] - self.anglevecs[lo]) * np.float32(w)
@@ -0,0 +1,115 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from core.model_loader import as_backend, make_infer, _largest_person
+
+# 싱글 플레이어용 ROI(관심 영역) 추론.
+# 직전 프레임에서 찾은 사람 박스 주변만 잘라 작은 imgsz로 추론하고, 키포인트는 원본 프레임 좌표로 되돌립니다.
+# 사람을 놓치거나 박스가 잘린 영역 가장자리에 닿으면, 그리고 full_every 프레임마다 한 번은
+# 전체 프레임을 args.imgsz로 다시 검출해 영역을 새로 잡습니다.
+# 화면 대비 사람이 작은 영역만 보므로 같은 연산으로 사람당 픽셀이 늘고, 입력이 작아 추론도 가볍습니다.
+# (입력 크기가 고정된 내보낸 모델은 연산량은 같고 해상도 이득만 있습니다.)
+
+DEFAULT_ROI_IMGSZ = 320
+DEFAULT_MARGIN = 0.3        # 박스 폭/높이 대비 사방으로 더 자를 비율
+DEFAULT_FULL_EVERY = 30     # 이 프레임 수마다 전체 프레임 검출
+MIN_ROI_FRACTION = 0.35     # 잘라낼 영역의 최소 크기(프레임 높이 대비)
+EDGE_PX = 4                 # 박스가 잘린 영역 가장자리에서 이만큼 안쪽이면 '잘렸다'고 봅니다.
+
+
+def _largest_box(det):
+    """PoseDetections에서 가장 큰 사람의 박스(xyxy). 없으면 None."""
+    if len(det.boxes) == 0:
+        return None
+    areas = (det.boxes[:, 2] - det.boxes[:, 0]) * (det.boxes[:, 3] - det.boxes[:, 1])
+    return det.boxes[int(np.argmax(areas))].astype(np.float32)
+
+
+def expand_box(box, frame_shape, margin=DEFAULT_MARGIN, min_fraction=MIN_ROI_FRACTION):
+    """박스를 margin만큼 넓히고 최소 크기를 맞춘 뒤 프레임 안으로 자른 정수 (x0, y0, x1, y1)."""
+    h, w = frame_shape[:2]
+    x0, y0, x1, y1 = box
+    bw, bh = x1 - x0, y1 - y0
+    min_side = min_fraction * h
+    half_w = max(bw * (0.5 + margin), min_side / 2)
+    half_h = max(bh * (0.5 + margin), min_side / 2)
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    return (max(0, int(cx - half_w)), max(0, int(cy - half_h)),
+            min(w, int(np.ceil(cx + half_w))), min(h, int(np.ceil(cy + half_h))))
+
+
+class ROIPoseInfer:
+    """
+    make_infer와 같은 형식의 추론 함수(frame -> (kps, conf))이며, 직전 박스를 기억합니다.
+    추론 스레드 하나에서만 호출한다고 가정합니다.
+    """
+
+    def __init__(self, model, args, use_half, roi_imgsz=DEFAULT_ROI_IMGSZ,
+                 margin=DEFAULT_MARGIN, full_every=DEFAULT_FULL_EVERY):
+        self.conf_thres = args.conf_thres
+        self.full_backend = as_backend(model, args, use_half)
+        roi_args = SimpleNamespace(imgsz=roi_imgsz, device=args.device, conf_thres=args.conf_thres)
+        self.roi_backend = as_backend(model, roi_args, use_half)
+        self.margin = margin
+        self.full_every = max(1, int(full_every))
+
+        self.box = None
+        self._since_full = 0
+        self.full_count = 0
+        self.roi_count = 0
+
+    def reset(self):
+        self.box = None
+        self._since_full = 0
+
+    def _detect_full(self, frame):
+        det = self.full_backend.predict([frame], conf=self.conf_thres)[0]
+        self.full_count += 1
+        self._since_full = 0
+        self.box = _largest_box(det)
+        return _largest_person(det)
+
+    def __call__(self, frame):
+        if self.box is None or self._since_full >= self.full_every:
+            return self._detect_full(frame)
+
+        x0, y0, x1, y1 = expand_box(self.box, frame.shape, self.margin)
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            return self._detect_full(frame)
+        crop = np.ascontiguousarray(frame[y0:y1, x0:x1])
+        det = self.roi_backend.predict([crop], conf=self.conf_thres)[0]
+        self.roi_count += 1
+        self._since_full += 1
+
+        box = _largest_box(det)
+        if box is None:
+            # 놓쳤으면 같은 프레임을 전체로 다시 봅니다.
+            return self._detect_full(frame)
+
+        kps, conf = _largest_person(det)
+        offset = np.array([x0, y0], np.float32)
+        kps = kps + offset
+        self.box = box + np.tile(offset, 2)
+
+        h, w = frame.shape[:2]
+        bx0, by0, bx1, by1 = box
+        cut = ((bx0 <= EDGE_PX and x0 > 0) or (by0 <= EDGE_PX and y0 > 0)
+               or (bx1 >= crop.shape[1] - EDGE_PX and x1 < w) or (by1 >= crop.shape[0] - EDGE_PX and y1 < h))
+        if cut:
+            # 사람이 잘린 영역 밖으로 나가는 중이면 다음 프레임은 전체 검출로 영역을 다시 잡습니다.
+            self._since_full = self.full_every
+        return kps, conf
+
+    def stats(self):
+        total = self.full_count + self.roi_count
+        return {"full": self.full_count, "roi": self.roi_count,
+                "roi_ratio": self.roi_count / total if total else 0.0}
+
+
+def make_roi_infer(model, args, use_half, roi_imgsz=DEFAULT_ROI_IMGSZ,
+                   margin=DEFAULT_MARGIN, full_every=DEFAULT_FULL_EVERY):
+    """ROI 추론 함수를 만듭니다. roi_imgsz가 0이면 기존 make_infer처럼 항상 전체 프레임을 봅니다."""
+    if not roi_imgsz:
+        return make_infer(model, args, use_half)
+    return ROIPoseInfer(model, args, use_half, roi_imgsz, margin, full_every)
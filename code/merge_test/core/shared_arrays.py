@@ -0,0 +1,69 @@
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+# 여러 NumPy 배열을 하나의 공유 메모리 블록에 담아 프로세스 사이에서 복사 없이 나눠 씁니다.
+# 만든 쪽(publish_arrays)이 블록을 소유하고 close/unlink까지 책임지며,
+# 다른 프로세스는 spec(작은 dict)만 받아 attach_arrays로 읽기 전용 뷰를 얻습니다.
+ALIGN = 64
+
+
+def _align(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def publish_arrays(arrays):
+    """
+    arrays: {이름: ndarray}
+    반환: (SharedMemory, spec). spec = {"shm": 블록 이름, "arrays": {이름: (dtype, shape, offset)}}
+    """
+    layout = {}
+    offset = 0
+    for name, arr in arrays.items():
+        arr = np.asarray(arr)
+        layout[name] = (arr.dtype.str, arr.shape, offset)
+        offset = _align(offset + arr.nbytes)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, offset))
+    for name, arr in arrays.items():
+        dtype, shape, off = layout[name]
+        np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=off)[...] = arr
+    return shm, {"shm": shm.name, "arrays": layout}
+
+
+def attach_arrays(spec):
+    """
+    spec의 블록에 붙어 {이름: 읽기 전용 ndarray 뷰}를 반환합니다.
+    반환된 SharedMemory는 뷰를 쓰는 동안 참조를 유지해야 합니다.
+    """
+    try:
+        shm = shared_memory.SharedMemory(name=spec["shm"], track=False)
+    except TypeError:
+        # Python 3.13 미만은 붙기만 해도 resource tracker에 등록되어, 이 프로세스가 끝날 때
+        # 블록이 지워지거나 소유자의 등록이 꼬입니다. 붙는 동안만 등록을 막습니다(소유자만 unlink).
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            shm = shared_memory.SharedMemory(name=spec["shm"])
+        finally:
+            resource_tracker.register = register
+
+    views = {}
+    for name, (dtype, shape, off) in spec["arrays"].items():
+        view = np.ndarray(tuple(shape), dtype=dtype, buffer=shm.buf, offset=off)
+        view.flags.writeable = False
+        views[name] = view
+    return shm, views
+
+
+def release(shm, unlink=False):
+    try:
+        shm.close()
+    except BufferError:
+        # 아직 살아 있는 뷰가 있으면 닫을 수 없습니다. 프로세스 종료 시 정리됩니다.
+        pass
+    if unlink:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
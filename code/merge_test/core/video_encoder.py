@@ -0,0 +1,125 @@
+import os
+import shutil
+import subprocess
+import tempfile
+
+import cv2
+
+# libx264 preset. 실시간 녹화는 CPU를 추론과 나눠 써야 하므로 더 빠른 preset을 씁니다.
+DEFAULT_PRESET = "veryfast"
+REALTIME_PRESET = "ultrafast"
+DEFAULT_CRF = 23
+
+
+class OpenCVEncoder:
+    """
+    BGR 프레임을 순서대로 받아 cv2.VideoWriter로 저장하는 프레임 싱크.
+    open(fps, (w, h)) → write(frame) 반복 → close()
+    """
+
+    def __init__(self, path, fourcc="mp4v"):
+        self.path = path
+        self.fourcc = fourcc
+        self.writer = None
+        self.frame_count = 0
+
+    def open(self, fps, size):
+        out_dir = os.path.dirname(self.path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+        self.writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*self.fourcc), fps, tuple(size))
+        if not self.writer.isOpened():
+            self.writer = None
+            raise IOError(f"Could not open video writer: {self.path}")
+        self.frame_count = 0
+
+    def write(self, frame):
+        self.writer.write(frame)
+        self.frame_count += 1
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.release()
+            self.writer = None
+
+
+class FfmpegEncoder:
+    """
+    BGR 프레임을 ffmpeg 프로세스의 stdin으로 흘려보내 H.264로 저장하는 프레임 싱크.
+    audio_source가 있으면 그 파일의 오디오를 같은 패스에서 AAC로 mux합니다
+    (별도의 오디오 병합 패스와 중간 파일이 필요 없음).
+    """
+
+    def __init__(self, path, audio_source=None, preset=DEFAULT_PRESET, crf=DEFAULT_CRF):
+        self.path = path
+        self.audio_source = audio_source
+        self.preset = preset
+        self.crf = crf
+        self.proc = None
+        self._log = None
+        self.frame_count = 0
+
+    def _command(self, fps, size):
+        w, h = size
+        cmd = [
+            'ffmpeg', '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', f'{w}x{h}', '-r', f'{fps:.6f}', '-i', '-',
+        ]
+        if self.audio_source:
+            cmd += ['-i', self.audio_source]
+        cmd += ['-map', '0:v:0']
+        if self.audio_source:
+            # 오디오가 없는 영상이어도 실패하지 않도록 선택적 매핑('?')을 씁니다.
+            cmd += ['-map', '1:a:0?', '-c:a', 'aac', '-shortest']
+        cmd += [
+            '-c:v', 'libx264', '-preset', self.preset, '-crf', str(self.crf),
+            # yuv420p는 짝수 크기가 필요합니다.
+            '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p',
+            '-movflags', '+faststart',
+            self.path
+        ]
+        return cmd
+
+    def open(self, fps, size):
+        out_dir = os.path.dirname(self.path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+        # stderr는 파이프 대신 임시 파일로 받아 버퍼가 차서 막히는 일이 없게 합니다.
+        self._log = tempfile.TemporaryFile()
+        self.proc = subprocess.Popen(
+            self._command(fps, size), stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self._log
+        )
+        self.frame_count = 0
+
+    def write(self, frame):
+        try:
+            self.proc.stdin.write(memoryview(frame if frame.flags.c_contiguous else frame.copy()))
+        except BrokenPipeError:
+            raise IOError(f"ffmpeg exited while writing {self.path}: {self._read_log()}")
+        self.frame_count += 1
+
+    def close(self):
+        if self.proc is None:
+            return
+        proc, self.proc = self.proc, None
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        ret = proc.wait()
+        log = self._read_log()
+        self._log.close()
+        if ret != 0:
+            raise IOError(f"ffmpeg failed ({ret}) for {self.path}: {log}")
+
+    def _read_log(self):
+        self._log.seek(0)
+        return self._log.read().decode('utf-8', 'replace').strip()
+
+
+def open_encoder(path, audio_source=None, preset=DEFAULT_PRESET, crf=DEFAULT_CRF):
+    """ffmpeg가 있으면 FfmpegEncoder, 없으면 OpenCVEncoder(mp4v, 오디오 없음)를 반환합니다."""
+    if shutil.which('ffmpeg'):
+        return FfmpegEncoder(path, audio_source=audio_source, preset=preset, crf=crf)
+    print("[warning] 'ffmpeg' not found. Falling back to OpenCV mp4v without audio.")
+    return OpenCVEncoder(path)
@@ -25,15 +25,18 @@ import collections
 from .base_pose_app import BasePoseApp
 # 포즈 감지 및 유틸리티 모듈을 임포트합니다.
 from core.pose_utils import (
-    normalize_keypoints, pose_to_anglevec, frame_score_strict, draw_pose
+    normalize_keypoints_batch, pose_to_anglevec_batch, frame_score_strict_batch, draw_pose,
+    KPT_CONF_THRES
 )
 
 from core.person_utils import get_midpoint_between_people, classify_region
+from core.reference_timeline import ReferenceTimeline
+from core.pose_track import ReferenceMetaError
+from core.pose_backend import PoseBackend
 
 # YOLO 모델 설정
 MODEL_PATH_DEFAULT = "yolov8m-pose.pt"
 DETECT_CONF_THRES = 0.25
-KPT_CONF_THRES = 0.20
 
 # 키포인트 쌍 (왼쪽 <-> 오른쪽)
 FLIP_MAP = [
@@ -60,10 +63,11 @@ class MultiPlayerApp(BasePoseApp):
         self.button_container = None
         self.tracker_yaml = "botsort.yaml"
         self.active_players = {} # 플레이어 ID (1 또는 2) -> 정보
+        self.active_players_ts = None # active_players를 만든 추론 결과의 타임스탬프
+        self.scored_ts = None # 마지막으로 점수 계산에 사용한 추론 결과의 타임스탬프
         self.previous_kps = {} # 각 플레이어의 이전 키포인트 저장
 
         # 영상 녹화 관련 변수
-        self.video_writer = None
         resource_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'resource')
         if not os.path.exists(resource_dir):
             os.makedirs(resource_dir)
@@ -75,13 +79,16 @@ class MultiPlayerApp(BasePoseApp):
             return
         
         try:
-            with open(self.args.json, 'r') as f:
-                self.reference_data = json.load(f)["frames"]
-                print(f"{len(self.reference_data)}개의 참조 프레임을 성공적으로 로드했습니다.")
+            self.reference = ReferenceTimeline.load(self.args.json)
+            print(f"{len(self.reference)}개의 참조 프레임을 성공적으로 로드했습니다.")
         except FileNotFoundError:
             QMessageBox.critical(self, "오류", f"오류: 참조 JSON 파일 '{self.args.json}'을 찾을 수 없습니다.")
             self.close()
             return
+        except ReferenceMetaError as e:
+            QMessageBox.critical(self, "오류", f"오류: 참조 파일의 메타데이터가 올바르지 않습니다.\n{e}")
+            self.close()
+            return
         
         # 실시간 피드백 관련 UI 요소 삭제
         self.player_info_label = QLabel(self)
@@ -103,6 +110,8 @@ class MultiPlayerApp(BasePoseApp):
         self.score_timer.timeout.connect(self.calculate_score)
         
         self.init_webcam()
+        # 프레임당 한 번만 추적(model.track)하고, 그 결과를 그리기/시리얼/점수 계산이 함께 사용합니다.
+        self.start_capture_pipeline(self.track_players, inference_enabled=True)
         if self.args.ref is not None:
             self.show_preview_frame(self.args.ref)
     
@@ -149,7 +158,19 @@ class MultiPlayerApp(BasePoseApp):
         """
         멀티 플레이어 추적을 위한 함수입니다.
         반환: dict {track_id: (kps_xy(17,2), kps_conf(17,), box_xyxy(4,))}
+        트래커를 쓸 수 없는 백엔드(내보낸 모델 등)는 검출 순서를 id로 씁니다.
+        플레이어 번호는 on_pose_result에서 x좌표 순으로 다시 매기므로 결과는 같습니다.
         """
+        if isinstance(model, PoseBackend) and not model.can_track:
+            det = model.predict([frame], conf=DETECT_CONF_THRES)[0]
+            out = {}
+            for i in range(len(det.boxes)):
+                kps = det.kps[i].copy()
+                conf = det.kps_conf[i]
+                kps[conf < KPT_CONF_THRES] = np.nan
+                out[i] = (kps, conf, det.boxes[i].astype(float))
+            return out
+
         with torch.inference_mode():
             results = model.track(frame, imgsz=imgsz, device=device, half=half,
                                   conf=DETECT_CONF_THRES, verbose=False,
@@ -184,65 +205,70 @@ class MultiPlayerApp(BasePoseApp):
                 
         return out
 
-    def update_frame(self, force_refresh=False):
-        """웹캠 프레임을 업데이트하고 포즈 감지 결과를 화면에 표시합니다."""
+    @staticmethod
+    def _largest_player(tracked_players):
+        """녹화용 포즈 트랙에는 박스가 가장 큰 플레이어 한 명의 (kps, conf)를 남깁니다."""
+        if not tracked_players:
+            return None, None
+        kps, conf, _ = max(
+            tracked_players.values(), key=lambda p: (p[2][2] - p[2][0]) * (p[2][3] - p[2][1])
+        )
+        return kps, conf
+
+    def track_players(self, frame):
+        """파이프라인 추론 스레드에서 호출되는 추적 함수."""
+        return self.infer_and_track_once(
+            self.model, frame, self.tracker_yaml,
+            self.args.imgsz, self.args.device, self.use_half
+        )
+
+    def on_pose_result(self, frame, tracked_players, timestamp):
+        """프레임당 한 번 계산된 추적 결과를 active_players로 반영하고 시리얼 영역을 갱신합니다."""
         if self.game_over_flag:
             return
 
-        if self.cap and self.cap.isOpened():
-            ret, frame = self.cap.read()
-            if not ret or frame is None:
-                return
-            
-            flipped_frame = cv2.flip(frame, 1)
-
-            # 프레임 저장 (녹화용)
-            if self.video_writer:
-                self.video_writer.write(flipped_frame)
-
-            # YOLO + 추적
-            tracked_players = self.infer_and_track_once(
-                self.model, flipped_frame, self.tracker_yaml,
-                self.args.imgsz, self.args.device, self.use_half
-            )
-            display_frame = flipped_frame.copy()
-
-            # x 좌표 기준 정렬
-            all_detected = list(tracked_players.values())
-            all_detected.sort(key=lambda p: p[2][0])  # box.x1 기준
-            
-            new_active_players = {}
-            kps_list = []
-
-            # 최대 2명의 플레이어를 active_players에 저장
-            for i, (kps, _, box) in enumerate(all_detected[:2]):
-                player_id = i + 1
-                new_active_players[player_id] = {'tid': player_id, 'kps': kps, 'box': box}
-                if kps is not None:
-                    kps_list.append(kps)
-
-            self.active_players = new_active_players
-
-            # --- 두 사람 중심의 중간점 계산 후 영역 분류 ---
-            midpoint = get_midpoint_between_people(kps_list)
-            if midpoint is not None:
-                mx, my = midpoint
-                region = classify_region(mx, display_frame.shape[1])
-                self.ser.write(region.encode())
-
-            # 포즈 그리기
-            self.draw_all_poses(display_frame)
+        # x 좌표 기준 정렬
+        all_detected = list(tracked_players.values())
+        all_detected.sort(key=lambda p: p[2][0])  # box.x1 기준
+
+        new_active_players = {}
+        kps_list = []
+
+        # 최대 2명의 플레이어를 active_players에 저장
+        for i, (kps, _, box) in enumerate(all_detected[:2]):
+            player_id = i + 1
+            new_active_players[player_id] = {'tid': player_id, 'kps': kps, 'box': box}
+            if kps is not None:
+                kps_list.append(kps)
+
+        self.active_players = new_active_players
+        self.active_players_ts = timestamp
+
+        # --- 두 사람 중심의 중간점 계산 후 영역 분류 ---
+        midpoint = get_midpoint_between_people(kps_list)
+        if midpoint is not None:
+            mx, my = midpoint
+            region = classify_region(mx, frame.shape[1])
+            self.ser.write(region.encode())
+
+    def on_camera_frame(self, frame, timestamp):
+        """웹캠 프레임에 최신 추적 결과를 그려 화면에 표시합니다."""
+        if self.game_over_flag:
+            return
 
-            # Qt 화면 표시
-            frame_rgb = cv2.cvtColor(display_frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = frame_rgb.shape
-            qt_image = QImage(frame_rgb.data, w, h, ch * w, QImage.Format_RGB888)
-            pixmap = QPixmap.fromImage(qt_image)
-            self.cam_label.setPixmap(
-                pixmap.scaled(self.cam_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            )
+        display_frame = frame.copy()
 
+        # 포즈 그리기
+        self.draw_all_poses(display_frame)
 
+        # Qt 화면 표시
+        frame_rgb = cv2.cvtColor(display_frame, cv2.COLOR_BGR2RGB)
+        h, w, ch = frame_rgb.shape
+        qt_image = QImage(frame_rgb.data, w, h, ch * w, QImage.Format_RGB888)
+        pixmap = QPixmap.fromImage(qt_image)
+        self.cam_label.setPixmap(
+            pixmap.scaled(self.cam_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        )
 
     def draw_all_poses(self, frame):
         """
@@ -275,79 +301,69 @@ class MultiPlayerApp(BasePoseApp):
 
 
     def calculate_score(self):
-        """웹캠 프레임과 참고 포즈를 비교하여 모든 플레이어의 점수를 계산합니다."""
-        if not self.cap or not self.cap.isOpened() or self.count > 0 or self.game_over_flag:
+        """최신 추적 결과(active_players)와 참고 포즈를 비교하여 모든 플레이어의 점수를 계산합니다."""
+        if self.count > 0 or self.game_over_flag:
             return
 
-        ret, frame = self.cap.read()
-        if not ret or frame is None:
+        # 같은 추적 결과로 두 번 점수를 매기지 않습니다(정지 페널티가 잘못 적용되는 것을 방지).
+        if self.active_players_ts is None or self.active_players_ts == self.scored_ts:
             return
+        self.scored_ts = self.active_players_ts
 
-        # 카메라 프레임을 좌우 반전합니다. 이 프레임으로 포즈를 감지하고 점수를 계산합니다.
-        flipped_frame = cv2.flip(frame, 1)
-      
-        
+        if len(self.reference) == 0:
+            return
+        delayed_position = self.player.position() - self.follow_delay_ms
+        if delayed_position < 0: delayed_position = 0
+        # 레퍼런스 각도 벡터는 로드 시점에 미리 계산되어 있습니다.
+        vec_ref = self.reference.anglevec_at(delayed_position)
+        if vec_ref is None:
+            return
 
-        tracked_players = self.infer_and_track_once(self.model, flipped_frame, self.tracker_yaml, self.args.imgsz, self.args.device, self.use_half)
-        
-        # 플레이어를 x축 기준으로 정렬하여 Player 1과 Player 2를 결정하고 점수를 계산합니다.
-        all_detected = list(tracked_players.values())
-        all_detected.sort(key=lambda p: p[2][0]) # box의 x1 좌표(p[2][0])를 기준으로 정렬
-
-        # 최대 2명의 플레이어에 대해 점수를 계산합니다.
-        for i, (cam_kps, cam_conf, _) in enumerate(all_detected[:2]):
-            player_id = i + 1 # Player 1 또는 Player 2
-
-            if cam_kps is not None and cam_kps.size > 0 and len(self.reference_data) > 0:
-                delayed_position = self.player.position() - self.follow_delay_ms
-                if delayed_position < 0: delayed_position = 0
-                ref_frame_index = int(delayed_position / 1000 * 30)
-                ref_data_index = ref_frame_index // 10
-
-                if ref_data_index < len(self.reference_data):
-                    ref_data = self.reference_data[ref_data_index]
-                    ref_kps = np.array(ref_data["kps"])
-
-                    cam_kps_norm = normalize_keypoints(cam_kps)
-                    ref_kps_norm = normalize_keypoints(ref_kps)
-
-                    vec_ref = pose_to_anglevec(ref_kps_norm)
-                    vec_live = pose_to_anglevec(cam_kps_norm)
-                    
-                    # --- 점수 가중치 적용 로직 시작 ---
-                    num_angles = len(vec_ref)
-                    weights = np.ones(num_angles)
-                    weights[0:4] = 2.0
-                    vec_ref_weighted = vec_ref * weights
-                    vec_live_weighted = vec_live * weights
-                    current_score, _, _ = frame_score_strict(vec_ref_weighted, vec_live_weighted)
-                    # --- 점수 가중치 적용 로직 끝 ---
-                    
-                    # --- 정지 페널티 로직 추가 시작 ---
-                    if player_id in self.previous_kps and self.previous_kps[player_id] is not None:
-                        kps_diff = np.linalg.norm(cam_kps - self.previous_kps[player_id])
-                        movement_threshold = 20.0
-                        if kps_diff < movement_threshold:
-                            current_score -= 5
-                            if current_score < 0:
-                                current_score = 0
-                    
-                    self.previous_kps[player_id] = cam_kps.copy()
-                    # --- 정지 페널티 로직 추가 끝 ---
-                    
-                    if current_score != -1.0:
-                        self.score_history[player_id].append(current_score)
-                    
-                    if len(self.score_history[player_id]) >= self.score_history_length:
-                        smoothed_score = np.mean(self.score_history[player_id])
-                        
-                        current_total_score = self.local_scores[player_id]
-                        if smoothed_score >= 70.0:
-                            self.local_scores[player_id] = min(100, current_total_score + 1)
-                        elif smoothed_score < 30.0:
-                            self.local_scores[player_id] = max(0, current_total_score - 1)
-                        
-                        self.score_history[player_id] = []
+        # active_players는 이미 x축 기준으로 정렬된 Player 1, Player 2 입니다.
+        players = [(pid, data['kps']) for pid, data in self.active_players.items()
+                   if data['kps'] is not None and data['kps'].size > 0]
+        if not players:
+            return
+
+        # 모든 플레이어의 정규화/각도 벡터/점수를 한 번의 배치 연산으로 계산합니다.
+        cam_kps_batch = np.stack([kps for _, kps in players])
+        vec_live = pose_to_anglevec_batch(normalize_keypoints_batch(cam_kps_batch))
+
+        # --- 점수 가중치 적용 로직 시작 ---
+        num_angles = len(vec_ref)
+        weights = np.ones(num_angles)
+        weights[0:4] = 2.0
+        scores, _, _ = frame_score_strict_batch(vec_ref * weights, vec_live * weights)
+        # --- 점수 가중치 적용 로직 끝 ---
+
+        for (player_id, cam_kps), current_score in zip(players, scores):
+            current_score = float(current_score)
+
+            # --- 정지 페널티 로직 추가 시작 ---
+            if player_id in self.previous_kps and self.previous_kps[player_id] is not None:
+                kps_diff = np.linalg.norm(cam_kps - self.previous_kps[player_id])
+                movement_threshold = 20.0
+                if kps_diff < movement_threshold:
+                    current_score -= 5
+                    if current_score < 0:
+                        current_score = 0
+
+            self.previous_kps[player_id] = cam_kps.copy()
+            # --- 정지 페널티 로직 추가 끝 ---
+
+            if current_score != -1.0:
+                self.score_history[player_id].append(current_score)
+
+            if len(self.score_history[player_id]) >= self.score_history_length:
+                smoothed_score = np.mean(self.score_history[player_id])
+
+                current_total_score = self.local_scores[player_id]
+                if smoothed_score >= 70.0:
+                    self.local_scores[player_id] = min(100, current_total_score + 1)
+                elif smoothed_score < 30.0:
+                    self.local_scores[player_id] = max(0, current_total_score - 1)
+
+                self.score_history[player_id] = []
         
         self.update_player_info_display()
 
@@ -364,15 +380,9 @@ class MultiPlayerApp(BasePoseApp):
             self.overlay_label.setText(str(self.count))
         elif self.count == 0:
             self.overlay_label.setText("START")
-            # 녹화 시작
-            if self.cap and self.cap.isOpened():
-                width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                fps = self.cap.get(cv2.CAP_PROP_FPS)
-                if fps == 0:
-                    fps = 30 # 기본 FPS
-                self.video_writer = cv2.VideoWriter(self.output_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
-                print(f"🎥 웹캠 녹화를 시작합니다. 저장 경로: {self.output_path}")
+            # 녹화 시작 (프레임 쓰기는 캡처 스레드에서 수행)
+            if self.pipeline is not None:
+                self.start_recording(self.output_path, pose_extract=self._largest_player)
         else:
             self.overlay_label.hide()
             self.count_timer.stop()
@@ -389,18 +399,14 @@ class MultiPlayerApp(BasePoseApp):
             self.end_time = time.time() # 게임 종료 시간 기록
             
             # 녹화 종료
-            if self.video_writer:
-                self.video_writer.release()
-                self.video_writer = None
+            if self.stop_recording():
                 print(f"✅ 영상이 성공적으로 저장되었습니다: {self.output_path}")
 
             self.close() # Close the window
 
     def closeEvent(self, event):
         """창이 닫힐 때 호출되는 이벤트 핸들러."""
-        if self.video_writer:
-            self.video_writer.release()
-            self.video_writer = None
+        if self.stop_recording():
             print("ℹ️ 창이 닫혀 녹화를 중지하고 영상을 저장했습니다.")
         super().closeEvent(event)
 
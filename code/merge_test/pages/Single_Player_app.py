@@ -17,7 +17,7 @@ from PyQt5.QtGui import QImage, QPixmap, QFont, QColor, QPainter
 # BasePoseApp 클래스를 임포트합니다.
 from .base_pose_app import BasePoseApp
 # 싱글 플레이어 모드에 필요한 추가 모듈을 임포트합니다.
-from core.model_loader import make_infer
+from core.roi_infer import make_roi_infer, DEFAULT_ROI_IMGSZ
 from core.pose_utils import (
     normalize_keypoints, pose_to_anglevec, frame_score_strict
 )
@@ -25,6 +25,9 @@ from PyQt5.QtWidgets import QPushButton
 from PyQt5.QtCore import pyqtSignal
 
 from core.person_utils import get_person_center, classify_region
+from core.reference_timeline import ReferenceTimeline
+from core.pose_track import ReferenceMetaError, NUM_KPTS
+from core.pose_filter import make_pose_filter
 
 class SinglePlayerApp(BasePoseApp):
     """
@@ -42,16 +45,19 @@ class SinglePlayerApp(BasePoseApp):
         self.button_container = None
         self.game_over_flag = False
         self.cam_kps = None # 포즈 감지 결과를 저장할 변수
+        # 점수 계산용 키포인트 시간 필터: 떨림을 줄이고, 잠깐 빠진 관절은 직전 값을 유지합니다.
+        self.pose_filter = make_pose_filter("one_euro")
 
         # 영상 녹화 관련 변수
-        self.video_writer = None
         resource_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'resource')
         if not os.path.exists(resource_dir):
             os.makedirs(resource_dir)
         self.output_path = os.path.join(resource_dir, 'output.mp4')
 
         # 포즈 감지 모델 로딩
-        self.infer_pose = make_infer(self.model, self.args, self.use_half)
+        # 직전 프레임의 사람 주변만 잘라 작은 입력으로 추론하고, 주기적으로/놓치면 전체 프레임을 봅니다.
+        self.infer_pose = make_roi_infer(self.model, self.args, self.use_half,
+                                         roi_imgsz=getattr(self.args, "roi_imgsz", DEFAULT_ROI_IMGSZ))
         print("Using pre-loaded single-person pose detection model.")
 
         # JSON 데이터 로딩
@@ -62,14 +68,17 @@ class SinglePlayerApp(BasePoseApp):
             return
         
         try:
-            with open(self.args.json, 'r') as f:
-                self.reference_data = json.load(f)["frames"]
-                print(f"Successfully loaded {len(self.reference_data)} reference frames.")
+            self.reference = ReferenceTimeline.load(self.args.json)
+            print(f"Successfully loaded {len(self.reference)} reference frames.")
         except FileNotFoundError:
             error_message = f"Error: Reference JSON file '{self.args.json}' not found."
             QMessageBox.critical(self, "Error", error_message)
             self.close()
             return
+        except ReferenceMetaError as e:
+            QMessageBox.critical(self, "Error", f"Error: Invalid reference file.\n{e}")
+            self.close()
+            return
 
         # 피드백 텍스트를 위한 QLabel 추가
         self.feedback_label = QLabel(self.cam_label)
@@ -99,6 +108,8 @@ class SinglePlayerApp(BasePoseApp):
         self.score_timer.timeout.connect(self.calculate_score)
 
         self.init_webcam()
+        # 웹캠 읽기/녹화/포즈 추론은 파이프라인 스레드에서 수행합니다.
+        self.start_capture_pipeline(self.infer_pose)
         if self.args.ref is not None:
             self.show_preview_frame(self.args.ref)
 
@@ -111,15 +122,11 @@ class SinglePlayerApp(BasePoseApp):
             self.overlay_label.setText(str(self.count))
         elif self.count == 0:
             self.overlay_label.setText("START")
-            # 녹화 시작
-            if self.cap and self.cap.isOpened():
-                width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                fps = self.cap.get(cv2.CAP_PROP_FPS)
-                if fps == 0:
-                    fps = 30 # 기본 FPS
-                self.video_writer = cv2.VideoWriter(self.output_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
-                print(f"🎥 웹캠 녹화를 시작합니다. 저장 경로: {self.output_path}")
+            # 녹화 시작 (프레임 쓰기는 캡처 스레드에서 수행)
+            if self.pipeline is not None:
+                self.start_recording(self.output_path)
+                # 게임 시작 후에만 포즈 감지 수행
+                self.pipeline.set_inference_enabled(True)
         else:
             self.overlay_label.hide()
             self.count_timer.stop()
@@ -128,41 +135,12 @@ class SinglePlayerApp(BasePoseApp):
             self.play_video()
             self.score_timer.start(333)
 
-    def update_frame(self):
-        """웹캠 프레임을 업데이트하고, 녹화하며, 포즈 감지를 수행합니다."""
+    def on_camera_frame(self, frame, timestamp):
+        """캡처 스레드가 읽은 웹캠 프레임을 카메라 고유 FPS로 화면에 표시합니다."""
         if self.game_over_flag:
             self.display_final_score()
             return
 
-        if not self.cap or not self.cap.isOpened():
-            return
-
-        ret, frame = self.cap.read()
-        if not ret or frame is None:
-            print("Error: 웹캠에서 프레임을 읽어올 수 없습니다.")
-            return
-
-        # 좌우반전 추가
-        frame = cv2.flip(frame, 1)
-
-        # 프레임 녹화
-        if self.video_writer:
-            self.video_writer.write(frame)
-
-        # 게임 시작 후에만 포즈 감지 수행
-        # if self.count <= 0:
-        #     self.cam_kps, _ = self.infer_pose(frame)
-        if self.count <= 0:
-            self.cam_kps, _ = self.infer_pose(frame)
-            if self.cam_kps is not None:
-                # 중심 좌표 구하기
-                center = get_person_center(self.cam_kps)
-                if center is not None:
-                    cx, cy = center
-                    region = classify_region(cx, frame.shape[1])
-                    # print(f"[Single] 중심 x={cx:.1f}, 화면폭={frame.shape[1]}, 영역={region}")
-                    self.ser.write(region.encode())
-
         # 화면에 프레임 표시 (BasePoseApp 로직과 유사)
         frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         h, w, ch = frame_rgb.shape
@@ -175,27 +153,40 @@ class SinglePlayerApp(BasePoseApp):
         self.feedback_label.setGeometry(10, 10, int(self.cam_label.width() / 1.5), int(self.cam_label.height() / 3))
         self.feedback_label.setFont(QFont("Arial", int(self.cam_label.height() / 15), QFont.Bold))
 
+    def on_pose_result(self, frame, result, timestamp):
+        """추론 스레드의 포즈 결과를 받아 점수 계산용 키포인트와 시리얼 영역을 갱신합니다."""
+        if self.game_over_flag or self.count > 0:
+            return
+
+        kps, _ = result
+        if kps is None:
+            kps = np.full((NUM_KPTS, 2), np.nan, np.float32)
+        kps = self.pose_filter(kps, timestamp)
+        self.cam_kps = kps if np.isfinite(kps).any() else None
+        if self.cam_kps is not None:
+            # 중심 좌표 구하기
+            center = get_person_center(self.cam_kps)
+            if center is not None:
+                cx, cy = center
+                region = classify_region(cx, frame.shape[1])
+                # print(f"[Single] 중심 x={cx:.1f}, 화면폭={frame.shape[1]}, 영역={region}")
+                self.ser.write(region.encode())
+
     def calculate_score(self):
-        """update_frame에서 감지된 포즈를 사용하여 점수를 계산합니다."""
+        """on_pose_result에서 감지된 포즈를 사용하여 점수를 계산합니다."""
         if self.cam_kps is None or self.count > 0 or self.game_over_flag:
             return
 
         current_score = -1.0
         
-        if len(self.reference_data) > 0:
+        if len(self.reference) > 0:
             delayed_position = self.player.position() - self.follow_delay_ms
             if delayed_position < 0: delayed_position = 0
-            ref_frame_index = int(delayed_position / 1000 * 30)
-            ref_data_index = ref_frame_index // 10
-
-            if ref_data_index < len(self.reference_data):
-                ref_data = self.reference_data[ref_data_index]
-                ref_kps = np.array(ref_data["kps"])
+            # 레퍼런스 각도 벡터는 로드 시점에 미리 계산되어 있습니다.
+            vec_ref = self.reference.anglevec_at(delayed_position)
 
+            if vec_ref is not None:
                 cam_kps_norm = normalize_keypoints(self.cam_kps)
-                ref_kps_norm = normalize_keypoints(ref_kps)
-
-                vec_ref = pose_to_anglevec(ref_kps_norm)
                 vec_live = pose_to_anglevec(cam_kps_norm)
 
                 score, _, _ = frame_score_strict(vec_ref, vec_live)
@@ -235,18 +226,14 @@ class SinglePlayerApp(BasePoseApp):
             self.game_over_flag = True
             
             # 녹화 종료
-            if self.video_writer:
-                self.video_writer.release()
-                self.video_writer = None
+            if self.stop_recording():
                 print(f"✅ 영상이 성공적으로 저장되었습니다: {self.output_path}")
 
             self.close()
 
     def closeEvent(self, event):
         """창이 닫힐 때 호출되는 이벤트 핸들러."""
-        if self.video_writer:
-            self.video_writer.release()
-            self.video_writer = None
+        if self.stop_recording():
             print("ℹ️ 창이 닫혀 녹화를 중지하고 영상을 저장했습니다.")
         super().closeEvent(event)
 
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import os
+
 import numpy as np
 import cv2
 from PyQt5.QtWidgets import (
@@ -12,6 +14,13 @@ from PyQt5.QtMultimediaWidgets import QVideoWidget
 from PyQt5.QtCore import QTimer, Qt, QUrl, QFileInfo, QSize, QEvent, pyqtSignal, QPropertyAnimation, QEasingCurve
 from PyQt5.QtGui import QImage, QPixmap, QFont
 
+from core.capture_pipeline import CapturePipeline
+from core.video_encoder import open_encoder, REALTIME_PRESET
+from core.live_pose_track import LivePoseRecorder, live_track_path_for
+
+# 웹캠 읽기가 이만큼 연속으로 실패하면(약 3초) 웹캠을 다시 엽니다.
+CAMERA_RESTART_FAILS = 300
+
 class MyVideoWidget(QVideoWidget):
     """QVideoWidget을 상속받아 sizeHint를 오버라이드하여 레이아웃 내에서 유연하게 크기 조절"""
     def sizeHint(self):
@@ -33,6 +42,10 @@ class BasePoseApp(QWidget):
 
         self.cap_index = 0
         self.cap = None
+        self.pipeline = None
+        self.video_writer = None
+        self.pose_recorder = None
+        self.recording_path = None
         self.game_started = False
         self.game_over = False
         self.count = 6 # 카운트다운 시작 값
@@ -147,6 +160,120 @@ class BasePoseApp(QWidget):
             self.cam_label.setStyleSheet("background-color: black; color: white; font-size: 20px;")
             self.frame_timer = None
 
+    def start_capture_pipeline(self, infer_fn, inference_enabled=False):
+        """
+        웹캠 읽기와 포즈 추론을 GUI 스레드 밖의 파이프라인으로 옮깁니다.
+        frame_timer 대신 on_camera_frame / on_pose_result 슬롯이 호출됩니다.
+        """
+        if not self.cap or not self.cap.isOpened():
+            return
+        if self.frame_timer:
+            self.frame_timer.stop()
+            self.frame_timer = None
+
+        self.pipeline = CapturePipeline(self.cap, infer_fn, flip=True, parent=self)
+        self.pipeline.frameReady.connect(self.on_camera_frame)
+        self.pipeline.resultReady.connect(self.on_pose_result)
+        self.pipeline.readFailed.connect(self.on_camera_read_failed)
+        self.pipeline.writeFailed.connect(self.on_recording_failed)
+        self.pipeline.start(inference_enabled)
+
+    def stop_capture_pipeline(self):
+        """파이프라인 스레드를 정리합니다. 녹화 중인 VideoWriter는 분리만 합니다."""
+        if self.pipeline is not None:
+            self.pipeline.stop()
+            self.pipeline = None
+
+    def start_recording(self, output_path, pose_extract=None):
+        """
+        웹캠 녹화를 시작합니다. 프레임은 캡처 스레드에서 인코더로 바로 들어가고,
+        레퍼런스 영상(args.ref)의 오디오가 같은 패스에서 합쳐집니다.
+        녹화 중 추론된 포즈는 녹화 프레임 번호와 함께 모아 두었다가
+        stop_recording()에서 영상 옆에 .live.posetrack으로 저장합니다(아바타 변환에서 재사용).
+        pose_extract(result) -> (kps, conf): 추론 결과에서 한 사람을 고르는 함수
+        """
+        if self.pipeline is None:
+            return
+        width, height = self.pipeline.frame_size
+        # 이전 게임의 트랙이 새 녹화와 섞이지 않도록 먼저 지웁니다.
+        track_path = live_track_path_for(output_path)
+        if os.path.exists(track_path):
+            os.remove(track_path)
+        self.video_writer = open_encoder(output_path, audio_source=self.args.ref, preset=REALTIME_PRESET)
+        self.video_writer.open(self.pipeline.fps, (width, height))
+        self.pose_recorder = LivePoseRecorder(pose_extract)
+        self.recording_path = output_path
+        self.pipeline.set_pose_sink(self.pose_recorder.add)
+        self.pipeline.set_video_writer(self.video_writer)
+        print(f"🎥 웹캠 녹화를 시작합니다. 저장 경로: {output_path}")
+
+    def stop_recording(self):
+        """캡처 파이프라인을 멈추고 녹화 파일을 마무리합니다. 녹화 중이었으면 True"""
+        fps = self.pipeline.fps if self.pipeline else None
+        size = self.pipeline.frame_size if self.pipeline else None
+        self.stop_capture_pipeline()
+        if not self.video_writer:
+            return False
+        writer, self.video_writer = self.video_writer, None
+        recorder, self.pose_recorder = self.pose_recorder, None
+        try:
+            writer.close()
+        except IOError as e:
+            print(f"❗ 녹화 파일 저장 중 오류: {e}")
+            return True
+
+        if recorder is not None and fps:
+            track_path = live_track_path_for(self.recording_path)
+            try:
+                saved = recorder.save(track_path, fps, size, num_frames=writer.frame_count)
+                print(f"🦴 실시간 포즈 트랙 저장: {track_path} ({saved}/{writer.frame_count} frames)")
+            except (OSError, ValueError) as e:
+                print(f"❗ 포즈 트랙 저장 중 오류: {e}")
+        return True
+
+    def on_camera_read_failed(self, count):
+        """캡처 스레드에서 웹캠 읽기가 연속 count번 실패했을 때 호출됩니다."""
+        if self.sender() is not self.pipeline:
+            return  # 이미 정리한 이전 파이프라인에서 늦게 도착한 신호
+        print(f"Error: 웹캠에서 프레임을 읽어올 수 없습니다. (연속 {count}회)")
+        if count >= CAMERA_RESTART_FAILS:
+            self.restart_webcam()
+
+    def restart_webcam(self):
+        """
+        끊긴 웹캠을 다시 열고 같은 추론 함수로 파이프라인을 새로 시작합니다.
+        녹화 중이었으면 지금까지 녹화한 분량을 저장합니다(녹화는 이어지지 않음).
+        """
+        if self.pipeline is None:
+            return
+        infer_fn, enabled = self.pipeline.infer_fn, self.pipeline.inference_enabled()
+        if self.stop_recording():
+            print("ℹ️ 웹캠 연결이 끊겨 지금까지 녹화한 영상을 저장했습니다.")
+        else:
+            self.stop_capture_pipeline()
+        print("🔄 웹캠을 다시 엽니다.")
+        self.init_webcam()
+        self.start_capture_pipeline(infer_fn, enabled)
+
+    def on_recording_failed(self, message):
+        """
+        캡처 스레드에서 녹화 쓰기가 실패했을 때 호출됩니다. writer는 캡처 스레드가 이미 닫았으므로
+        참조만 정리하고, 게임 화면은 그대로 계속합니다.
+        """
+        print(f"❗ 녹화 중 오류로 녹화를 중단합니다: {message}")
+        if self.pipeline is not None:
+            self.pipeline.set_pose_sink(None)
+        self.video_writer = None
+        self.pose_recorder = None
+
+    def on_camera_frame(self, frame, timestamp):
+        """파이프라인이 읽은 웹캠 프레임. 상속 클래스에서 오버라이드합니다."""
+        pass
+
+    def on_pose_result(self, frame, result, timestamp):
+        """파이프라인의 포즈 추론 결과. 상속 클래스에서 오버라이드합니다."""
+        pass
+
     def equalize_splitter(self):
         """스플리터의 화면 비율을 균등하게 조정합니다."""
         w = max(2, self.splitter.width())
@@ -213,6 +340,7 @@ class BasePoseApp(QWidget):
     
     def game_over(self):
         """게임 종료 시 호출될 메서드. 상속 클래스에서 오버라이드합니다."""
+        self.stop_capture_pipeline()
         if self.frame_timer:
             self.frame_timer.stop()
         if self.score_timer:
@@ -17,6 +17,8 @@ from core.model_loader import make_infer
 from core.pose_utils import (
     normalize_keypoints, pose_to_anglevec, frame_score_strict
 )
+from core.reference_timeline import ReferenceTimeline
+from core.pose_track import ReferenceMetaError
 
 from PyQt5.QtWidgets import QPushButton
 from PyQt5.QtCore import pyqtSignal
@@ -56,15 +58,20 @@ class PoseScoreApp(QWidget):
             return
 
         try:
-            with open(self.args.json, 'r') as f:
-                self.reference_data = json.load(f)["frames"]
-                print(f"Successfully loaded {len(self.reference_data)} reference frames.")
+            self.reference = ReferenceTimeline.load(self.args.json)
+            print(f"Successfully loaded {len(self.reference)} reference frames.")
         except FileNotFoundError:
             print(f"Error: Reference JSON file '{self.args.json}' not found.")
-            self.reference_data = None
+            self.reference = None
             QMessageBox.critical(self, "Error", f"Reference JSON file '{self.args.json}' not found.")
             self.close()
             return
+        except ReferenceMetaError as e:
+            print(f"Error: {e}")
+            self.reference = None
+            QMessageBox.critical(self, "Error", f"Invalid reference file.\n{e}")
+            self.close()
+            return
 
         # --- 1. 왼쪽 화면 (미리보기/재생 전환) 설정 ---
         self.preview_label = QLabel()
@@ -295,27 +302,19 @@ class PoseScoreApp(QWidget):
         cam_kps, cam_conf = self.infer_pose(frame)
         current_score = -1.0 # 기본값
 
-        if cam_kps is not None and len(self.reference_data) > 0:
-            # 비디오 현재 위치를 기반으로 정답 프레임 인덱스 계산
+        if cam_kps is not None and len(self.reference) > 0:
+            # 비디오 현재 위치를 기반으로 정답 포즈 계산
             # '따라하기' 기능을 위해 현재 시점보다 200ms 이전의 프레임을 사용합니다.
             delayed_position = self.player.position() - self.follow_delay_ms
             if delayed_position < 0:
                 delayed_position = 0
 
-            # `delayed_position`은 밀리초 단위이므로, 이를 초 단위로 변환 후 30fps를 곱합니다.
-            ref_frame_index = int(delayed_position / 1000 * 30)
-
-            # 정답 데이터는 10프레임마다 저장되어 있으므로, 인덱스를 10으로 나눕니다.
-            ref_data_index = ref_frame_index // 10
-
-            if ref_data_index < len(self.reference_data):
-                ref_data = self.reference_data[ref_data_index]
-                ref_kps = np.array(ref_data["kps"])
+            # 레퍼런스의 타임스탬프로 앞뒤 키프레임을 찾아 보간합니다(FPS/추출 간격과 무관).
+            # 레퍼런스 각도 벡터는 로드 시점에 미리 계산되어 있습니다.
+            vec_ref = self.reference.anglevec_at(delayed_position)
 
+            if vec_ref is not None:
                 cam_kps_norm = normalize_keypoints(cam_kps)
-                ref_kps_norm = normalize_keypoints(ref_kps)
-
-                vec_ref = pose_to_anglevec(ref_kps_norm)
                 vec_live = pose_to_anglevec(cam_kps_norm)
 
                 score, _, _ = frame_score_strict(vec_ref, vec_live)
@@ -13,6 +13,8 @@ import torch
 from .page_enum import PageIndex
 
 from tools.video_to_json import create_json_from_video
+from core.model_registry import get_model
+from core.pose_track import reference_path_for
 
 # QVideoWidget 상속 → sizeHint 무시해 레이아웃 비율에 영향 못 주게
 class MyVideoWidget(QVideoWidget):
@@ -117,9 +119,7 @@ class VideoSelectPage(QWidget):
 
     def select_video(self, item):
         self.ref_path = os.path.join(self.video_dir, item.text())
-        video_name, _ = os.path.splitext(item.text())
-        json_fname = video_name + ".json"
-        json_full_path = os.path.join(self.video_dir, json_fname)
+        json_full_path = reference_path_for(self.ref_path)
 
         abs_path = QFileInfo(self.ref_path).absoluteFilePath()
         self.player.setMedia(QMediaContent(QUrl.fromLocalFile(abs_path)))
@@ -132,11 +132,17 @@ class VideoSelectPage(QWidget):
             print(f"JSON 파일을 찾을 수 없습니다: {json_full_path}")
             # ✅ JSON 자동 생성
             model_path = "yolov8n-pose.pt"
+            device = "cuda" if torch.cuda.is_available() else "cpu"
             self.json_path = json_full_path
+            try:
+                # 한 번 불러온 모델은 레지스트리에 남아 다음 영상에서도 그대로 씁니다.
+                model = get_model(model_path, device, self.use_half)
+            except RuntimeError as e:
+                QMessageBox.warning(self, "모델 오류", str(e))
+                return
             create_json_from_video(
                 self.ref_path, model_path, self.json_path,
-                imgsz=320, device="cuda" if torch.cuda.is_available() else "cpu",
-                use_half=self.use_half, step=10
+                imgsz=320, device=device, use_half=self.use_half, step=10, model=model
             )
 
     def launch_pose_app(self):
@@ -0,0 +1,163 @@
+import argparse
+import glob
+import json
+import os
+import sys
+from functools import reduce
+from math import gcd
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.pose_track import (
+    POSE_TRACK_EXT, ReferenceMetaError, load_pose_data, save_pose_track, validate_reference_meta
+)
+
+DEFAULT_REF_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'resource', 'videos')
+VIDEO_EXTS = ('.mp4', '.avi', '.mov', '.mkv')
+# 영상이 없을 때 frame_index/timestamp로 추정한 fps를 맞춰 볼 흔한 fps (NTSC 계열 포함)
+COMMON_FPS = (24.0, 25.0, 30.0, 50.0, 60.0, 24000 / 1001, 30000 / 1001, 60000 / 1001)
+FPS_FIT_TOL_S = 0.001
+
+
+def find_video(ref_path):
+    """레퍼런스와 같은 이름의 영상 파일을 찾습니다."""
+    base = os.path.splitext(ref_path)[0]
+    for ext in VIDEO_EXTS:
+        if os.path.exists(base + ext):
+            return base + ext
+    return None
+
+
+def probe_video(video_path):
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        return None
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    size = [int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))]
+    cap.release()
+    if fps <= 0 or min(size) <= 0:
+        return None
+    return fps, size
+
+
+def infer_stride(frame_index):
+    """frame_index 간격의 최대공약수 = 추출 당시의 step"""
+    diffs = np.diff(np.asarray(frame_index, dtype=np.int64))
+    diffs = [int(d) for d in diffs if d > 0]
+    return reduce(gcd, diffs) if diffs else 1
+
+
+def infer_fps(frame_index, timestamps):
+    """
+    frame_index / timestamp에서 fps를 추정합니다(최소 제곱). 흔한 fps로 모든 프레임이
+    FPS_FIT_TOL_S 이내로 맞으면 그 값을 씁니다. 추정할 수 없으면 None.
+    """
+    fi = np.asarray(frame_index, dtype=np.float64)
+    ts = np.asarray(timestamps, dtype=np.float64)
+    if len(fi) < 2 or not np.any(ts > 0):
+        return None
+    fitted = float(fi @ fi) / float(fi @ ts)
+    for fps in sorted(COMMON_FPS, key=lambda f: abs(f - fitted)):
+        if np.max(np.abs(ts - fi / fps)) <= FPS_FIT_TOL_S:
+            return fps
+    fps = round(fitted, 6)
+    if np.max(np.abs(ts - fi / fps)) > 0.5 / fps:
+        return None  # 가변 fps 등 하나의 fps로 설명되지 않는 경우
+    return fps
+
+
+def backfill(ref_path, force=False, dry_run=False):
+    """
+    레퍼런스 파일 하나에 fps/stride/video_size를 채웁니다.
+    이미 값이 있으면(force가 아니면) 영상과 일치하는지만 확인합니다.
+    옆에 영상이 없으면 fps는 frame_index/timestamp에서, stride는 frame_index 간격에서 추정하고
+    video_size는 비워 둡니다(채점에는 필요 없고, 아바타 렌더링만 필요로 합니다).
+    반환: True(정상 또는 갱신됨) / False(실패)
+    """
+    name = os.path.basename(ref_path)
+    data = load_pose_data(ref_path, mmap=False)
+
+    video_path = find_video(ref_path)
+    probed = probe_video(video_path) if video_path else None
+    if probed is None:
+        fps = infer_fps(data["frame_index"], data["timestamp"])
+        if fps is None and not data.get("fps"):
+            print(f"[FAIL] {name}: no readable video next to the reference ({', '.join(VIDEO_EXTS)}) "
+                  f"and fps could not be inferred from the timestamps")
+            return False
+        video_size = None
+    else:
+        fps, video_size = probed
+
+    meta = {
+        "fps": data["fps"] if data.get("fps") and not force else fps,
+        "stride": data["stride"] if data.get("stride") and not force else infer_stride(data["frame_index"]),
+        "video_size": data["video_size"] if data.get("video_size") and (not force or video_size is None) else video_size,
+    }
+    if data.get("fps") and fps and abs(float(data["fps"]) - fps) > 1e-3:
+        print(f"[WARN] {name}: stored fps {data['fps']} differs from {'video' if probed else 'inferred'} fps {fps:.3f}")
+    if data.get("video_size") and video_size and list(data["video_size"]) != video_size:
+        print(f"[WARN] {name}: stored video_size {data['video_size']} differs from video {video_size}")
+
+    changed = any(data.get(k) != v for k, v in meta.items())
+    data.update(meta)
+    if not _report(name, data):
+        return False
+    if changed and not dry_run:
+        _write_meta(ref_path, data, meta)
+        print(f"       updated {name}: fps={meta['fps']:.3f} stride={meta['stride']} video_size={meta['video_size']}")
+    return True
+
+
+def _report(name, data):
+    try:
+        validate_reference_meta(data, name)
+    except ReferenceMetaError as e:
+        print(f"[FAIL] {e}")
+        return False
+    video_size = list(data["video_size"]) if data.get("video_size") else None
+    print(f"[OK] {name}: fps={float(data['fps']):.3f} stride={data['stride']} video_size={video_size}")
+    return True
+
+
+def _write_meta(ref_path, data, meta):
+    if ref_path.endswith(POSE_TRACK_EXT):
+        save_pose_track(
+            ref_path, data["frame_index"], data["timestamp"], data["kps"], data["conf"],
+            fps=meta["fps"], stride=meta["stride"], video_size=meta["video_size"],
+            kps_dtype=data["kps"].dtype.name, conf_dtype=data["conf"].dtype.name
+        )
+        return
+
+    # JSON은 frames를 그대로 두고 헤더 키만 추가합니다(원래 파일의 들여쓰기 유지).
+    with open(ref_path, 'r') as f:
+        raw = json.load(f)
+    out = {"video_size": meta["video_size"], "fps": meta["fps"], "stride": meta["stride"]}
+    if out["video_size"] is None:
+        del out["video_size"]
+    out.update({k: v for k, v in raw.items() if k not in out})
+    tmp_path = ref_path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(out, f, indent=4)
+    os.replace(tmp_path, ref_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description='Add fps/stride/video_size to reference pose files by probing the matching video '
+                    '(or, without a video, fps/stride inferred from frame_index/timestamp).')
+    parser.add_argument('inputs', nargs='*',
+                        help='Reference .json/.posetrack files (default: all in resource/videos).')
+    parser.add_argument('--force', action='store_true', help='Overwrite existing metadata with probed values.')
+    parser.add_argument('--dry_run', action='store_true', help='Only report, do not modify files.')
+    args = parser.parse_args()
+
+    inputs = args.inputs or sorted(
+        glob.glob(os.path.join(DEFAULT_REF_DIR, '*.json')) + glob.glob(os.path.join(DEFAULT_REF_DIR, '*' + POSE_TRACK_EXT))
+    )
+    ok = True
+    for path in inputs:
+        ok &= backfill(path, force=args.force, dry_run=args.dry_run)
+    sys.exit(0 if ok else 1)
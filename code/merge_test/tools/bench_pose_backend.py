@@ -0,0 +1,85 @@
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.model_loader import load_model, make_infer
+
+
+def read_frames(video_path, count, stride):
+    """영상에서 stride 간격으로 최대 count장을 읽습니다."""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Could not open video file {video_path}")
+    frames = []
+    index = 0
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if index % stride == 0:
+            frames.append(frame)
+        index += 1
+    cap.release()
+    return frames
+
+
+def bench(model_path, frames, imgsz, device, warmup):
+    """모델 하나의 프레임당 지연 시간(ms)과 결과 (kps, conf) 목록을 반환합니다."""
+    model, use_half = load_model(model_path, device, device == "cuda")
+    if model is None:
+        raise RuntimeError(f"Could not load {model_path}")
+    infer = make_infer(model, SimpleNamespace(imgsz=imgsz, device=device, conf_thres=0.5), use_half)
+    for frame in frames[:warmup]:
+        infer(frame)
+
+    times, results = [], []
+    for frame in frames:
+        t0 = time.perf_counter()
+        results.append(infer(frame))
+        times.append((time.perf_counter() - t0) * 1000.0)
+    return np.array(times), results
+
+
+def compare(results, reference):
+    """기준 모델과의 비교: 사람 검출 일치율, 양쪽 모두 있는 관절의 평균 오차(px)"""
+    same, errors = 0, []
+    for (kps, _), (ref_kps, _) in zip(results, reference):
+        if (kps is None) == (ref_kps is None):
+            same += 1
+        if kps is not None and ref_kps is not None:
+            both = np.isfinite(kps).all(axis=1) & np.isfinite(ref_kps).all(axis=1)
+            if both.any():
+                errors.append(np.linalg.norm(kps[both] - ref_kps[both], axis=1).mean())
+    return same / max(1, len(results)), (float(np.mean(errors)) if errors else float("nan"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark pose backends (.pt / .onnx / OpenVINO) on the same frames.')
+    parser.add_argument('models', nargs='+', help='Model paths. The first one is the accuracy reference.')
+    parser.add_argument('--video', type=str, required=True, help='Video with people in it (e.g. a recorded output.mp4).')
+    parser.add_argument('--frames', type=int, default=100, help='Number of frames to time.')
+    parser.add_argument('--stride', type=int, default=3, help='Use every Nth frame of the video.')
+    parser.add_argument('--imgsz', type=int, default=640, help='Input size for .pt models.')
+    parser.add_argument('--device', type=str, default='cpu')
+    parser.add_argument('--warmup', type=int, default=5)
+    args = parser.parse_args()
+
+    frames = read_frames(args.video, args.frames, args.stride)
+    print(f"{len(frames)} frames from {args.video}")
+
+    reference, base_ms = None, None
+    print(f"{'model':<48} {'mean ms':>8} {'p90 ms':>8} {'fps':>7} {'speedup':>8} {'same det':>9} {'kp err px':>10}")
+    for path in args.models:
+        times, results = bench(path, frames, args.imgsz, args.device, args.warmup)
+        mean = float(times.mean())
+        if reference is None:
+            reference, base_ms = results, mean
+        agree, err = compare(results, reference)
+        print(f"{path:<48} {mean:8.1f} {np.percentile(times, 90):8.1f} {1000.0 / mean:7.1f} "
+              f"{base_ms / mean:7.2f}x {agree * 100:8.1f}% {err:10.2f}")
@@ -0,0 +1,43 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ultralytics import YOLO
+
+
+def export_pose_model(weights, fmt, imgsz, half=False, int8=False, data=None):
+    """
+    YOLO 포즈 모델(.pt)을 ONNX 또는 OpenVINO IR로 내보냅니다. 반환: 내보낸 파일/폴더 경로
+    - onnx: FP32 (half=True이면 FP16, CUDA가 있는 환경에서만 가능)
+    - openvino: FP32 / FP16(half) / INT8(int8, data의 이미지로 보정)
+    입력 크기는 imgsz로 고정되고 배치는 1입니다. 앱에서는 POSE_MODEL=<경로>로 씁니다.
+    """
+    model = YOLO(weights)
+    kwargs = dict(format=fmt, imgsz=imgsz, dynamic=False, batch=1)
+    if fmt == "onnx":
+        kwargs["simplify"] = True
+    if half:
+        kwargs["half"] = True
+    if int8:
+        if fmt != "openvino":
+            raise ValueError("INT8 export is only supported for OpenVINO here.")
+        kwargs["int8"] = True
+        if data:
+            kwargs["data"] = data
+    return model.export(**kwargs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Export the YOLOv8 pose model for ONNX Runtime / OpenVINO.')
+    parser.add_argument('--weights', type=str, default='yolov8l-pose.pt', help='Source .pt weights.')
+    parser.add_argument('--format', type=str, default='openvino', choices=['onnx', 'openvino'])
+    parser.add_argument('--imgsz', type=int, default=640, help='Fixed input size of the exported model.')
+    parser.add_argument('--half', action='store_true', help='FP16 weights.')
+    parser.add_argument('--int8', action='store_true', help='INT8 weights (OpenVINO, needs calibration data).')
+    parser.add_argument('--data', type=str, default=None, help='Dataset yaml used for INT8 calibration.')
+    args = parser.parse_args()
+
+    out = export_pose_model(args.weights, args.format, args.imgsz, args.half, args.int8, args.data)
+    print(f"Exported: {out}")
+    print(f"Run the app with: POSE_MODEL={out}")
@@ -0,0 +1,61 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.pose_track import POSE_TRACK_EXT, load_pose_data, pose_data_from_json, save_pose_track
+
+DEFAULT_REF_GLOB = os.path.join(os.path.dirname(__file__), '..', '..', 'resource', 'videos', '*.json')
+
+
+def convert(json_path, kps_dtype):
+    """레퍼런스 JSON 하나를 같은 이름의 .posetrack으로 변환합니다."""
+    with open(json_path, 'r') as f:
+        data = pose_data_from_json(json.load(f))
+    out_path = os.path.splitext(json_path)[0] + POSE_TRACK_EXT
+    save_pose_track(
+        out_path, data["frame_index"], data["timestamp"], data["kps"], data["conf"],
+        fps=data["fps"], stride=data["stride"], video_size=data["video_size"],
+        kps_dtype=kps_dtype
+    )
+    return out_path
+
+
+def _best_time(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def benchmark(json_path, track_path, repeat):
+    """JSON 로드와 .posetrack 로드(memmap) 시간을 비교합니다."""
+    # memmap은 실제로 읽어야 비용이 드러나므로 키포인트를 한 번 합산합니다.
+    t_json = _best_time(lambda: load_pose_data(json_path)["kps"].sum(), repeat)
+    t_track = _best_time(lambda: load_pose_data(track_path)["kps"].sum(), repeat)
+    size_json = os.path.getsize(json_path)
+    size_track = os.path.getsize(track_path)
+    print(f"{os.path.basename(json_path):<20} {size_json / 1024:>8.1f} KB -> {size_track / 1024:>7.1f} KB   "
+          f"load {t_json * 1000:>7.2f} ms -> {t_track * 1000:>6.2f} ms ({t_json / t_track:>5.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Convert reference pose JSON files to the .posetrack format.')
+    parser.add_argument('inputs', nargs='*', help='Reference JSON files (default: resource/videos/*.json).')
+    parser.add_argument('--kps_dtype', type=str, default='float32', choices=['float16', 'float32'],
+                        help='Storage type for keypoints.')
+    parser.add_argument('--repeat', type=int, default=5, help='Load benchmark repetitions (0 to skip).')
+    args = parser.parse_args()
+
+    inputs = args.inputs or sorted(glob.glob(DEFAULT_REF_GLOB))
+    for json_path in inputs:
+        track_path = convert(json_path, args.kps_dtype)
+        if args.repeat > 0:
+            benchmark(json_path, track_path, args.repeat)
+        else:
+            print(f"Wrote {track_path}")
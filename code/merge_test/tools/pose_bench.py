@@ -0,0 +1,163 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.pose_utils import (
+    normalize_keypoints, pose_to_anglevec, frame_score_strict,
+    normalize_keypoints_batch, pose_to_anglevec_batch, frame_score_strict_batch,
+    L_SH, R_SH, L_HP, R_HP
+)
+
+DEFAULT_REF_GLOB = os.path.join(os.path.dirname(__file__), '..', '..', 'resource', 'videos', '*.json')
+DEFAULT_GOLDEN = os.path.join(os.path.dirname(__file__), 'pose_golden.json')
+
+
+def load_reference_kps(path):
+    with open(path, 'r') as f:
+        frames = json.load(f)["frames"]
+    return np.array(
+        [[[np.nan if v is None else v for v in xy] for xy in fr["kps"]] for fr in frames],
+        dtype=np.float64
+    )
+
+
+def make_random_poses(n, seed=0):
+    """NaN 관절, 어깨/골반 누락, 어깨 너비 0 같은 경계 사례를 섞은 임의 포즈."""
+    rng = np.random.default_rng(seed)
+    pts = rng.normal(500.0, 150.0, (n, 17, 2))
+    pts[rng.random((n, 17)) < 0.2] = np.nan
+    pts[0::40] = np.nan
+    pts[1::40, R_SH] = pts[1::40, L_SH]
+    pts[2::40, L_SH, 0] = np.nan
+    pts[3::40, [L_HP, R_HP]] = np.nan
+    return pts
+
+
+def scalar_pipeline(kps, ref_vecs):
+    norm_kps = np.stack([normalize_keypoints(k) for k in kps])
+    vecs = np.stack([pose_to_anglevec(k) for k in norm_kps])
+    scores = np.array([frame_score_strict(r, v)[0] for r, v in zip(ref_vecs, vecs)])
+    return norm_kps, vecs, scores
+
+
+def batch_pipeline(kps, ref_vecs):
+    norm_kps = normalize_keypoints_batch(kps)
+    vecs = pose_to_anglevec_batch(norm_kps)
+    scores = frame_score_strict_batch(ref_vecs, vecs)[0]
+    return norm_kps, vecs, scores
+
+
+def check_equivalence(name, kps):
+    """단일 포즈 함수와 배치 함수의 결과가 같은지 확인합니다."""
+    ref_vecs = np.stack([pose_to_anglevec(normalize_keypoints(k)) for k in kps[::-1]])
+    s_norm, s_vec, s_score = scalar_pipeline(kps, ref_vecs)
+    b_norm, b_vec, b_score = batch_pipeline(kps, ref_vecs)
+    ok = (
+        np.allclose(s_norm, b_norm, atol=1e-6, equal_nan=True)
+        and np.allclose(s_vec, b_vec, atol=1e-5)
+        and np.allclose(s_score, b_score, atol=1e-3)
+    )
+    print(f"[{'OK' if ok else 'FAIL'}] {name}: {len(kps)} poses, "
+          f"max |d_vec|={np.max(np.abs(s_vec - b_vec)):.2e}, "
+          f"max |d_score|={np.max(np.abs(s_score - b_score)):.2e}")
+    return ok
+
+
+def golden_entry(kps):
+    vecs = np.stack([pose_to_anglevec(normalize_keypoints(k)) for k in kps])
+    # 인접 키프레임끼리의 점수: 레퍼런스가 바뀌지 않았는지 확인하는 용도
+    scores = [frame_score_strict(vecs[i], vecs[i + 1])[0] for i in range(len(vecs) - 1)]
+    return {
+        "anglevec": np.round(vecs, 4).tolist(),
+        "next_score": np.round(scores, 3).tolist(),
+    }
+
+
+def check_golden(ref_paths, golden_path, update):
+    entries = {os.path.basename(p): golden_entry(load_reference_kps(p)) for p in ref_paths}
+    if update:
+        with open(golden_path, 'w') as f:
+            json.dump(entries, f, separators=(',', ':'))
+        print(f"Wrote golden outputs for {len(entries)} references to {golden_path}")
+        return True
+
+    if not os.path.exists(golden_path):
+        print(f"Golden file not found: {golden_path} (run with --update-golden)")
+        return False
+    with open(golden_path, 'r') as f:
+        golden = json.load(f)
+
+    all_ok = True
+    for name, entry in entries.items():
+        if name not in golden:
+            print(f"[SKIP] {name}: no golden entry")
+            continue
+        ok = (
+            np.allclose(entry["anglevec"], golden[name]["anglevec"], atol=1e-3)
+            and np.allclose(entry["next_score"], golden[name]["next_score"], atol=1e-2)
+        )
+        all_ok &= ok
+        print(f"[{'OK' if ok else 'FAIL'}] golden {name}")
+    return all_ok
+
+
+def _rate(fn, n, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return n / best
+
+
+def benchmark(kps, repeat):
+    """normalize / anglevec / score 단계별 초당 처리 포즈 수."""
+    n = len(kps)
+    norm_kps = normalize_keypoints_batch(kps)
+    vecs = pose_to_anglevec_batch(norm_kps)
+    ref_vecs = vecs[::-1].copy()
+
+    rows = [
+        ("normalize", lambda: [normalize_keypoints(k) for k in kps],
+                      lambda: normalize_keypoints_batch(kps)),
+        ("anglevec", lambda: [pose_to_anglevec(k) for k in norm_kps],
+                     lambda: pose_to_anglevec_batch(norm_kps)),
+        ("score", lambda: [frame_score_strict(r, v) for r, v in zip(ref_vecs, vecs)],
+                  lambda: frame_score_strict_batch(ref_vecs, vecs)),
+    ]
+    print(f"{'stage':<10} {'scalar poses/s':>16} {'batch poses/s':>16} {'speedup':>8}")
+    for name, scalar_fn, batch_fn in rows:
+        s = _rate(scalar_fn, n, repeat)
+        b = _rate(batch_fn, n, repeat)
+        print(f"{name:<10} {s:>16.0f} {b:>16.0f} {b / s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Verify and benchmark pose scoring math.')
+    parser.add_argument('--refs', type=str, default=DEFAULT_REF_GLOB, help='Glob of reference JSON files.')
+    parser.add_argument('--golden', type=str, default=DEFAULT_GOLDEN, help='Path to the golden output file.')
+    parser.add_argument('--update-golden', action='store_true', help='Rewrite the golden file from the current code.')
+    parser.add_argument('--bench', type=int, default=2000, help='Number of poses for the benchmark (0 to skip).')
+    parser.add_argument('--repeat', type=int, default=3, help='Benchmark repetitions (best is reported).')
+    args = parser.parse_args()
+
+    # 레퍼런스에는 어깨/골반이 모두 없는 프레임이 있어 nanmean 경고가 납니다.
+    warnings.simplefilter("ignore", category=RuntimeWarning)
+
+    ref_paths = sorted(glob.glob(args.refs))
+    ok = check_equivalence("random", make_random_poses(2000))
+    for p in ref_paths:
+        ok &= check_equivalence(os.path.basename(p), load_reference_kps(p))
+    ok &= check_golden(ref_paths, args.golden, args.update_golden)
+
+    if args.bench > 0:
+        benchmark(make_random_poses(args.bench, seed=1), args.repeat)
+
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,52 @@
+import argparse
+import os
+import sys
+import time
+
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(CODE_DIR, 'merge_test'))
+sys.path.insert(0, CODE_DIR)
+from avatar_qt import MannequinRenderer, PACK_CACHE_DIR
+
+DEFAULT_PACKS = ["naruto_parts", "dady_parts", "ren_parts", "rumi_parts"]
+
+
+def prebuild(assets_dir, side_extra, top_pad, force):
+    """에셋 팩 하나를 디스크 캐시에 미리 만들어 두고, 캐시 없이/있이 읽는 시간을 비교합니다."""
+    renderer = MannequinRenderer(None, assets_dir, side_extra=side_extra, top_pad=top_pad)
+    cache_path = renderer.pack_cache_path()
+    if force and os.path.exists(cache_path):
+        os.remove(cache_path)
+
+    t0 = time.perf_counter()
+    existed = os.path.exists(cache_path)
+    renderer.build_pack()
+    t_first = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    renderer.build_pack()
+    t_cached = time.perf_counter() - t0
+
+    state = "cached" if existed else "built"
+    print(f"[{state}] {assets_dir:<14} -> {os.path.relpath(cache_path, CODE_DIR)} "
+          f"({os.path.getsize(cache_path) / 1e6:.1f} MB)  first {t_first * 1000:.0f} ms, from cache {t_cached * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Prebuild the on-disk asset cache for avatar packs.')
+    parser.add_argument('packs', nargs='*', help='Asset pack folders (default: the kiosk avatars).')
+    parser.add_argument('--side_extra', type=int, default=240, help='Must match the renderer setting.')
+    parser.add_argument('--top_pad', type=int, default=100, help='Must match the renderer setting.')
+    parser.add_argument('--force', action='store_true', help='Rebuild even if a cache entry exists.')
+    args = parser.parse_args()
+
+    packs = args.packs or [os.path.join(CODE_DIR, p) for p in DEFAULT_PACKS]
+    print(f"Cache directory: {PACK_CACHE_DIR}")
+    ok = True
+    for p in packs:
+        try:
+            prebuild(p, args.side_extra, args.top_pad, args.force)
+        except (OSError, ValueError) as e:
+            ok = False
+            print(f"[FAIL] {p}: {e}")
+    sys.exit(0 if ok else 1)
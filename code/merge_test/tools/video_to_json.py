@@ -2,21 +2,139 @@ import cv2
 import json
 import argparse
 import os
-from core.model_loader import load_model, make_infer
+import queue
+import threading
+import numpy as np
+from core.model_loader import load_model, make_batch_infer
+from core.pose_track import POSE_TRACK_EXT, save_pose_track, pose_data_from_json, load_pose_track
 import torch
 
-def create_json_from_video(video_path, model_path, output_json, imgsz, device, use_half, step):
+def _source_signature(video_path):
+    """이어하기 체크포인트가 같은 입력 영상에서 나온 것인지 확인하기 위한 값."""
+    st = os.stat(video_path)
+    return {"path": os.path.abspath(video_path), "size": st.st_size, "mtime": int(st.st_mtime)}
+
+def _read_checkpoint(partial_path, header):
     """
-    Loads a video, extracts pose keypoints for each frame, and saves them to a JSON file.
+    .partial 체크포인트(JSON Lines)를 읽어 이미 처리된 프레임 목록을 반환합니다.
+    헤더가 다르면(다른 영상/설정) 빈 목록을 반환합니다. 끝에 잘린 줄은 버립니다.
     """
-    model, use_half = load_model(model_path, device, use_half)
-    if model is None:
-        return
-        
-    infer_pose = make_infer(model, argparse.Namespace(
-        imgsz=imgsz, device=device, conf_thres=0.25
-    ), use_half)
+    if not os.path.exists(partial_path):
+        return []
+    frames = []
+    valid_bytes = 0
+    with open(partial_path, 'rb') as f:
+        for i, line in enumerate(f):
+            try:
+                item = json.loads(line)
+            except ValueError:
+                break
+            if i == 0:
+                if item != header:
+                    return []
+            else:
+                frames.append(item)
+            valid_bytes += len(line)
+    # 중간에 끊겨 잘린 마지막 줄을 잘라내고 그 뒤부터 이어 씁니다.
+    with open(partial_path, 'r+b') as f:
+        f.truncate(valid_bytes)
+    return frames
+
+def _frame_reader(cap, fps, step, start_index, out_queue, stop_event, skip=None, stop_index=None):
+    """
+    디코딩 스레드: step 간격의 프레임만 디코딩해서 큐에 넣습니다.
+    건너뛰는 프레임(skip에 있는 번호 포함)은 grab()만 호출합니다. 끝나면 None을 넣습니다.
+    stop_index가 있으면 그 번호에서 멈춥니다.
+    timestamp는 frame_index / fps로 계산해 헤더의 fps와 항상 일치시킵니다.
+    """
+    frame_index = 0
+    skip = skip or ()
+    try:
+        while not stop_event.is_set():
+            if stop_index is not None and frame_index >= stop_index:
+                break
+            if frame_index < start_index or frame_index % step != 0 or frame_index in skip:
+                if not cap.grab():
+                    break
+                frame_index += 1
+                continue
+            ret, frame = cap.read()
+            if not ret:
+                break
+            timestamp = frame_index / fps
+            out_queue.put((frame_index, timestamp, frame))
+            frame_index += 1
+    finally:
+        out_queue.put(None)
+
+def _frame_entry(frame_index, timestamp, kps, conf):
+    if kps is not None:
+        kps_list = kps.tolist()
+    else:
+        kps_list = [[float('nan'), float('nan')]] * 17
+
+    if conf is not None:
+        conf_list = conf.tolist()
+    else:
+        conf_list = [float('nan')] * 17
 
+    return {
+        "frame_index": frame_index,
+        "timestamp": timestamp,
+        "kps": kps_list,
+        "conf": conf_list
+    }
+
+def _live_track_frames(live_track, fps, size, step, frame_count):
+    """
+    게임 중 저장된 실시간 포즈 트랙(.live.posetrack)에서 재사용할 프레임을 읽습니다.
+    영상과 fps/크기가 다르면 쓰지 않습니다. 반환: {frame_index: entry}
+    """
+    if not live_track or not os.path.exists(live_track):
+        return {}
+    try:
+        track = load_pose_track(live_track, mmap=False)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not read live pose track {live_track}: {e}")
+        return {}
+    if list(track.get("video_size") or []) != list(size) or abs((track.get("fps") or 0) - fps) > 0.01 * fps:
+        print(f"Warning: Live pose track {live_track} does not match the video "
+              f"(fps {track.get('fps')} vs {fps}, size {track.get('video_size')} vs {list(size)}). Ignoring it.")
+        return {}
+
+    known = {}
+    for idx, kps, conf in zip(track["frame_index"].tolist(), track["kps"], track["conf"]):
+        if idx % step != 0 or (frame_count > 0 and idx >= frame_count):
+            continue
+        known[idx] = _frame_entry(idx, idx / fps, kps.astype(np.float32), conf.astype(np.float32))
+    return known
+
+def write_pose_track(output_path, output_data, kps_dtype="float32"):
+    """JSON과 같은 구조의 output_data를 컬럼형 바이너리(.posetrack)로 저장합니다."""
+    data = pose_data_from_json(output_data)
+    save_pose_track(
+        output_path, data["frame_index"], data["timestamp"], data["kps"], data["conf"],
+        fps=data["fps"], stride=data["stride"], video_size=data["video_size"],
+        kps_dtype=kps_dtype
+    )
+
+def create_json_from_video(video_path, model_path, output_json, imgsz, device, use_half, step,
+                           batch_size=8, resume=True, live_track=None, model=None,
+                           model_factory=None):
+    """
+    Loads a video, extracts pose keypoints for each frame, and saves them to a JSON file.
+
+    Frames are decoded on a reader thread and inferred batch_size at a time. Results are
+    appended to '<output_json>.partial' as they are produced, so an interrupted run is
+    resumed from the last processed frame when resume is True.
+    If output_json ends with '.posetrack' the compact binary format is written instead.
+    If live_track (a pose track recorded during the game) is given, its frames are reused
+    and only the frames it is missing are inferred. The model is not loaded at all when
+    the track covers every frame.
+    If model (e.g. from core.model_registry.get_model) is given it is used instead of
+    loading model_path again. model_factory is a zero-argument callable returning such a
+    model; it is only called when some frames actually have to be inferred.
+    """
     cap = cv2.VideoCapture(video_path)
     if not cap.isOpened():
         print(f"Error: Could not open video file {video_path}")
@@ -26,40 +144,98 @@ def create_json_from_video(video_path, model_path, output_json, imgsz, device, u
     fps = cap.get(cv2.CAP_PROP_FPS)
     width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
     height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    if fps <= 0 or width <= 0 or height <= 0:
+        # 잘못된 기본값으로 레퍼런스를 만들면 재생/채점 타이밍이 전부 어긋납니다.
+        print(f"Error: Could not read fps/size from {video_path} (fps={fps}, size={width}x{height})")
+        cap.release()
+        return
+
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    known = _live_track_frames(live_track, fps, (width, height), step, frame_count)
+    stop_index = None
+    if known and frame_count > 0:
+        missing = [i for i in range(0, frame_count, step) if i not in known]
+        stop_index = missing[-1] + 1 if missing else 0
+        print(f"Reusing {len(known)} frames from {live_track}; {len(missing)} frames left to infer.")
+
+    infer_pose_batch = None
+    if stop_index != 0:
+        if model is None and model_factory is not None:
+            model = model_factory()
+        if model is None:
+            model, use_half = load_model(model_path, device, use_half)
+        if model is None:
+            cap.release()
+            return
+        infer_pose_batch = make_batch_infer(model, argparse.Namespace(
+            imgsz=imgsz, device=device, conf_thres=0.25
+        ), use_half)
+
+    header = {
+        "video_size": [width, height],
+        "fps": fps,
+        "stride": step,
+        "source": _source_signature(video_path),
+        "live_track": _source_signature(live_track) if known else None
+    }
+
+    out_dir = os.path.dirname(output_json)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    partial_path = output_json + ".partial"
+
+    frames = _read_checkpoint(partial_path, header) if resume else []
+    start_index = frames[-1]["frame_index"] + 1 if frames else 0
+    if frames:
+        print(f"Resuming from frame {start_index} ({len(frames)} frames already processed).")
+    else:
+        with open(partial_path, 'w') as f:
+            f.write(json.dumps(header) + "\n")
+
+    frame_queue = queue.Queue(maxsize=batch_size * 2)
+    stop_event = threading.Event()
+    reader = threading.Thread(
+        target=_frame_reader, args=(cap, fps, step, start_index, frame_queue, stop_event, known, stop_index),
+        daemon=True
+    )
+    reader.start()
+
+    try:
+        with open(partial_path, 'a') as partial:
+            done = False
+            while not done:
+                batch = []
+                while len(batch) < batch_size:
+                    item = frame_queue.get()
+                    if item is None:
+                        done = True
+                        break
+                    batch.append(item)
+                if not batch:
+                    break
+
+                print(f"Processing frames {batch[0][0]}-{batch[-1][0]}...")
+                results = infer_pose_batch([frame for _, _, frame in batch])
+                for (frame_index, timestamp, _), (kps, conf) in zip(batch, results):
+                    entry = _frame_entry(frame_index, timestamp, kps, conf)
+                    frames.append(entry)
+                    partial.write(json.dumps(entry) + "\n")
+                # 배치마다 디스크에 내려 체크포인트로 사용합니다.
+                partial.flush()
+                os.fsync(partial.fileno())
+    finally:
+        stop_event.set()
+        # 큐가 가득 차 reader가 막혀 있으면 비워서 종료시킵니다.
+        while reader.is_alive():
+            try:
+                frame_queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        cap.release()
+
+    if known:
+        frames = sorted(frames + list(known.values()), key=lambda fr: fr["frame_index"])
 
-    frames = []
-    frame_index = 0
-    
-    # Process frames at a given step interval
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
-        if frame_index % step == 0:
-            print(f"Processing frame {frame_index}...")
-            kps, conf = infer_pose(frame)
-            
-            if kps is not None:
-                kps_list = kps.tolist()
-            else:
-                kps_list = [[float('nan'), float('nan')]] * 17
-                
-            if conf is not None:
-                conf_list = conf.tolist()
-            else:
-                conf_list = [float('nan')] * 17
-                
-            frames.append({
-                "frame_index": frame_index,
-                "timestamp": cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0,
-                "kps": kps_list,
-                "conf": conf_list
-            })
-        frame_index += 1
-
-    cap.release()
-    
     # 출력 데이터 구성
     output_data = {
         "video_size": [width, height],
@@ -67,31 +243,38 @@ def create_json_from_video(video_path, model_path, output_json, imgsz, device, u
         "stride": step,
         "frames": frames
     }
-    
-    os.makedirs(os.path.dirname(output_json), exist_ok=True)
-    with open(output_json, 'w') as f:
-        json.dump(output_data, f, indent=4)
-    
+
+    if output_json.endswith(POSE_TRACK_EXT):
+        write_pose_track(output_json, output_data)
+    else:
+        with open(output_json, 'w') as f:
+            json.dump(output_data, f, indent=4)
+    os.remove(partial_path)
+
     print(f"Successfully saved {len(frames)} frames to {output_json}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Create pose JSON from video.')
     parser.add_argument('--video_path', type=str, required=True, help='Path to the input video file.')
-    parser.add_argument('--output_json', type=str, required=True, help='Path to the output JSON file.')
+    parser.add_argument('--output_json', type=str, required=True, help='Path to the output JSON (or .posetrack) file.')
     parser.add_argument('--model_path', type=str, default='yolov8n-pose.pt', help='Path to the YOLO model.')
     parser.add_argument('--imgsz', type=int, default=320, help='Image size for inference.')
     parser.add_argument('--device', type=str, default=None, help='Device to use (e.g., "cpu", "cuda").')
     parser.add_argument('--step', type=int, default=1, help='Process every Nth frame.')
+    parser.add_argument('--batch', type=int, default=8, help='Number of frames per predict call.')
+    parser.add_argument('--no_resume', action='store_true', help='Ignore an existing .partial checkpoint and start over.')
+    parser.add_argument('--live_track', type=str, default=None, help='Pose track recorded during the game; only frames it lacks are inferred.')
     args = parser.parse_args()
 
     if args.device is None:
         args.device = "cuda" if torch.cuda.is_available() else "cpu"
-    
+
     use_half = (args.device == "cuda")
 
     if os.path.exists(args.output_json):
         print(f"Warning: Output file '{args.output_json}' already exists. It will be overwritten.")
 
     create_json_from_video(
-        args.video_path, args.model_path, args.output_json, args.imgsz, args.device, use_half, args.step
-    )
\ No newline at end of file
+        args.video_path, args.model_path, args.output_json, args.imgsz, args.device, use_half, args.step,
+        batch_size=args.batch, resume=not args.no_resume, live_track=args.live_track
+    )